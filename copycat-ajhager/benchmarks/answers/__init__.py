@@ -0,0 +1,15 @@
+"""Answer-distribution harness for the Python Copycat implementations.
+
+Runs the classic abc -> abd problem set many times in each Python
+implementation, in parallel worker processes, and collects the frequency of
+each answer, the final temperatures and the codelet counts. The results are
+checked against the stored baseline.json: answer frequencies with a
+chi-square test, codelet counts and final temperatures with Kolmogorov-
+Smirnov tests (see significance). A change meant only to make a port faster
+should not move any of them.
+
+Run from the copycat-ajhager directory::
+
+    python -m benchmarks.answers --runs 30
+    python -m benchmarks.answers --runs 30 --save
+"""
@@ -0,0 +1,262 @@
+"""Check the answer distributions of the Python implementations against the
+stored baseline.
+
+Run from the copycat-ajhager directory::
+
+    python -m benchmarks.answers --implementations ajhager --runs 30
+
+The baseline is made from an earlier commit with --commit and --save, so
+that it records the behaviour before the changes being checked. A problem
+whose behaviour is known to have changed since that commit is noted with
+--known-change, and is then reported rather than tested.
+"""
+
+import argparse
+import concurrent.futures
+import datetime
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tarfile
+import tempfile
+
+from benchmarks.answers import significance
+from benchmarks.stress.problems import Problem
+from benchmarks.stress.worker import IMPLEMENTATIONS, ROOT, run_worker
+
+BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+CLASSIC = [('abc', 'abd', 'ijk'), ('abc', 'abd', 'xyz'),
+           ('abc', 'abd', 'iijjkk'), ('abc', 'abd', 'mrrjjj'),
+           ('abc', 'abd', 'kji'), ('abc', 'abd', 'ijjkkk'),
+           ('aabc', 'aabd', 'ijkk'), ('abc', 'abd', 'srqp')]
+
+def classic_problems():
+    """Return the classic problem set."""
+    return [Problem('%s:%s::%s' % strings, len(strings[2]), None, *strings)
+            for strings in CLASSIC]
+
+def outcome(result):
+    """Return the answer of a run, or what stopped it from answering."""
+    if result['error']:
+        return 'error: ' + result['error'].split(':')[0]
+    if result['answer'] is None:
+        return 'no answer'
+    return result['answer']
+
+def git(*args):
+    """Run git in the repository and return its output."""
+    return subprocess.check_output(('git',) + args, cwd=ROOT)
+
+def commit_name(commit):
+    """Return the short hash of the commit."""
+    return git('rev-parse', '--short', commit).decode().strip()
+
+def export(commit, directory):
+    """Extract every implementation as it was at commit into directory and
+    return the path of each, keyed by implementation."""
+    top = git('rev-parse', '--show-toplevel').decode().strip()
+    paths = {}
+    for implementation, path in IMPLEMENTATIONS.items():
+        relative = os.path.relpath(path, top)
+        archive = git('-C', top, 'archive', '--format=tar',
+                      '%s:%s' % (commit, relative))
+        paths[implementation] = os.path.join(directory, implementation)
+        with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+            tar.extractall(paths[implementation])
+    return paths
+
+def collect(args, paths=None):
+    """Run every problem in every implementation and return the outcomes,
+    final temperatures and codelet counts, keyed by implementation and then
+    by problem. Each implementation is imported from its entry in paths, if
+    there is one."""
+    paths = paths or {}
+    jobs = []
+    for implementation in args.implementations:
+        for problem in classic_problems():
+            for seed in range(args.first_seed, args.first_seed + args.runs):
+                jobs.append((implementation, problem, seed))
+
+    with concurrent.futures.ThreadPoolExecutor(args.processes) as executor:
+        futures = [executor.submit(run_worker, implementation, problem, seed,
+                                   args.max_codelets, args.timeout,
+                                   paths.get(implementation))
+                   for implementation, problem, seed in jobs]
+        results = [future.result() for future in futures]
+
+    collected = {}
+    for (implementation, problem, seed), result in zip(jobs, results):
+        runs = collected.setdefault(implementation, {}).setdefault(
+            problem.name, {'answers': {}, 'temperatures': [], 'codelets': []})
+        answer = outcome(result)
+        runs['answers'][answer] = runs['answers'].get(answer, 0) + 1
+        if result['answer'] is not None:
+            runs['temperatures'].append(result['temperature'])
+            runs['codelets'].append(result['codelets'])
+    return collected
+
+def mean(values):
+    """Return the mean of the values, or None if there are none."""
+    return sum(values) / float(len(values)) if values else None
+
+def print_runs(collected):
+    for implementation in sorted(collected):
+        for name, runs in sorted(collected[implementation].items()):
+            total = sum(runs['answers'].values())
+            answers = sorted(runs['answers'].items(),
+                             key=lambda item: (-item[1], item[0]))
+            print('%-8s %-18s %s' % (implementation, name, ', '.join(
+                '%s %d%%' % (answer, round(100.0 * count / total))
+                for answer, count in answers)))
+            temperature = mean(runs['temperatures'])
+            codelets = mean(runs['codelets'])
+            if temperature is not None:
+                print('%-8s %-18s mean temperature %.1f, mean codelets %d'
+                      % ('', '', temperature, codelets))
+
+def all_errors(answers):
+    """Return True if none of the runs with these answers ran to the end
+    without an error, including when there are no runs."""
+    return all(answer.startswith('error: ') for answer in answers)
+
+def errored(collected, known_changes):
+    """Return the implementation and problem of each cell of collected in
+    which every run failed, other than the known changes."""
+    return [(implementation, name)
+            for implementation in sorted(collected)
+            for name, runs in sorted(collected[implementation].items())
+            if all_errors(runs['answers']) and
+            '%s %s' % (implementation, name) not in known_changes]
+
+def compare(baseline, collected, alpha, known_changes):
+    """Print the tests of collected against baseline and return the
+    number of differences significant at alpha and the number of tests
+    that could not be made.
+
+    A test cannot be made when either sample is empty, or when every run
+    of the problem in the baseline or in collected failed, so such a cell
+    is marked incomparable rather than passed. A cell in known_changes is
+    not tested, and its note is printed after the table."""
+    differences = 0
+    incomparable = 0
+    noted = []
+    print('%-8s %-18s %13s %13s %13s' % ('impl', 'problem', 'answers p',
+                                         'codelets p', 'temperature p'))
+    for implementation in sorted(collected):
+        for name, runs in sorted(collected[implementation].items()):
+            before = baseline.get(implementation, {}).get(name)
+            if before is None:
+                continue
+            key = '%s %s' % (implementation, name)
+            if key in known_changes:
+                noted.append(key)
+                print('%-8s %-18s %13s' % (implementation, name,
+                                           'known change'))
+                continue
+            if all_errors(before['answers']) or all_errors(runs['answers']):
+                tests = [None, None, None]
+            else:
+                _, _, answers = significance.chi_square(before['answers'],
+                                                        runs['answers'])
+                _, codelets = significance.kolmogorov_smirnov(
+                    before['codelets'], runs['codelets'])
+                _, temperatures = significance.kolmogorov_smirnov(
+                    before['temperatures'], runs['temperatures'])
+                tests = [answers, codelets, temperatures]
+            cells = []
+            for p in tests:
+                if p is None:
+                    incomparable += 1
+                    cells.append('%13s' % 'incomparable')
+                elif p < alpha:
+                    differences += 1
+                    cells.append('%12.3f*' % p)
+                else:
+                    cells.append('%12.3f ' % p)
+            print('%-8s %-18s %s' % (implementation, name, ' '.join(cells)))
+    for key in noted:
+        print('%s: %s' % (key, known_changes[key]))
+    return differences, incomparable
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--implementations', nargs='+',
+                        choices=sorted(IMPLEMENTATIONS),
+                        default=sorted(IMPLEMENTATIONS))
+    parser.add_argument('--runs', type=int, default=30,
+                        help='runs of each problem in each implementation')
+    parser.add_argument('--first-seed', type=int, default=1)
+    parser.add_argument('--processes', type=int, default=os.cpu_count())
+    parser.add_argument('--max-codelets', type=int, default=10000)
+    parser.add_argument('--timeout', type=float, default=600)
+    parser.add_argument('--alpha', type=float, default=0.01,
+                        help='flag differences with p-values below this')
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--save', action='store_true',
+                        help='store the results as the baseline instead of '
+                             'checking them')
+    parser.add_argument('--commit', default='HEAD',
+                        help='run the implementations as they were at this '
+                             'commit')
+    parser.add_argument('--known-change', nargs=3, action='append',
+                        default=[],
+                        metavar=('IMPLEMENTATION', 'PROBLEM', 'NOTE'),
+                        help='with --save, note that the behaviour of a '
+                             'problem has changed since the baseline commit')
+    args = parser.parse_args()
+
+    if args.commit == 'HEAD':
+        collected = collect(args)
+    else:
+        with tempfile.TemporaryDirectory() as directory:
+            collected = collect(args, export(args.commit, directory))
+    print_runs(collected)
+    print('')
+
+    if args.save:
+        known_changes = dict(('%s %s' % (implementation, name), note)
+                             for implementation, name, note
+                             in args.known_change)
+        failed = errored(collected, known_changes)
+        if failed:
+            for implementation, name in failed:
+                print('every run of %s failed in %s' % (name, implementation))
+            print('not saving a baseline with problems that only fail, '
+                  'unless they are noted with --known-change')
+            return 1
+        metadata = {'date': datetime.datetime.now().isoformat(),
+                    'commit': commit_name(args.commit),
+                    'python': platform.python_version(),
+                    'runs': args.runs, 'first_seed': args.first_seed,
+                    'max_codelets': args.max_codelets,
+                    'known_changes': known_changes}
+        with open(args.baseline, 'w') as baseline:
+            json.dump({'metadata': metadata, 'results': collected}, baseline,
+                      indent=1, sort_keys=True)
+        print('saved the baseline to %s' % args.baseline)
+        return 0
+
+    with open(args.baseline) as baseline:
+        baseline = json.load(baseline)
+    print('baseline from commit %s' % baseline['metadata'].get('commit'))
+    differences, incomparable = compare(
+        baseline['results'], collected, args.alpha,
+        baseline['metadata'].get('known_changes', {}))
+    print('')
+    if incomparable:
+        print('%d tests could not be made, because a sample was empty or '
+              'only had failed runs' % incomparable)
+    if differences:
+        print('%d significant differences from the baseline' % differences)
+        return 1
+    if incomparable:
+        return 1
+    print('no significant differences from the baseline')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""Two-sample significance tests for comparing runs against a baseline.
+
+The chi-square test compares answer frequencies and the Kolmogorov-Smirnov
+test compares distributions of codelet counts and final temperatures. Both
+return their statistic and an approximate p-value, the probability of a
+difference at least this large if both samples came from the same
+distribution. When a sample is empty there is nothing to compare, and the
+p-value is None rather than a pass."""
+
+import math
+
+def upper_incomplete_gamma(a, x):
+    """Return the regularized upper incomplete gamma function Q(a, x)."""
+    if x <= 0:
+        return 1.0
+    log_prefix = a * math.log(x) - x - math.lgamma(a)
+    if x < a + 1:
+        term = total = 1.0 / a
+        n = a
+        for _ in range(1000):
+            n += 1
+            term *= x / n
+            total += term
+            if abs(term) < abs(total) * 1e-15:
+                break
+        return max(0.0, 1.0 - total * math.exp(log_prefix))
+    # Lentz's continued fraction.
+    tiny = 1e-300
+    b = x + 1 - a
+    c = 1.0 / tiny
+    d = 1.0 / b
+    h = d
+    for i in range(1, 1000):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        if abs(d) < tiny:
+            d = tiny
+        c = b + an / c
+        if abs(c) < tiny:
+            c = tiny
+        d = 1.0 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 1e-15:
+            break
+    return min(1.0, h * math.exp(log_prefix))
+
+def chi_square(counts1, counts2, minimum=5):
+    """Return the chi-square statistic, degrees of freedom and p-value of the
+    test that two dicts of category counts come from the same distribution.
+
+    Categories seen fewer than minimum times across both samples are pooled
+    into one, so that expected counts are not too small for the test. The
+    p-value is None if either sample is empty."""
+    categories = set(counts1) | set(counts2)
+    rare = [c for c in categories
+            if counts1.get(c, 0) + counts2.get(c, 0) < minimum]
+    rows = [[counts1.get(c, 0), counts2.get(c, 0)]
+            for c in sorted(categories - set(rare))]
+    if rare:
+        rows.append([sum(counts1.get(c, 0) for c in rare),
+                     sum(counts2.get(c, 0) for c in rare)])
+    total1 = sum(row[0] for row in rows)
+    total2 = sum(row[1] for row in rows)
+    if not total1 or not total2:
+        return 0.0, 0, None
+    if len(rows) < 2:
+        return 0.0, 0, 1.0
+    total = float(total1 + total2)
+    statistic = 0.0
+    for row in rows:
+        for count, column_total in zip(row, [total1, total2]):
+            expected = sum(row) * column_total / total
+            statistic += (count - expected) ** 2 / expected
+    dof = len(rows) - 1
+    return statistic, dof, upper_incomplete_gamma(dof / 2.0, statistic / 2.0)
+
+def kolmogorov_smirnov(sample1, sample2):
+    """Return the two-sample Kolmogorov-Smirnov statistic and its asymptotic
+    p-value, which is None if either sample is empty."""
+    sample1 = sorted(sample1)
+    sample2 = sorted(sample2)
+    n1, n2 = len(sample1), len(sample2)
+    if not n1 or not n2:
+        return 0.0, None
+    i = j = 0
+    statistic = 0.0
+    while i < n1 and j < n2:
+        value = min(sample1[i], sample2[j])
+        while i < n1 and sample1[i] == value:
+            i += 1
+        while j < n2 and sample2[j] == value:
+            j += 1
+        statistic = max(statistic, abs(i / float(n1) - j / float(n2)))
+    root = math.sqrt(n1 * n2 / float(n1 + n2))
+    return statistic, kolmogorov_probability(
+        (root + 0.12 + 0.11 / root) * statistic)
+
+def kolmogorov_probability(value):
+    """Return the probability that the Kolmogorov distribution exceeds the
+    value."""
+    if value < 0.2:
+        return 1.0
+    total = 0.0
+    for j in range(1, 101):
+        term = 2 * (-1) ** (j - 1) * math.exp(-2 * j * j * value * value)
+        total += term
+        if abs(term) < 1e-12:
+            break
+    return max(0.0, min(1.0, total))
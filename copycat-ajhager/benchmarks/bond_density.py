@@ -0,0 +1,105 @@
+"""Benchmark of Bond.local_density on long strings.
+
+Builds a bond between every pair of adjacent letters that can be bonded in
+random target strings of increasing length and times local_density, which
+counts bond edges, against walking the string neighbor by neighbor as
+local_density used to.
+
+Run from the copycat-ajhager directory::
+
+    python benchmarks/bond_density.py --lengths 30 50 100 200
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from copycat.run import Run
+from copycat.workspace import Bond
+
+def walked(bond):
+    """Return the local density by walking from the bond to each end of the
+    string."""
+    def calc(direction):
+        """Inner calculation."""
+        slot_sum = 0
+        support_sum = 0
+        method_name = 'choose_%s_neighbor' % direction
+        last_object = {'left': bond.left_object,
+                       'right': bond.right_object}[direction]
+        next_object = getattr(last_object, method_name)()
+        while next_object:
+            slot_sum += 1
+            first = next_object.string_number
+            last = last_object.string_number
+            other = bond.string.left_right_bonds.get((first, last))
+            if other:
+                if other.bond_category == bond.bond_category and \
+                   other.direction_category == bond.direction_category:
+                    support_sum += 1
+            last_object = next_object
+            next_object = getattr(next_object, method_name)()
+        return slot_sum, support_sum
+
+    slot_sum, support_sum = map(sum, zip(calc('left'), calc('right')))
+    if slot_sum == 0:
+        return 100
+    return round(100 * (support_sum / float(slot_sum)))
+
+def counted(bond):
+    """Return the local density counted from the bond edges."""
+    return bond.local_density()
+
+def bonded_string(length, seed):
+    """Return a target string of the given length with its letters bonded."""
+    random.seed(seed)
+    target = ''.join(random.choice('abcdeedcbaa') for _ in range(length))
+    workspace = Run('abc', 'abd', target, seed).workspace
+    slipnet = workspace.slipnet
+    category = slipnet.plato_letter_category
+    string = workspace.target_string
+    for position in range(length - 1):
+        from_object = string.get_letter(position)
+        to_object = string.get_letter(position + 1)
+        from_descriptor = from_object.get_descriptor(category)
+        to_descriptor = to_object.get_descriptor(category)
+        bond_category = slipnet.get_bond_category(from_descriptor,
+                                                  to_descriptor)
+        if bond_category is not None:
+            workspace.build_bond(Bond(workspace, from_object, to_object,
+                                      bond_category, category,
+                                      from_descriptor, to_descriptor))
+    return string
+
+def timed(bonds, density, repeat):
+    """Return the average time in microseconds of calling density on a
+    bond."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for bond in bonds:
+            density(bond)
+    return 1e6 * (time.perf_counter() - start) / (repeat * len(bonds))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--lengths', type=int, nargs='+',
+                        default=[30, 50, 100, 200])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    print('%8s %8s %16s %16s' % ('letters', 'bonds', 'walked us/call',
+                                 'edges us/call'))
+    for length in args.lengths:
+        bonds = bonded_string(length, args.seed).get_bonds()
+        walked_time = timed(bonds, walked, args.repeat)
+        counted_time = timed(bonds, counted, args.repeat)
+        print('%8d %8d %16.1f %16.1f' % (length, len(bonds), walked_time,
+                                         counted_time))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""Benchmark of restoring a checkpointed run against replaying it.
+
+Runs a seeded problem to several points, checkpoints it there, and compares
+the time to restore the checkpoint with the time to replay the run from the
+start to the same point. Also reports the size of each checkpoint.
+
+Run from the copycat-ajhager directory::
+
+    python benchmarks/checkpoint.py --target mrrjjj --steps 100 300 600
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from copycat.run import Run
+
+def replay(args, steps):
+    """Return a run of the problem after the given number of steps."""
+    run = Run(args.initial, args.modified, args.target, args.seed)
+    while run.coderack.time < steps and not run.workspace.answer_string:
+        run.step()
+    return run
+
+def timed(function, repeat):
+    """Return the average time in milliseconds of calling function."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return 1e3 * (time.perf_counter() - start) / repeat
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--initial', default='abc')
+    parser.add_argument('--modified', default='abd')
+    parser.add_argument('--target', default='mrrjjj')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--steps', type=int, nargs='+',
+                        default=[100, 300, 600])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print('%8s %12s %12s %12s %12s' % ('steps', 'replay ms', 'restore ms',
+                                       'save ms', 'size kB'))
+    for steps in args.steps:
+        run = replay(args, steps)
+        snapshot = run.checkpoint()
+        replayed = timed(lambda: replay(args, steps), args.repeat)
+        restored = timed(lambda: Run.restore(snapshot), args.repeat)
+        saved = timed(run.checkpoint, args.repeat)
+        print('%8d %12.1f %12.1f %12.1f %12.1f' % (
+            run.coderack.time, replayed, restored, saved,
+            len(snapshot) / 1024.0))
+
+if __name__ == '__main__':
+    main()
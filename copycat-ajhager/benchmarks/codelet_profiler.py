@@ -0,0 +1,63 @@
+"""Benchmark of the overhead of profiling codelets.
+
+Runs seeded problems to their answers without a profiler, with a profiler
+and with a profiler keeping a trace, and reports the best time of each over
+several repeats and the overhead of profiling. Profiling does not change
+what a run does, so each version runs exactly the same codelets.
+
+Run from the copycat-ajhager directory::
+
+    python benchmarks/codelet_profiler.py --targets iijjkk mrrjjj --seeds 3
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from copycat.profiler import Profiler
+from copycat.run import Run
+
+def timed(initial, modified, target, seed, steps, profiler):
+    """Return the time in seconds of a run."""
+    run = Run(initial, modified, target, seed)
+    if profiler is not None:
+        run.profile(profiler())
+    start = time.perf_counter()
+    while not run.workspace.answer_string and run.coderack.time < steps:
+        run.step()
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--initial', default='abc')
+    parser.add_argument('--modified', default='abd')
+    parser.add_argument('--targets', nargs='+', default=['iijjkk', 'mrrjjj'])
+    parser.add_argument('--seeds', type=int, default=3)
+    parser.add_argument('--steps', type=int, default=3000)
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    versions = [('off', None), ('profiled', Profiler),
+                ('traced', lambda: Profiler(trace=True))]
+    best = dict((name, 0.0) for name, _ in versions)
+    for target in args.targets:
+        for seed in range(1, args.seeds + 1):
+            times = dict((name, []) for name, _ in versions)
+            for _ in range(args.repeats):
+                for name, profiler in versions:
+                    times[name].append(timed(args.initial, args.modified,
+                                             target, seed, args.steps,
+                                             profiler))
+            for name, _ in versions:
+                best[name] += min(times[name])
+
+    print('%-10s %10s %10s' % ('profiler', 'seconds', 'overhead'))
+    for name, _ in versions:
+        print('%-10s %10.3f %9.1f%%' % (
+            name, best[name], 100 * (best[name] / best['off'] - 1)))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""Benchmark of the per-frame update of the coderack view.
+
+Fills a coderack with codelets of random families and urgencies, then
+simulates frames in which a few codelets are chosen and posted. Times
+reading the count and urgency sum of every family once a frame from a
+FamilyTally against counting the codelets again, as the OpenGL coderack
+view used to, for coderacks of several sizes. No display is needed.
+
+Run from the copycat-ajhager directory::
+
+    python benchmarks/coderack_view.py --sizes 100 1000 10000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import copycat.coderack.codelets as codelets
+from copycat.coderack import Coderack, FamilyTally
+
+FAMILIES = [getattr(codelets, name) for name in dir(codelets)
+            if isinstance(getattr(codelets, name), type)]
+
+def recounted(coderack):
+    """Return the count and urgency sum of each family, counted again."""
+    counts = defaultdict(int)
+    urgencies = defaultdict(int)
+    for codelet in coderack.codelets():
+        counts[codelet.__class__.__name__] += 1
+        urgencies[codelet.__class__.__name__] += \
+                codelet.bin.urgency(coderack.temperature)
+    return [(counts[family.__name__], urgencies[family.__name__])
+            for family in FAMILIES]
+
+def tallied(tally):
+    """Return the count and urgency sum of each family from the tally."""
+    return [(tally.count(family.__name__), tally.urgency_sum(family.__name__))
+            for family in FAMILIES]
+
+def filled(size):
+    """Return a coderack holding size random codelets."""
+    coderack = Coderack()
+    coderack.max_codelets = size
+    coderack.update(50)
+    for _ in range(size):
+        coderack.post(random.choice(FAMILIES)(), random.uniform(0, 100))
+    return coderack
+
+def timed(coderack, view, frames, changes):
+    """Return the average time in microseconds of viewing a frame."""
+    total = 0
+    for _ in range(frames):
+        for _ in range(changes):
+            coderack.choose()
+            coderack.post(random.choice(FAMILIES)(), random.uniform(0, 100))
+        start = time.perf_counter()
+        view()
+        total += time.perf_counter() - start
+    return 1e6 * total / frames
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[100, 1000, 10000])
+    parser.add_argument('--frames', type=int, default=200)
+    parser.add_argument('--changes', type=int, default=4,
+                        help='codelets chosen and posted between frames')
+    args = parser.parse_args()
+
+    random.seed(1)
+    print('%8s %14s %14s' % ('codelets', 'recounted us', 'tallied us'))
+    for size in args.sizes:
+        coderack = filled(size)
+        before = timed(coderack, lambda: recounted(coderack),
+                       args.frames, args.changes)
+        tally = FamilyTally(coderack)
+        after = timed(coderack, lambda: tallied(tally),
+                      args.frames, args.changes)
+        if recounted(coderack) != tallied(tally):
+            print('tally does not match the coderack')
+        print('%8d %14.1f %14.1f' % (size, before, after))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""Benchmark of finding the correspondences incompatible with a proposal.
+
+Builds a correspondence from every letter of a random initial string to a
+random letter of a target string of the same length, then times looking up
+the correspondences incompatible with random proposed correspondences
+through the workspace index against checking every built correspondence.
+
+Run from the copycat-ajhager directory::
+
+    python benchmarks/correspondence_incompatibility.py --lengths 10 30 100
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from copycat.run import Run
+from copycat.workspace import Correspondence
+
+def scanned(correspondence):
+    """Return the incompatible built correspondences by checking each one."""
+    workspace = correspondence.workspace
+    return [other for other in workspace.correspondences()
+            if correspondence.is_incompatible_correspondence(other)]
+
+def indexed(correspondence):
+    """Return the incompatible built correspondences from the index."""
+    workspace = correspondence.workspace
+    return workspace.get_incompatible_correspondences(correspondence)
+
+def corresponding(workspace, object1, object2):
+    """Return a correspondence between the objects with all their concept
+    mappings."""
+    mappings = workspace.get_concept_mappings(object1, object2,
+                                              object1.descriptions,
+                                              object2.descriptions)
+    return Correspondence(workspace, object1, object2, mappings)
+
+def mapped_workspace(length, seed):
+    """Return a workspace with a correspondence built for every letter of
+    the initial string, and a list of proposals against it."""
+    random.seed(seed)
+    initial = ''.join(random.choice('abcdefg') for _ in range(length))
+    target = ''.join(random.choice('abcdefg') for _ in range(length))
+    workspace = Run(initial, initial, target, seed).workspace
+    letters1 = workspace.initial_string.get_objects()
+    letters2 = workspace.target_string.get_objects()
+    random.shuffle(letters2)
+    for object1, object2 in zip(letters1, letters2):
+        workspace.build_correspondence(corresponding(workspace, object1,
+                                                     object2))
+    proposals = [corresponding(workspace, random.choice(letters1),
+                               random.choice(letters2))
+                 for _ in range(200)]
+    return workspace, proposals
+
+def timed(proposals, function, repeat):
+    """Return the average time in microseconds of calling function on a
+    proposal."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for proposal in proposals:
+            function(proposal)
+    return 1e6 * (time.perf_counter() - start) / (repeat * len(proposals))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--lengths', type=int, nargs='+',
+                        default=[10, 30, 100])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    print('%8s %16s %16s %16s' % ('built', 'conflicts/call',
+                                  'scan us/call', 'index us/call'))
+    for length in args.lengths:
+        workspace, proposals = mapped_workspace(length, args.seed)
+        for proposal in proposals:
+            assert set(indexed(proposal)) == set(scanned(proposal))
+        conflicts = sum(len(scanned(p)) for p in proposals) / len(proposals)
+        scan = timed(proposals, scanned, args.repeat)
+        index = timed(proposals, indexed, args.repeat)
+        print('%8d %16.1f %16.1f %16.1f' % (len(workspace.correspondences()),
+                                            conflicts, scan, index))
+
+if __name__ == '__main__':
+    main()
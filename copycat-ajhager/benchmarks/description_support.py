@@ -0,0 +1,79 @@
+"""Benchmark of the description supports of slipnodes.
+
+Runs a seeded problem, then times Slipnode.local_descriptor_support and
+local_description_type_support, which divide the string's description
+counts, against checking the descriptions of every object in the string,
+for every slipnode on the initial and target strings.
+
+Run from the copycat-ajhager directory::
+
+    python benchmarks/description_support.py --target mrrjjj --steps 600
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from copycat.run import Run
+
+def scanned_descriptor_support(node, string):
+    """Return the group descriptor support of the node by checking each
+    group."""
+    objects = string.get_groups()
+    if not objects:
+        return 0
+    count = len([obj for obj in objects if obj.is_descriptor_present(node)])
+    return round(100 * (count / float(len(objects))))
+
+def scanned_description_type_support(node, string):
+    """Return the description type support of the node by checking each
+    object."""
+    objects = string.get_objects()
+    count = len([obj for obj in objects
+                 if obj.is_description_type_present(node)])
+    return round(100 * (count / float(len(objects))))
+
+def timed(function, pairs, repeat):
+    """Return the average time in microseconds of calling function."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for node, string in pairs:
+            function(node, string)
+    return 1e6 * (time.perf_counter() - start) / (repeat * len(pairs))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--initial', default='abc')
+    parser.add_argument('--modified', default='abd')
+    parser.add_argument('--target', default='mrrjjj')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--steps', type=int, default=600)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    run = Run(args.initial, args.modified, args.target, args.seed)
+    while run.coderack.time < args.steps and not run.workspace.answer_string:
+        run.step()
+    group = run.slipnet.plato_group
+    pairs = [(node, string) for node in run.slipnet.slipnodes
+             for string in [run.workspace.initial_string,
+                            run.workspace.target_string]]
+    objects = sum(len(string.get_objects()) for _, string in pairs[:2])
+    print('%d objects after %d steps' % (objects, run.coderack.time))
+    print('%-18s %12s %12s' % ('support', 'scanned us', 'counted us'))
+    for name, scanned, counted in [
+            ('descriptor', scanned_descriptor_support,
+             lambda node, string: node.local_descriptor_support(string,
+                                                                group)),
+            ('description type', scanned_description_type_support,
+             lambda node, string: node.local_description_type_support(
+                 string))]:
+        print('%-18s %12.2f %12.2f' % (name,
+                                       timed(scanned, pairs, args.repeat),
+                                       timed(counted, pairs, args.repeat)))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""Benchmark of drawing from distributions.
+
+Times Distribution.choose and FixedDistribution.choose, which search
+running sums of the probabilities, against sorting the probabilities and
+summing them on every draw, for distributions of several sizes. The answer
+temperature thresholds have ten entries.
+
+Run from the copycat-ajhager directory::
+
+    python benchmarks/distribution_choose.py --sizes 10 100 1000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import copycat.toolbox as toolbox
+from copycat.workspace import Distribution, FixedDistribution
+
+def sorted_choice(probabilities):
+    """Choose from a map of temperature to probability by sorting it."""
+    values = [probabilities[i] for i in sorted(probabilities)]
+    return toolbox.weighted_select(values, sorted(probabilities))
+
+def timed(function, draws):
+    """Return the average time in microseconds of calling function."""
+    start = time.perf_counter()
+    for _ in range(draws):
+        function()
+    return 1e6 * (time.perf_counter() - start) / draws
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[10, 100, 1000])
+    parser.add_argument('--draws', type=int, default=20000)
+    args = parser.parse_args()
+
+    print('%8s %12s %12s %12s' % ('entries', 'sorted us', 'running us',
+                                  'fixed us'))
+    random.seed(1)
+    for size in args.sizes:
+        probabilities = dict((i, random.randrange(1, 150))
+                             for i in range(size))
+        distribution = Distribution('benchmark')
+        for position, value in probabilities.items():
+            distribution.set(position, value)
+        fixed = FixedDistribution('benchmark', probabilities)
+        print('%8d %12.2f %12.2f %12.2f' % (
+            size, timed(lambda: sorted_choice(probabilities), args.draws),
+            timed(distribution.choose, args.draws),
+            timed(fixed.choose, args.draws)))
+
+if __name__ == '__main__':
+    main()
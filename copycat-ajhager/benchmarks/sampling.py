@@ -0,0 +1,114 @@
+"""Benchmark of the sampling functions in the toolbox.
+
+Reports the throughput, in thousands of calls per second, of
+weighted_index, a prepared Sampler, select_assoc, flip_coin and flatten,
+next to the walking and list-summing versions they replaced, for inputs
+of several sizes.
+
+Run from the copycat-ajhager directory::
+
+    python benchmarks/sampling.py --sizes 2 10 100 1000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import copycat.toolbox as toolbox
+
+def walked_weighted_index(weights):
+    """Choose an index by weight, walking the weights as the toolbox used
+    to."""
+    if len(weights) == 1:
+        return 0
+    total = sum(weights)
+    if total <= 0:
+        return random.randint(0, len(weights) - 1)
+    value = random.randint(0, total - 1)
+    new_total = 0
+    index = 0
+    for weight in weights:
+        new_total += weight
+        index += 1
+        if new_total > value:
+            return index - 1
+
+def walked_select_assoc(assoc_list):
+    """Choose an item by probability, walking the list as the toolbox used
+    to."""
+    if assoc_list == []:
+        return
+    probability_sum = 0
+    for item, probability in assoc_list:
+        probability_sum += probability
+    if probability_sum <= 0:
+        return
+    value = random.uniform(0, probability_sum)
+    new_probability_sum = 0
+    for item, probability in assoc_list:
+        new_probability_sum += probability
+        if new_probability_sum > value:
+            return item
+
+def listed_flip_coin(prob_of_true=.5):
+    """Flip a coin through select_assoc, as the toolbox used to."""
+    if prob_of_true >= 1:
+        return True
+    return walked_select_assoc([[True, int(prob_of_true * 1000)],
+                                [False, int((1 - prob_of_true) * 1000)]])
+
+def summed_flatten(sequence):
+    """Flatten a sequence by summing lists, as the toolbox used to."""
+    if isinstance(sequence, list):
+        return sum(map(summed_flatten, sequence), [])
+    else:
+        return [sequence]
+
+def throughput(function, seconds):
+    """Return the thousands of calls of function made per second."""
+    calls = 0
+    start = time.perf_counter()
+    elapsed = 0
+    while elapsed < seconds:
+        for _ in range(100):
+            function()
+        calls += 100
+        elapsed = time.perf_counter() - start
+    return calls / elapsed / 1000.0
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[2, 10, 100, 1000])
+    parser.add_argument('--seconds', type=float, default=.2)
+    args = parser.parse_args()
+
+    random.seed(1)
+    print('%-14s %6s %12s %12s' % ('primitive', 'size', 'old k/s', 'new k/s'))
+    for size in args.sizes:
+        weights = [random.randint(0, 100) for _ in range(size)]
+        assoc_list = [[i, w / 7.0] for i, w in enumerate(weights)]
+        sampler = toolbox.Sampler(weights)
+        nested = [[i, [i, [i]]] for i in range(size)]
+        for name, old, new in [
+                ('weighted_index', lambda: walked_weighted_index(weights),
+                 lambda: toolbox.weighted_index(weights)),
+                ('Sampler.index', lambda: walked_weighted_index(weights),
+                 sampler.index),
+                ('select_assoc', lambda: walked_select_assoc(assoc_list),
+                 lambda: toolbox.select_assoc(assoc_list)),
+                ('flatten', lambda: summed_flatten(nested),
+                 lambda: toolbox.flatten(nested))]:
+            print('%-14s %6d %12.1f %12.1f' % (
+                name, size, throughput(old, args.seconds),
+                throughput(new, args.seconds)))
+    print('%-14s %6s %12.1f %12.1f' % (
+        'flip_coin', '', throughput(lambda: listed_flip_coin(.3), args.seconds),
+        throughput(lambda: toolbox.flip_coin(.3), args.seconds)))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""Benchmark of Slipnet.update.
+
+Records the slipnet activations at every update of seeded runs, then times
+updating from those activations with the loop over nodes and links that
+Slipnet.update used to run, with the compiled links, and with NumPy when
+it is installed.
+
+Run from the copycat-ajhager directory::
+
+    python benchmarks/slipnet_update.py --targets mrrjjj iijjkk kji
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import types
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import copycat.toolbox as toolbox
+from copycat.run import Run
+from copycat.slipnet import numpy
+
+def looped_update(slipnet):
+    """Update the slipnet by walking every node and link, as it used to."""
+    for node in slipnet.slipnodes:
+        node.decay()
+        if node.is_active():
+            for link in node.outgoing_links():
+                amount_to_spread = round(node.activation * \
+                        (link.intrinsic_degree_of_association() / 100.0))
+                link.to_node.activation_buffer += amount_to_spread
+
+    for node in slipnet.slipnodes:
+        node.activation = min(100, node.activation + node.activation_buffer)
+        if node.clamp:
+            node.activation = 100
+        else:
+            if node.activation >= 50:
+                full_activation_probability = (node.activation / 100.0) ** 3
+                if toolbox.flip_coin(full_activation_probability):
+                    node.activation = 100
+        node.activation_buffer = 0
+
+def recorded_states(args):
+    """Return the slipnet of a run and the node states at its updates."""
+    states = []
+    for target in args.targets:
+        run = Run(args.initial, args.modified, target, args.seed)
+        slipnet = run.slipnet
+        update = slipnet.update
+
+        def recording_update():
+            states.append([(node.activation, node.activation_buffer,
+                            node.clamp) for node in slipnet.slipnodes])
+            update()
+        slipnet.update = recording_update
+        while run.coderack.time < args.steps and \
+                not run.workspace.answer_string:
+            run.step()
+        del slipnet.update
+    return slipnet, states
+
+def timed(slipnet, update, states, repeat):
+    """Return the average time in microseconds of an update."""
+    total = 0
+    for _ in range(repeat):
+        for state in states:
+            for node, (activation, buffer, clamp) in zip(slipnet.slipnodes,
+                                                         state):
+                node.activation = activation
+                node.activation_buffer = buffer
+                node.clamp = clamp
+            start = time.perf_counter()
+            update()
+            total += time.perf_counter() - start
+    return 1e6 * total / (repeat * len(states))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--initial', default='abc')
+    parser.add_argument('--modified', default='abd')
+    parser.add_argument('--targets', nargs='+',
+                        default=['mrrjjj', 'iijjkk', 'kji'])
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--steps', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    slipnet, states = recorded_states(args)
+    random.seed(args.seed)
+    updates = [('looped', types.MethodType(looped_update, slipnet)),
+               ('compiled', slipnet.update)]
+    if numpy is not None:
+        updates.append(('numpy', slipnet.update_vectorized))
+    print('%d updates recorded' % len(states))
+    for name, update in updates:
+        print('%-10s %10.1f us' % (name, timed(slipnet, update, states,
+                                                args.repeat)))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,15 @@
+"""Long-string stress benchmarks for the Python Copycat implementations.
+
+The Copycat implementations are tuned for problems of three to five
+letters. This package generates synthetic problems of increasing length and
+group depth (see problems), runs each one headlessly with fixed seeds in a
+fresh process per run (see worker), and records codelets per second, peak
+resident set size and time to answer as JSON. The report module compares
+two such files and flags scaling regressions.
+
+Run from the copycat-ajhager directory::
+
+    python -m benchmarks.stress --lengths 3 6 12 24 --depths 0 1 \\
+        --output stress.json
+    python -m benchmarks.stress.report baseline.json stress.json
+"""
@@ -0,0 +1,59 @@
+"""Run the long-string stress benchmarks and write the results as JSON.
+
+Run from the copycat-ajhager directory::
+
+    python -m benchmarks.stress --lengths 3 6 12 24 --depths 0 1 \\
+        --seeds 1 2 3 --output stress.json
+"""
+
+import argparse
+import datetime
+import json
+import platform
+
+from benchmarks.stress import problems
+from benchmarks.stress.worker import IMPLEMENTATIONS, run_worker
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--implementations', nargs='+',
+                        choices=sorted(IMPLEMENTATIONS),
+                        default=sorted(IMPLEMENTATIONS))
+    parser.add_argument('--lengths', type=int, nargs='+',
+                        default=[3, 6, 12, 24])
+    parser.add_argument('--depths', type=int, nargs='+', default=[0, 1, 2])
+    parser.add_argument('--seeds', type=int, nargs='+', default=[1, 2, 3])
+    parser.add_argument('--max-codelets', type=int, default=5000,
+                        help='give up on a run after this many codelets')
+    parser.add_argument('--timeout', type=float, default=600,
+                        help='give up on a run after this many seconds')
+    parser.add_argument('--output', default='stress.json')
+    args = parser.parse_args()
+
+    results = []
+    for problem in problems.generate(args.lengths, args.depths):
+        for implementation in args.implementations:
+            for seed in args.seeds:
+                result = run_worker(implementation, problem, seed,
+                                    args.max_codelets, args.timeout)
+                result.update({'implementation': implementation,
+                               'problem': problem.name,
+                               'length': problem.length,
+                               'depth': problem.depth, 'seed': seed})
+                results.append(result)
+                print('%-8s %-40s seed %-3d %6d codelets %s' % (
+                    implementation, problem.name[:40], seed,
+                    result['codelets'],
+                    result['error'] or result['answer']))
+
+    metadata = {'date': datetime.datetime.now().isoformat(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'max_codelets': args.max_codelets}
+    with open(args.output, 'w') as output:
+        json.dump({'metadata': metadata, 'results': results}, output,
+                  indent=1)
+    print('wrote %d results to %s' % (len(results), args.output))
+
+if __name__ == '__main__':
+    main()
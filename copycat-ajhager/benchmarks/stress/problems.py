@@ -0,0 +1,71 @@
+"""Synthetic analogy problems of increasing length and group depth.
+
+Every problem has the shape "change the last letter of the initial string
+to its successor", as in abc -> abd, since neither implementation solves
+problems with more than one letter changed. The strings are made of units
+of letters taken in alphabetic order, cycling through a to y so that every
+letter has a successor. The group depth decides what a unit is:
+
+    depth 0: single letters                   ijklmn
+    depth 1: sameness groups of two letters   iijjkk
+    depth 2: runs of three depth 1 units      iijjkkiijjkk
+
+so deeper problems invite groups built out of other groups."""
+
+import collections
+
+ALPHABET = 'abcdefghijklmnopqrstuvwxy'
+
+Problem = collections.namedtuple('Problem', ['name', 'length', 'depth',
+                                             'initial', 'modified', 'target'])
+
+def units(depth, start):
+    """Yield the units of a string of the given depth forever, beginning
+    with the letter start."""
+    position = ALPHABET.index(start)
+    while True:
+        if depth == 0:
+            yield ALPHABET[position]
+            position = (position + 1) % len(ALPHABET)
+        elif depth == 1:
+            yield ALPHABET[position] * 2
+            position = (position + 1) % len(ALPHABET)
+        else:
+            run = [ALPHABET[(position + i) % len(ALPHABET)] * 2
+                   for i in range(3)]
+            yield ''.join(run)
+
+def letters(length, depth, start):
+    """Return the units of a string of at most length letters, with at least
+    one unit."""
+    result = []
+    total = 0
+    for unit in units(depth, start):
+        if result and total + len(unit) > length:
+            break
+        result.append(unit)
+        total += len(unit)
+    return result
+
+def successor(letter):
+    """Return the letter that follows the given one in the alphabet."""
+    return ALPHABET[(ALPHABET.index(letter) + 1) % len(ALPHABET)]
+
+def problem(length, depth):
+    """Return the problem with strings of the given length and depth."""
+    initial = ''.join(letters(length, depth, 'a'))
+    modified = initial[:-1] + successor(initial[-1])
+    target = ''.join(letters(length, depth, 'i'))
+    name = '%s:%s::%s' % (initial, modified, target)
+    return Problem(name, len(target), depth, initial, modified, target)
+
+def generate(lengths, depths):
+    """Return the problems for every combination of length and depth,
+    shortest first, without duplicates."""
+    problems = []
+    for depth in depths:
+        for length in sorted(lengths):
+            candidate = problem(length, depth)
+            if candidate not in problems:
+                problems.append(candidate)
+    return problems
@@ -0,0 +1,150 @@
+"""Summarize stress benchmark results and flag scaling regressions.
+
+Given one results file, prints the median cost per codelet, peak resident
+set size and time from the first codelet to the answer for every
+implementation, depth and length, together with how the cost per codelet
+scales with string length: the exponent k in cost ~ length ** k, fitted by
+least squares on a log-log scale.
+
+Given a baseline and a current file, also flags a regression wherever the
+current cost per codelet or peak memory exceeds the baseline by more than
+the threshold factor, or the scaling exponent has grown by more than the
+slope tolerance, and exits with status 1.
+
+Run from the copycat-ajhager directory::
+
+    python -m benchmarks.stress.report baseline.json stress.json
+"""
+
+import argparse
+import json
+import math
+import sys
+
+def median(values):
+    """Return the median of the values, or None if there are none."""
+    values = sorted(value for value in values if value is not None)
+    if not values:
+        return None
+    middle = len(values) // 2
+    if len(values) % 2:
+        return values[middle]
+    return (values[middle - 1] + values[middle]) / 2.0
+
+def load(path):
+    """Return the results recorded in the file."""
+    with open(path) as results:
+        return json.load(results)['results']
+
+def summarize(results):
+    """Return the median measurements of the results, keyed by
+    (implementation, depth, length)."""
+    cells = {}
+    for result in results:
+        key = (result['implementation'], result['depth'], result['length'])
+        cells.setdefault(key, []).append(result)
+    summary = {}
+    for key, runs in cells.items():
+        rates = [run['codelets_per_second'] for run in runs
+                 if run['codelets_per_second'] and not run['error']]
+        summary[key] = {
+            'us_per_codelet': median(1e6 / rate for rate in rates),
+            'peak_rss_kb': median(run['peak_rss_kb'] for run in runs),
+            'time_to_answer': median(run['time_to_answer'] for run in runs),
+            'answered': sum(1 for run in runs if run['answer'] is not None),
+            'runs': len(runs),
+        }
+    return summary
+
+def exponents(summary):
+    """Return the fitted scaling exponent of the cost per codelet with
+    string length, keyed by (implementation, depth)."""
+    points = {}
+    for (implementation, depth, length), cell in summary.items():
+        if cell['us_per_codelet']:
+            points.setdefault((implementation, depth), []).append(
+                (math.log(length), math.log(cell['us_per_codelet'])))
+    fitted = {}
+    for key, xys in points.items():
+        if len(xys) < 2:
+            continue
+        mean_x = sum(x for x, _ in xys) / len(xys)
+        mean_y = sum(y for _, y in xys) / len(xys)
+        spread = sum((x - mean_x) ** 2 for x, _ in xys)
+        if spread:
+            fitted[key] = sum((x - mean_x) * (y - mean_y)
+                              for x, y in xys) / spread
+    return fitted
+
+def regressions(baseline, current, threshold, slope_tolerance):
+    """Return a description of each regression from baseline to current."""
+    found = []
+    for key in sorted(set(baseline) & set(current)):
+        for name, unit in [('us_per_codelet', 'us per codelet'),
+                           ('peak_rss_kb', 'kB peak RSS')]:
+            before = baseline[key][name]
+            after = current[key][name]
+            if before and after and after > threshold * before:
+                found.append('%s depth %d length %d: %.1f -> %.1f %s' % (
+                    key + (before, after, unit)))
+    before = exponents(baseline)
+    after = exponents(current)
+    for key in sorted(set(before) & set(after)):
+        if after[key] > before[key] + slope_tolerance:
+            found.append('%s depth %d: scaling exponent %.2f -> %.2f' % (
+                key + (before[key], after[key])))
+    return found
+
+def show(value, form):
+    """Return the value formatted, or a dash if there is none."""
+    return '-' if value is None else form % value
+
+def print_summary(summary):
+    print('%-8s %5s %6s %14s %12s %10s %8s' % (
+        'impl', 'depth', 'length', 'us/codelet', 'peak RSS kB',
+        'answer s', 'answered'))
+    for key in sorted(summary):
+        cell = summary[key]
+        print('%-8s %5d %6d %14s %12s %10s %5d/%-2d' % (
+            key + (show(cell['us_per_codelet'], '%.1f'),
+                   show(cell['peak_rss_kb'], '%d'),
+                   show(cell['time_to_answer'], '%.2f'),
+                   cell['answered'], cell['runs'])))
+    print('')
+    for (implementation, depth), exponent in \
+            sorted(exponents(summary).items()):
+        print('%-8s depth %d: cost per codelet ~ length ** %.2f' % (
+            implementation, depth, exponent))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('files', nargs='+', metavar='RESULTS',
+                        help='a results file, or a baseline and a current one')
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help='flag costs that grow by more than this factor')
+    parser.add_argument('--slope-tolerance', type=float, default=0.25,
+                        help='flag scaling exponents that grow by more '
+                             'than this')
+    args = parser.parse_args()
+    if len(args.files) > 2:
+        parser.error('expected one or two results files')
+
+    current = summarize(load(args.files[-1]))
+    print_summary(current)
+    if len(args.files) == 1:
+        return 0
+
+    baseline = summarize(load(args.files[0]))
+    found = regressions(baseline, current, args.threshold,
+                        args.slope_tolerance)
+    print('')
+    if not found:
+        print('no regressions against %s' % args.files[0])
+        return 0
+    print('regressions against %s:' % args.files[0])
+    for regression in found:
+        print('  ' + regression)
+    return 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""Run one problem in one implementation and print the result as JSON.
+
+Each run gets a process of its own, so that the module level state of
+copycat-jalanb starts fresh and the peak resident set size belongs to that
+run alone. run_worker starts it as::
+
+    python -m benchmarks.stress.worker IMPLEMENTATION INITIAL MODIFIED \\
+        TARGET SEED MAX_CODELETS [PATH]
+
+PATH is the directory to import the implementation from, if it is not the
+one in IMPLEMENTATIONS.
+"""
+
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+IMPLEMENTATIONS = {
+    'ajhager': ROOT,
+    'jalanb': os.path.join(os.path.dirname(ROOT), 'copycat-jalanb'),
+}
+
+def run_ajhager(initial, modified, target, seed, max_codelets):
+    """Run the problem in copycat-ajhager and return the answer, or None,
+    the number of codelets run, the final temperature and the seconds from
+    the first codelet to the answer, or None."""
+    from copycat.run import Run
+    run = Run(initial, modified, target, seed)
+    workspace = run.workspace
+    start = time.perf_counter()
+    while not workspace.answer_string and run.coderack.time < max_codelets:
+        run.step()
+    answer = workspace.answer_string
+    if not answer:
+        return None, run.coderack.time, workspace.temperature, None
+    return (answer.name, run.coderack.time, workspace.temperature,
+            time.perf_counter() - start)
+
+def run_jalanb(initial, modified, target, seed, max_codelets):
+    """Run the problem in copycat-jalanb and return the answer, or None,
+    the number of codelets run, the final temperature and the seconds from
+    the first codelet to the answer, or None."""
+    from copycat import copycat
+    from copycat.coderack import coderack
+    from copycat.slipnet import slipnet
+    from copycat.temperature import temperature
+    from copycat.workspace import workspace
+    random.seed(seed)
+    workspace.set_strings(initial, modified, target)
+    slipnet.reset()
+    workspace.reset()
+    coderack.reset()
+    last_update = 0
+    start = time.perf_counter()
+    while not workspace.found_answer and \
+            coderack.codelets_run < max_codelets:
+        last_update = copycat.main_loop(last_update)
+    if not workspace.found_answer:
+        return None, coderack.codelets_run, temperature.value, None
+    return (workspace.rule.final_answer, coderack.codelets_run,
+            temperature.value, time.perf_counter() - start)
+
+RUNNERS = {'ajhager': run_ajhager, 'jalanb': run_jalanb}
+
+def peak_rss_kb():
+    """Return the peak resident set size of this process in kilobytes."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        return peak // 1024
+    return peak
+
+def run_worker(implementation, problem, seed, max_codelets, timeout,
+               path=None):
+    """Run the problem in a worker process and return its result. The
+    implementation is imported from path if one is given."""
+    command = [sys.executable, '-m', 'benchmarks.stress.worker',
+               implementation, problem.initial, problem.modified,
+               problem.target, str(seed), str(max_codelets)]
+    if path:
+        command.append(path)
+    failed = {'answer': None, 'codelets': 0, 'temperature': None,
+              'seconds': None, 'codelets_per_second': None,
+              'time_to_answer': None, 'peak_rss_kb': None}
+    try:
+        output = subprocess.run(command, cwd=ROOT, capture_output=True,
+                                text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        failed.update({'seconds': timeout, 'error': 'timeout'})
+        return failed
+    lines = output.stdout.strip().splitlines()
+    if output.returncode != 0 or not lines:
+        lines = output.stderr.strip().splitlines() or ['no output']
+        failed['error'] = lines[-1]
+        return failed
+    return json.loads(lines[-1])
+
+def main():
+    implementation, initial, modified, target = sys.argv[1:5]
+    seed, max_codelets = [int(arg) for arg in sys.argv[5:7]]
+    if len(sys.argv) > 7:
+        sys.path.insert(0, sys.argv[7])
+    else:
+        sys.path.insert(0, IMPLEMENTATIONS[implementation])
+
+    result = {'answer': None, 'codelets': 0, 'temperature': None,
+              'time_to_answer': None, 'error': None}
+    start = time.perf_counter()
+    try:
+        answer, codelets, temperature, time_to_answer = \
+                RUNNERS[implementation](initial, modified, target, seed,
+                                        max_codelets)
+        result['answer'] = answer
+        result['codelets'] = codelets
+        result['temperature'] = temperature
+        result['time_to_answer'] = time_to_answer
+    except (Exception, SystemExit) as error:
+        result['error'] = '%s: %s' % (type(error).__name__, error)
+    seconds = time.perf_counter() - start
+
+    result['seconds'] = seconds
+    result['codelets_per_second'] = result['codelets'] / seconds
+    result['peak_rss_kb'] = peak_rss_kb()
+    print(json.dumps(result))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""Benchmark of the cached views of strings.
+
+Runs seeded problems and reports, for each view of the initial and target
+strings, how often it was returned from the cache and how often it had to
+be rebuilt. Then times the getters in the final state of each run against
+building the views from scratch.
+
+Run from the copycat-ajhager directory::
+
+    python benchmarks/string_views.py --targets mrrjjj iijjkk kji --seeds 3
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import copycat.toolbox as toolbox
+from copycat.run import Run
+from copycat.workspace.string import VIEWS
+
+def rebuilt_views(string):
+    """Return the views of the string, built from scratch."""
+    return {
+        'letters': lambda: [string.letters[i] for i in sorted(string.letters)],
+        'groups': lambda: list(string.groups.values()),
+        'proposed_groups': lambda: toolbox.unique(
+            group for groups in string.proposed_groups.values()
+            for group in groups),
+        'bonds': lambda: toolbox.unique(string.from_to_bonds.values()),
+        'proposed_bonds': lambda: toolbox.unique(
+            bond for bonds in string.proposed_bonds.values()
+            for bond in bonds)}
+
+def cached_views(string):
+    """Return the getters of the views of the string."""
+    return {
+        'letters': string.get_letters,
+        'groups': string.get_groups,
+        'proposed_groups': string.get_proposed_groups,
+        'bonds': string.get_bonds,
+        'proposed_bonds': string.get_proposed_bonds}
+
+def timed(function, calls):
+    """Return the average time in microseconds of calling function."""
+    start = time.perf_counter()
+    for _ in range(calls):
+        function()
+    return 1e6 * (time.perf_counter() - start) / calls
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--initial', default='abc')
+    parser.add_argument('--modified', default='abd')
+    parser.add_argument('--targets', nargs='+',
+                        default=['mrrjjj', 'iijjkk', 'kji'])
+    parser.add_argument('--seeds', type=int, default=3)
+    parser.add_argument('--steps', type=int, default=2000)
+    parser.add_argument('--calls', type=int, default=20000)
+    args = parser.parse_args()
+
+    hits = dict.fromkeys(VIEWS, 0)
+    misses = dict.fromkeys(VIEWS, 0)
+    rebuilt = dict.fromkeys(VIEWS, 0.0)
+    cached = dict.fromkeys(VIEWS, 0.0)
+    strings = 0
+    for target in args.targets:
+        for seed in range(1, args.seeds + 1):
+            run = Run(args.initial, args.modified, target, seed)
+            while run.coderack.time < args.steps and \
+                    not run.workspace.answer_string:
+                run.step()
+            for string in [run.workspace.initial_string,
+                           run.workspace.target_string]:
+                strings += 1
+                statistics = string.view_statistics()
+                rebuilders = rebuilt_views(string)
+                getters = cached_views(string)
+                for name in VIEWS:
+                    hits[name] += statistics[name][0]
+                    misses[name] += statistics[name][1]
+                    rebuilt[name] += timed(rebuilders[name], args.calls)
+                    cached[name] += timed(getters[name], args.calls)
+
+    print('%-16s %10s %10s %8s %12s %12s' % ('view', 'hits', 'misses',
+                                             'hit %', 'rebuilt us',
+                                             'cached us'))
+    for name in VIEWS:
+        calls = hits[name] + misses[name]
+        print('%-16s %10d %10d %8.1f %12.2f %12.2f' % (
+            name, hits[name], misses[name],
+            100.0 * hits[name] / calls if calls else 0,
+            rebuilt[name] / strings, cached[name] / strings))
+
+if __name__ == '__main__':
+    main()
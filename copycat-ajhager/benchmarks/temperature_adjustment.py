@@ -0,0 +1,80 @@
+"""Benchmark of the temperature adjusted probabilities and values.
+
+Times Workspace.temperature_adjusted_probability and
+temperature_adjusted_values, which take their temperature factors from a
+cache that is refreshed when the temperature changes, against computing the
+factors on every call. The temperature changes every --calls calls, as it
+does once per update during a run.
+
+Run from the copycat-ajhager directory::
+
+    python benchmarks/temperature_adjustment.py --calls 50
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+import types
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from copycat.run import Run
+
+def recomputed_probability(workspace, probability):
+    """Return the temperature adjusted probability, computed from scratch."""
+    if probability == 0:
+        return 0
+    elif probability <= .5:
+        prob_factor = max(1, int(abs(math.log(probability, 10))))
+        value1 = (10 - math.sqrt(100 - workspace.temperature)) / 100.0
+        value2 = 10 ** -(prob_factor - 1) - probability
+        return min(.5, probability + value1 * value2)
+    value1 = 1 - probability
+    value2 = (10 - math.sqrt(100 - workspace.temperature)) / 100.0
+    value3 = 1 - (1 - probability)
+    return max(.5, 1 - value1 + (value2 * value3))
+
+def recomputed_values(workspace, values):
+    """Return the temperature adjusted values, computed from scratch."""
+    exponent = ((100 - workspace.temperature) / 30.0) + .5
+    return [round(val ** exponent) for val in values]
+
+def timed(workspace, function, arguments, temperatures, calls):
+    """Return the average time in microseconds of calling function."""
+    start = time.perf_counter()
+    for temperature in temperatures:
+        workspace.temperature = temperature
+        for argument in arguments[:calls]:
+            function(argument)
+    return 1e6 * (time.perf_counter() - start) / (len(temperatures) * calls)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--calls', type=int, default=50,
+                        help='calls between temperature changes')
+    parser.add_argument('--temperatures', type=int, default=2000)
+    args = parser.parse_args()
+
+    workspace = Run('abc', 'abd', 'ijk', 1).workspace
+    random.seed(1)
+    temperatures = [random.uniform(0, 100) for _ in range(args.temperatures)]
+    probabilities = [random.random() for _ in range(args.calls)]
+    values = [[random.uniform(0, 100) for _ in range(8)]
+              for _ in range(args.calls)]
+
+    print('%-12s %16s %16s' % ('', 'recomputed us', 'cached us'))
+    for name, recomputed, cached, arguments in [
+            ('probability', recomputed_probability,
+             workspace.temperature_adjusted_probability, probabilities),
+            ('values', recomputed_values,
+             workspace.temperature_adjusted_values, values)]:
+        before = timed(workspace, types.MethodType(recomputed, workspace),
+                       arguments, temperatures, args.calls)
+        after = timed(workspace, cached, arguments, temperatures, args.calls)
+        print('%-12s %16.3f %16.3f' % (name, before, after))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""Benchmark of the top-down phase of an update.
+
+Records the slipnet at every update of seeded runs, then times building the
+roster of top-down codelets by scanning every node, as
+Slipnet.top_down_codelets used to, against reading it from the hot nodes.
+Also times the whole top-down phase of Run.update, which turns the roster
+into codelets to post, and reports how often nodes crossed the activation
+threshold during each run.
+
+Run from the copycat-ajhager directory::
+
+    python benchmarks/top_down_codelets.py --targets mrrjjj iijjkk kji
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from copycat.run import Run
+import copycat.coderack.codelets
+
+def scanned_top_down_codelets(slipnet):
+    """Return the codelets attached to active nodes by scanning them all."""
+    codelets = []
+    for node in slipnet.slipnodes:
+        if node.activation >= 50:
+            for codelet in node.codelets:
+                codelets.append((codelet, [node], node.conceptual_depth / 100.))
+    return codelets
+
+def top_down_phase(workspace, roster):
+    """Return the codelets the top-down phase of an update would post."""
+    codelets = []
+    for codelet_name, args, urgency in roster():
+        codelet = getattr(copycat.coderack.codelets, codelet_name)
+        category = codelet.structure_category
+        codelets.extend(workspace.get_codelets(category, codelet, urgency,
+                                               args))
+    return codelets
+
+def recorded_runs(args):
+    """Return each run with the slipnet states at its updates."""
+    runs = []
+    for target in args.targets:
+        run = Run(args.initial, args.modified, target, args.seed)
+        states = []
+        update = run.slipnet.update
+
+        def recording_update():
+            update()
+            slipnet = run.slipnet
+            states.append(([node.activation for node in slipnet.slipnodes],
+                           list(slipnet.hot), list(slipnet.hot_indexes)))
+        run.slipnet.update = recording_update
+        while run.coderack.time < args.steps and \
+                not run.workspace.answer_string:
+            run.step()
+        del run.slipnet.update
+        runs.append((target, run, states))
+    return runs
+
+def timed(run, function, states, repeat, seed):
+    """Return the average time in microseconds of calling function."""
+    slipnet = run.slipnet
+    random.seed(seed)
+    total = 0
+    for _ in range(repeat):
+        for activations, hot, hot_indexes in states:
+            for node, activation in zip(slipnet.slipnodes, activations):
+                node.activation = activation
+            slipnet.hot = hot
+            slipnet.hot_indexes = hot_indexes
+            start = time.perf_counter()
+            function()
+            total += time.perf_counter() - start
+    return 1e6 * total / (repeat * len(states))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--initial', default='abc')
+    parser.add_argument('--modified', default='abd')
+    parser.add_argument('--targets', nargs='+',
+                        default=['mrrjjj', 'iijjkk', 'kji'])
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--steps', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    print('%-8s %7s %7s %7s %10s %10s %10s %10s' % (
+        'target', 'updates', 'warmed', 'cooled', 'scan us', 'hot us',
+        'phase us', 'hot phase'))
+    for target, run, states in recorded_runs(args):
+        slipnet = run.slipnet
+        warmed, cooled = slipnet.warmed, slipnet.cooled
+        timings = [
+            timed(run, function, states, args.repeat, args.seed)
+            for function in [
+                lambda: scanned_top_down_codelets(slipnet),
+                slipnet.top_down_codelets,
+                lambda: top_down_phase(
+                    run.workspace,
+                    lambda: scanned_top_down_codelets(slipnet)),
+                lambda: top_down_phase(run.workspace,
+                                       slipnet.top_down_codelets)]]
+        print('%-8s %7d %7d %7d %10.2f %10.2f %10.2f %10.2f' % (
+            (target, len(states), warmed, cooled) + tuple(timings)))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""Profile comparison of the workspace unhappiness sums.
+
+Profiles long seeded runs twice, once reading the running sums kept by the
+workspace and once with the old sums over every object patched back in, and
+reports the calls and time spent in the unhappiness methods and in
+post_codelet_probability and update_temperature, which read them.
+
+Run from the copycat-ajhager directory::
+
+    python benchmarks/unhappiness_sums.py --target ijkkllmmnnooppqqrrss --runs 5
+"""
+
+import argparse
+import cProfile
+import os
+import pstats
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from copycat.run import Run
+from copycat.workspace import Workspace
+
+METHODS = ['intra_string_unhappiness', 'inter_string_unhappiness',
+           'total_unhappiness', 'post_codelet_probability',
+           'update_temperature']
+
+def summed_unhappiness(name):
+    """Return a method summing the named unhappiness over all objects."""
+    def unhappiness(self):
+        total = sum([obj.relative_importance * getattr(obj, name)
+                     for obj in self.objects()])
+        return min(100, total / 200.0)
+    unhappiness.__code__ = unhappiness.__code__.replace(co_name=name)
+    return unhappiness
+
+def profiled_runs(args):
+    """Profile the runs, returning the profile and the codelets run."""
+    profile = cProfile.Profile()
+    codelets = 0
+    for seed in range(args.seed, args.seed + args.runs):
+        run = Run(args.initial, args.modified, args.target, seed)
+        profile.enable()
+        while not run.workspace.answer_string and \
+                run.coderack.time < args.steps:
+            run.step()
+        profile.disable()
+        codelets += run.coderack.time
+    return profile, codelets
+
+def report(label, profile, codelets, elapsed):
+    """Print the calls and cumulative time of each method."""
+    stats = pstats.Stats(profile).stats
+    print('%s: %d codelets in %.2f s' % (label, codelets, elapsed))
+    for method in METHODS:
+        calls, cumulative = 0, 0
+        for (_, _, function), (_, ncalls, _, cumtime, _) in stats.items():
+            if function == method:
+                calls += ncalls
+                cumulative += cumtime
+        print('    %-28s %8d calls %10.1f ms' % (method, calls,
+                                                 1000 * cumulative))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--initial', default='abc')
+    parser.add_argument('--modified', default='abd')
+    parser.add_argument('--target', default='ijkkllmmnnooppqqrrss')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--steps', type=int, default=5000,
+                        help='codelet limit for each run')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    profile, codelets = profiled_runs(args)
+    report('running sums', profile, codelets, time.perf_counter() - start)
+
+    for name in METHODS[:3]:
+        setattr(Workspace, name, summed_unhappiness(name))
+    start = time.perf_counter()
+    profile, codelets = profiled_runs(args)
+    report('sums over objects', profile, codelets, time.perf_counter() - start)
+
+if __name__ == '__main__':
+    main()
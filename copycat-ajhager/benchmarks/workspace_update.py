@@ -0,0 +1,91 @@
+"""Benchmark of Workspace.update with and without incremental updates.
+
+Runs seeded problems with incremental updates. At every update the full
+recompute is timed first from the same state and random number generator
+state, the values are put back, and then the incremental update is timed, so
+both are measured along the same trajectory. Reports workspace updates
+(timesteps) per second for each.
+
+Run from the copycat-ajhager directory::
+
+    python benchmarks/workspace_update.py --target ijkkllmmnnooppqq --runs 20
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from copycat.run import Run
+
+VALUES = ['weighted_intra_unhappiness', 'weighted_inter_unhappiness',
+          'weighted_total_unhappiness', 'internal_strength', 'external_strength', 'total_strength',
+          'raw_importance', 'intra_string_happiness',
+          'intra_string_unhappiness', 'inter_string_happiness',
+          'inter_string_unhappiness', 'total_happiness', 'total_unhappiness',
+          'intra_string_salience', 'inter_string_salience', 'total_salience']
+
+def snapshot(workspace):
+    """Return the strengths, object values and unhappiness sums on the
+    workspace."""
+    items = [workspace] + workspace.structures() + workspace.objects()
+    return [(item, [getattr(item, name, None) for name in VALUES])
+            for item in items]
+
+def restore(values):
+    """Put back the values recorded by snapshot."""
+    for item, recorded in values:
+        for name, value in zip(VALUES, recorded):
+            if value is not None:
+                setattr(item, name, value)
+
+def timed_run(args, seed, timings):
+    """Run one problem, adding the time taken by each kind of update."""
+    run = Run(args.initial, args.modified, args.target, seed)
+    workspace = run.workspace
+    incremental = workspace.update_changed_values
+
+    def update_changed_values():
+        values = snapshot(workspace)
+        state = random.getstate()
+        start = time.perf_counter()
+        workspace.update_all_values()
+        timings['full'] += time.perf_counter() - start
+
+        restore(values)
+        random.setstate(state)
+        start = time.perf_counter()
+        incremental()
+        timings['incremental'] += time.perf_counter() - start
+        timings['updates'] += 1
+
+    workspace.update_changed_values = update_changed_values
+    while not workspace.answer_string and run.coderack.time < args.steps:
+        run.step()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--initial', default='abc')
+    parser.add_argument('--modified', default='abd')
+    parser.add_argument('--target', default='ijkkllmmnnooppqq')
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--steps', type=int, default=5000,
+                        help='codelet limit for each run')
+    args = parser.parse_args()
+
+    timings = {'full': 0, 'incremental': 0, 'updates': 0}
+    for seed in range(args.seed, args.seed + args.runs):
+        timed_run(args, seed, timings)
+    print('%d updates over %d runs of %s %s %s' % (
+        timings['updates'], args.runs, args.initial, args.modified,
+        args.target))
+    for label in ['full', 'incremental']:
+        print('%-12s %10.1f updates/s' % (
+            label, timings['updates'] / timings[label]))
+
+if __name__ == '__main__':
+    main()
@@ -14,4 +14,13 @@
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
 # 02110-1301, USA.
 
-from clients.opengl import OpenglClient
+"""Clients display copycat runs.
+
+OpenglClient is imported on first use, so that the clients that need no
+display, such as the scheduler, can be imported without pyglet."""
+
+def __getattr__(name):
+    if name == "OpenglClient":
+        from clients.opengl import OpenglClient
+        return OpenglClient
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
@@ -29,6 +29,7 @@ pyglet.resource.add_font("erasdust.ttf")
 
 from copycat.run import Run
 
+from clients.scheduler import Scheduler
 from .coderack import Coderack
 from .slipnet import Slipnet
 from .workspace import Workspace
@@ -75,9 +76,13 @@ class Button(object):
 class Window(pyglet.window.Window):
     """The main window keeps track of what scene is currently being viewed,
     manages the gui elements that are always on screen, and takes care of
-    updating the simulation."""
+    updating the simulation.
 
-    def __init__(self, run):
+    The simulation runs speed steps per second, or as many as fit when
+    speed is None, spending at most budget seconds stepping each frame.
+    Plus and minus double and halve the speed while running."""
+
+    def __init__(self, run, speed=15, budget=.01):
         super(Window, self).__init__(1024, 600, caption="Copycat", vsync=False)
         glEnable(GL_BLEND)
         glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
@@ -86,11 +91,10 @@ class Window(pyglet.window.Window):
         self.show_fps = False
 
         self.done = False
-        self.time = 0
-        self.speed = 15
         self.playing = False
 
         self.run = run
+        self.scheduler = Scheduler(run, speed=speed, budget=budget)
 
         background = pyglet.resource.image("blackboard.png")
         self.background = pyglet.sprite.Sprite(background)
@@ -114,6 +118,10 @@ class Window(pyglet.window.Window):
                                       color=(255, 255, 255, 190), batch=self.batch,
                                       anchor_x="center")
 
+        self.stats = pyglet.text.Label("", "EraserDust", 12, x=1014, y=578,
+                                       color=(255, 255, 255, 125),
+                                       anchor_x="right")
+
         self.slipnet = Slipnet(self.run.slipnet, 0, 0, 512, 300, self.batch)
         self.coderack = Coderack(self.run.coderack, 512, 0, 512, 300, self.batch)
         self.workspace = Workspace(self.run.workspace, 0, 300, 1024, 300, self.batch)
@@ -127,6 +135,14 @@ class Window(pyglet.window.Window):
             self.show_fps = not self.show_fps
         elif symbol == pyglet.window.key.SPACE:
             self.button.on_key_press(symbol, modifiers)
+        elif symbol in (pyglet.window.key.PLUS, pyglet.window.key.EQUAL,
+                        pyglet.window.key.NUM_ADD):
+            if self.scheduler.speed is not None:
+                self.scheduler.speed *= 2
+        elif symbol in (pyglet.window.key.MINUS,
+                        pyglet.window.key.NUM_SUBTRACT):
+            if self.scheduler.speed is not None and self.scheduler.speed > 1:
+                self.scheduler.speed //= 2
 
     def on_mouse_press(self, x, y, button, modifiers):
         self.button.on_mouse_press(x, y, button, modifiers)
@@ -170,11 +186,13 @@ class Window(pyglet.window.Window):
                                      255 - self.saved_temp / 1.4,
                                      255 - self.saved_temp / 1.15)
 
-        # Update the simulation at the given speed.
-        self.time += dt
-        if self.time >= 1.0 / self.speed:
-            self.run.step()
-            self.time = 0
+        # Update the simulation at the given speed, within the frame budget.
+        self.scheduler.update(dt)
+        if self.show_fps:
+            self.stats.text = "%s/%d steps/s  %.1f ms" % (
+                self.scheduler.speed or "max",
+                self.scheduler.steps_per_second,
+                self.scheduler.frame_time * 1000)
 
     def on_draw(self):
         self.clear()
@@ -182,12 +200,13 @@ class Window(pyglet.window.Window):
         self.batch.draw()
         if self.show_fps:
             self.clock.draw()
+            self.stats.draw()
 
 class OpenglClient(pyglet.window.Window):
-    def __init__(self, initial, modified, target, seed):
+    def __init__(self, initial, modified, target, seed, speed=15, budget=.01):
         initial = initial or "abc"
         modified = modified or "abd"
         target = target or "ijk"
         run = Run(initial, modified, target, seed)
-        window = Window(run)
+        window = Window(run, speed, budget)
         pyglet.app.run()
@@ -17,12 +17,14 @@
 # IDEAS:
 # Intensity of the codelet count should be how probable that type is to be chosen
 
-from collections import defaultdict as dd
 import pyglet
 
+from copycat.coderack import FamilyTally
+
 class Coderack(object):
     def __init__(self, coderack, x, y, w, h, batch):
         self.coderack = coderack
+        self.tally = FamilyTally(coderack)
         self.x = x
         self.y = y
         self.w = w
@@ -74,10 +76,6 @@ class Coderack(object):
             z += 1
 
     def update(self, dt):
-        counts = dd(int)
-        for codelet in self.coderack.codelets():
-            counts[codelet.__class__.__name__] += 1
-
         for name, number in zip(self.codelets, self.counts):
             if self.coderack.last_chosen.__class__.__name__ == name.name:
                 name.color = (200, 255, 180, 200)
@@ -87,7 +85,7 @@ class Coderack(object):
                     name.color = (200, 255, 180, alpha)
 
             # Change this to urgency instead of number.
-            num = counts[name.name]
+            num = self.tally.count(name.name)
             name = str(num)
             if number.text != name:
                 number.text = name
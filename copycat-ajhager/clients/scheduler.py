@@ -0,0 +1,92 @@
+# Copyright (c) 2007-2017 Joseph Hager.
+#
+# Copycat is free software; you can redistribute it and/or modify
+# it under the terms of version 2 of the GNU General Public License,
+# as published by the Free Software Foundation.
+#
+# Copycat is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Copycat; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.
+
+"""Scheduler"""
+
+import collections
+import time
+
+class Scheduler(object):
+    """Scheduler steps a run from a client's frame updates.
+
+    Each update runs the steps that are due at the requested speed, but
+    stops starting new steps once the frame's time budget is spent, so a
+    high speed or a slow step does not stall drawing. Steps that did not
+    fit are dropped rather than carried into later frames.
+
+    Attributes:
+        run: The run being stepped.
+        speed: The number of steps per second to run, or None to run as
+            many steps as fit in the budget.
+        budget: The most time in seconds to spend starting steps each frame.
+        clock: A function returning the current time in seconds.
+        time: The time since the last step that is not yet used by a step.
+        frames: The elapsed time, steps taken and time spent stepping for
+            each of the recent frames.
+        steps_per_second: The measured steps per second over the frames.
+        frame_time: The average time in seconds spent stepping each frame.
+        last_frame_time: The time in seconds spent stepping last frame."""
+
+    def __init__(self, run, speed=15, budget=.01, clock=time.perf_counter,
+                 window=60):
+        self.run = run
+        self.speed = speed
+        self.budget = budget
+        self.clock = clock
+        self.time = 0
+        self.frames = collections.deque(maxlen=window)
+        self.steps_per_second = 0
+        self.frame_time = 0
+        self.last_frame_time = 0
+
+    def due(self, dt):
+        """Add the elapsed time and return the number of steps now due."""
+        if self.speed is None:
+            self.time = 0
+            return None
+        self.time += dt
+        steps = int(self.time * self.speed)
+        self.time -= steps / float(self.speed)
+        return steps
+
+    def update(self, dt):
+        """Step the run for a frame after dt seconds have elapsed and return
+        the number of steps taken."""
+        due = self.due(dt)
+        steps = 0
+        start = self.clock()
+        spent = 0
+        while due is None or steps < due:
+            if self.run.workspace.answer_string:
+                break
+            self.run.step()
+            steps += 1
+            spent = self.clock() - start
+            if spent >= self.budget:
+                break
+        self.record(dt, steps, spent)
+        return steps
+
+    def record(self, dt, steps, spent):
+        """Record a frame and update the measured rates."""
+        self.frames.append((dt, steps, spent))
+        elapsed = sum(frame[0] for frame in self.frames)
+        if elapsed > 0:
+            self.steps_per_second = sum(frame[1] for frame in self.frames) / \
+                    elapsed
+        self.frame_time = sum(frame[2] for frame in self.frames) / \
+                len(self.frames)
+        self.last_frame_time = spent
@@ -0,0 +1,117 @@
+# Copyright (c) 2007-2017 Joseph Hager.
+#
+# Copycat is free software; you can redistribute it and/or modify
+# it under the terms of version 2 of the GNU General Public License,
+# as published by the Free Software Foundation.
+#
+# Copycat is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Copycat; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.
+
+"""Batch runs a problem headlessly for a range of seeds.
+
+The runs are shared out over a pool of worker processes. Each worker lives
+for the whole batch and takes run after run, so the cost of starting a
+process and importing copycat is paid once per worker rather than once per
+run. A run builds its own coderack, slipnet and workspace and seeds the
+random module itself, so a seed gives the same run in any worker and in any
+order.
+
+Every run is written out as one line of JSON as soon as it finishes (see
+report for summarizing them)::
+
+    python -m copycat.batch abc abd xyz --first-seed 1 --runs 1000 \\
+        --output xyz.jsonl
+    python -m copycat.batch.report xyz.jsonl
+
+With --record-bins each line also holds how the coderack's urgency bins
+filled over the run, which pressure summarizes across runs.
+"""
+
+import json
+import multiprocessing
+import time
+
+from copycat.coderack.recorder import BinRecorder
+from copycat.run import Run
+
+def run_seed(problem, seed, max_codelets=None, record_bins=False):
+    """Run the problem, a tuple of the initial, modified and target strings,
+    with the seed and return a record of the run.
+
+    The record holds the problem, the seed, the answer or None if the run
+    gave up after max_codelets, the final temperature, the number of
+    codelets run, the time taken in seconds and the error that stopped the
+    run, if any. With record_bins it also holds the time series of the
+    coderack's bins, from a BinRecorder, under 'bins' (see pressure)."""
+    initial, modified, target = problem
+    record = {'initial': initial, 'modified': modified, 'target': target,
+              'seed': seed, 'answer': None, 'temperature': None,
+              'codelets': 0, 'seconds': None, 'error': None}
+    start = time.perf_counter()
+    run = None
+    recorder = BinRecorder() if record_bins else None
+    try:
+        run = Run(initial, modified, target, seed)
+        run.coderack.record(recorder)
+        workspace = run.workspace
+        while not workspace.answer_string:
+            if max_codelets is not None and run.coderack.time >= max_codelets:
+                break
+            run.step()
+        if workspace.answer_string:
+            record['answer'] = workspace.answer_string.name
+    except (Exception, SystemExit) as error:
+        record['error'] = '%s: %s' % (type(error).__name__, error)
+    record['seconds'] = time.perf_counter() - start
+    if run is not None:
+        record['temperature'] = run.workspace.temperature
+        record['codelets'] = run.coderack.time
+    if recorder is not None:
+        record['bins'] = recorder.to_dict()
+    return record
+
+def _run_job(job):
+    """Run a job of the pool, a tuple of the arguments of run_seed."""
+    return run_seed(*job)
+
+def run_batch(problem, seeds, processes=None, max_codelets=None,
+              chunksize=1, record_bins=False):
+    """Yield the record of a run of the problem for each seed, in the order
+    the runs finish.
+
+    The runs are spread over processes workers, which default to one for
+    each processor. With a single process the runs are made in this
+    process, one after another, in the order of the seeds."""
+    jobs = [(tuple(problem), seed, max_codelets, record_bins)
+            for seed in seeds]
+    if processes == 1:
+        for job in jobs:
+            yield _run_job(job)
+        return
+    with multiprocessing.Pool(processes) as pool:
+        for record in pool.imap_unordered(_run_job, jobs, chunksize):
+            yield record
+
+def write_batch(records, output):
+    """Write each record to the output file as a line of JSON as soon as
+    it arrives and return the number of records written."""
+    count = 0
+    for record in records:
+        output.write(json.dumps(record, sort_keys=True) + '\n')
+        output.flush()
+        count += 1
+    return count
+
+def read_batch(lines):
+    """Yield the records in lines of JSON, skipping blank lines."""
+    for line in lines:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
@@ -0,0 +1,59 @@
+# Copyright (c) 2007-2017 Joseph Hager.
+#
+# Copycat is free software; you can redistribute it and/or modify
+# it under the terms of version 2 of the GNU General Public License,
+# as published by the Free Software Foundation.
+#
+# Copycat is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Copycat; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.
+
+"""Run a problem for a range of seeds and write each run as a line of JSON.
+
+    python -m copycat.batch abc abd xyz --first-seed 1 --runs 1000 \\
+        --processes 4 --output xyz.jsonl
+"""
+
+import argparse
+import sys
+
+from copycat.batch import run_batch, write_batch
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument("initial", metavar="INITIAL")
+    parser.add_argument("modified", metavar="MODIFIED")
+    parser.add_argument("target", metavar="TARGET")
+    parser.add_argument("--first-seed", type=int, default=1)
+    parser.add_argument("--runs", type=int, default=100)
+    parser.add_argument("--processes", type=int, default=None,
+                        help="worker processes, one per processor by default")
+    parser.add_argument("--max-codelets", type=int, default=None,
+                        help="give up on a run after this many codelets")
+    parser.add_argument("--chunksize", type=int, default=1,
+                        help="runs handed to a worker at a time")
+    parser.add_argument("--record-bins", action="store_true",
+                        help="record the coderack's bins at every timestep")
+    parser.add_argument("-o", "--output", default="-",
+                        help="file to append the runs to, - for stdout")
+    args = parser.parse_args()
+
+    problem = (args.initial, args.modified, args.target)
+    seeds = range(args.first_seed, args.first_seed + args.runs)
+    records = run_batch(problem, seeds, args.processes, args.max_codelets,
+                        args.chunksize, args.record_bins)
+    if args.output == "-":
+        write_batch(records, sys.stdout)
+    else:
+        with open(args.output, "a") as output:
+            count = write_batch(records, output)
+        print("wrote %d runs to %s" % (count, args.output), file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+# Copyright (c) 2007-2017 Joseph Hager.
+#
+# Copycat is free software; you can redistribute it and/or modify
+# it under the terms of version 2 of the GNU General Public License,
+# as published by the Free Software Foundation.
+#
+# Copycat is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Copycat; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.
+
+"""Summarize the pressure on the coderack across batch runs.
+
+Reads the JSON lines written by copycat.batch with --record-bins and, for
+each problem, shows how the coderack filled as the runs went on. The
+timesteps are grouped into windows, and for each window it gives the
+number of runs still going, how full the coderack was on average and how
+often it was full, the mean number of codelets in each urgency bin, the
+codelets removed to make room per timestep and the mean age of the
+codelets run. Then it lists the families of the codelets removed to make
+room and the mean age of the codelets run from each bin. The windows can
+be written as CSV instead::
+
+    python -m copycat.batch abc abd xyz --runs 100 --record-bins \\
+        --output xyz.jsonl
+    python -m copycat.batch.pressure xyz.jsonl --window 10
+"""
+
+import argparse
+import csv
+import sys
+
+from copycat.batch import read_batch
+from copycat.coderack.recorder import BINS
+
+class Window(object):
+    """Window totals the samples of many runs over a range of timesteps.
+
+    Attributes:
+        first: The first timestep in the window.
+        last: The last timestep in the window.
+        runs: The ids of the runs with samples in the window.
+        samples: The number of samples.
+        fill: The total of the fraction of the coderack filled at each sample.
+        full: The number of samples at which the coderack was full.
+        occupancy: The total number of codelets in each bin.
+        evicted: The number of codelets removed to make room.
+        chosen: The number of codelets run.
+        ages: The total age of the codelets run."""
+
+    def __init__(self, first, last):
+        """Initialize Window."""
+        self.first = first
+        self.last = last
+        self.runs = set()
+        self.samples = 0
+        self.fill = 0.0
+        self.full = 0
+        self.occupancy = [0] * BINS
+        self.evicted = 0
+        self.chosen = 0
+        self.ages = 0
+
+    def add(self, run, bins, i):
+        """Add sample i of a run's recording of its bins."""
+        occupancy = bins['occupancy'][i]
+        total = sum(occupancy)
+        self.runs.add(run)
+        self.samples += 1
+        self.fill += total / float(bins['max_codelets'])
+        if total >= bins['max_codelets']:
+            self.full += 1
+        for urgency_code, count in enumerate(occupancy):
+            self.occupancy[urgency_code] += count
+        self.evicted += bins['evicted'][i]
+        self.chosen += bins['chosen'][i]
+        self.ages += bins['ages'][i]
+
+    def row(self):
+        """Return the timesteps, runs, mean fill and full percentages, mean
+        occupancy of each bin, evictions per timestep and mean age of the
+        codelets run in the window."""
+        samples = float(self.samples)
+        return ([self.first, self.last, len(self.runs),
+                 100 * self.fill / samples, 100 * self.full / samples] +
+                [count / samples for count in self.occupancy] +
+                [self.evicted / samples,
+                 self.ages / float(self.chosen) if self.chosen else None])
+
+class Pressure(object):
+    """Pressure on the coderack over the recorded runs of one problem.
+
+    Attributes:
+        problem: The initial, modified and target strings.
+        window: The number of timesteps in each window.
+        windows: The Windows, by their position in the run.
+        recorded: The number of runs recorded.
+        dropped: The number of samples that did not fit in the recordings.
+        evictions: The number of codelets removed to make room, keyed by
+            family.
+        bin_chosen: The number of codelets run from each bin.
+        bin_ages: The total age of the codelets run from each bin."""
+
+    def __init__(self, problem, window):
+        """Initialize Pressure."""
+        self.problem = problem
+        self.window = window
+        self.windows = []
+        self.recorded = 0
+        self.dropped = 0
+        self.evictions = {}
+        self.bin_chosen = [0] * BINS
+        self.bin_ages = [0] * BINS
+
+    def add(self, bins):
+        """Add a run's recording of its bins."""
+        run = self.recorded
+        self.recorded += 1
+        self.dropped += bins['dropped']
+        for i in range(len(bins['times'])):
+            position = i // self.window
+            while len(self.windows) <= position:
+                first = len(self.windows) * self.window
+                self.windows.append(Window(first, first + self.window - 1))
+            self.windows[position].add(run, bins, i)
+        for family, count in bins['evictions'].items():
+            self.evictions[family] = self.evictions.get(family, 0) + count
+        for urgency_code in range(BINS):
+            self.bin_chosen[urgency_code] += bins['bin_chosen'][urgency_code]
+            self.bin_ages[urgency_code] += bins['bin_ages'][urgency_code]
+
+def summarize(records, window):
+    """Return the Pressure of each problem with recorded runs, in the order
+    first seen."""
+    pressures = {}
+    for record in records:
+        if 'bins' not in record:
+            continue
+        problem = (record['initial'], record['modified'], record['target'])
+        pressure = pressures.get(problem)
+        if pressure is None:
+            pressure = pressures[problem] = Pressure(problem, window)
+        pressure.add(record['bins'])
+    return list(pressures.values())
+
+def show(value, form):
+    """Return the value formatted, or a dash if there is none."""
+    return '-' if value is None else form % value
+
+def render_text(pressures, output):
+    """Write the windows and the totals of each problem to output."""
+    for pressure in pressures:
+        output.write('%s -> %s, %s -> ?  (%d runs recorded)\n' %
+                     (pressure.problem + (pressure.recorded,)))
+        if pressure.dropped:
+            output.write('  %d samples did not fit in the recordings\n' %
+                         pressure.dropped)
+        output.write('  %-11s %5s %6s %6s  %-41s %8s %8s\n' % (
+            'timesteps', 'runs', 'fill%', 'full%',
+            'mean codelets in bins 0-6', 'evicted', 'age'))
+        for window in pressure.windows:
+            row = window.row()
+            output.write('  %5d-%-5d %5d %6.1f %6.1f  %-41s %8.2f %8s\n' % (
+                tuple(row[:5]) + (
+                    ' '.join('%5.1f' % count for count in row[5:5 + BINS]),
+                    row[-2], show(row[-1], '%8.1f'))))
+        evictions = sum(pressure.evictions.values())
+        output.write('\n  %-34s %8s %6s\n' % ('evicted codelet', 'count',
+                                               '%'))
+        for family, count in sorted(pressure.evictions.items(),
+                                    key=lambda item: (-item[1], item[0])):
+            output.write('  %-34s %8d %6.1f\n' % (family, count,
+                                                  100.0 * count / evictions))
+        output.write('\n  %-6s %8s %8s\n' % ('bin', 'run', 'age'))
+        for urgency_code in range(BINS):
+            chosen = pressure.bin_chosen[urgency_code]
+            output.write('  %-6d %8d %8s\n' % (
+                urgency_code, chosen,
+                show(pressure.bin_ages[urgency_code] / float(chosen)
+                     if chosen else None, '%8.1f')))
+        output.write('\n')
+
+def render_csv(pressures, output):
+    """Write a row for each window of each problem to output as CSV."""
+    writer = csv.writer(output, lineterminator='\n')
+    writer.writerow(['initial', 'modified', 'target', 'first_timestep',
+                     'last_timestep', 'runs', 'fill_percent',
+                     'full_percent'] +
+                    ['bin%d' % urgency_code for urgency_code in range(BINS)] +
+                    ['evicted_per_timestep', 'mean_age'])
+    for pressure in pressures:
+        for window in pressure.windows:
+            writer.writerow(list(pressure.problem) + window.row())
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('files', nargs='+', metavar='RUNS',
+                        help='files of runs written by copycat.batch with '
+                             '--record-bins, - for stdin')
+    parser.add_argument('--window', type=int, default=10,
+                        help='timesteps in each window')
+    parser.add_argument('--csv', action='store_true',
+                        help='write the windows as CSV instead of text')
+    args = parser.parse_args()
+
+    records = []
+    for path in args.files:
+        if path == '-':
+            records.extend(read_batch(sys.stdin))
+        else:
+            with open(path) as lines:
+                records.extend(read_batch(lines))
+    pressures = summarize(records, args.window)
+    if args.csv:
+        render_csv(pressures, sys.stdout)
+    else:
+        render_text(pressures, sys.stdout)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+# Copyright (c) 2007-2017 Joseph Hager.
+#
+# Copycat is free software; you can redistribute it and/or modify
+# it under the terms of version 2 of the GNU General Public License,
+# as published by the Free Software Foundation.
+#
+# Copycat is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Copycat; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.
+
+"""Summarize batch runs as answer histograms and temperature quantiles.
+
+Reads the JSON lines written by copycat.batch, from one or more files, and
+for each problem counts the runs giving each answer, with the quantiles of
+the final temperatures and the mean codelets and time of those runs. Runs
+that gave no answer are counted as "no answer" and runs that failed by the
+name of their error. The summary is printed as text or as CSV::
+
+    python -m copycat.batch.report xyz.jsonl
+    python -m copycat.batch.report xyz.jsonl ijk.jsonl --csv > summary.csv
+"""
+
+import argparse
+import csv
+import sys
+
+from copycat.batch import read_batch
+
+QUANTILES = [.1, .25, .5, .75, .9]
+
+def quantile(values, q):
+    """Return the q quantile of the sorted values, interpolating linearly
+    between the nearest two, or None if there are no values."""
+    if not values:
+        return None
+    position = q * (len(values) - 1)
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+def mean(values):
+    """Return the mean of the values, or None if there are none."""
+    return sum(values) / float(len(values)) if values else None
+
+def outcome(record):
+    """Return the answer of a run, or what stopped it from answering."""
+    if record['error']:
+        return 'error: ' + record['error'].split(':')[0]
+    if record['answer'] is None:
+        return 'no answer'
+    return record['answer']
+
+class Summary(object):
+    """Summary of the runs of one problem that gave one outcome.
+
+    Attributes:
+        runs: The number of runs.
+        temperatures: The sorted final temperatures of the runs.
+        codelets: The mean number of codelets run.
+        seconds: The mean time of a run in seconds."""
+
+    def __init__(self, records):
+        """Initialize Summary."""
+        self.runs = len(records)
+        self.temperatures = sorted(record['temperature'] for record in records
+                                   if record['temperature'] is not None)
+        self.codelets = mean([record['codelets'] for record in records])
+        self.seconds = mean([record['seconds'] for record in records
+                             if record['seconds'] is not None])
+
+    def quantiles(self):
+        """Return the QUANTILES of the final temperatures."""
+        return [quantile(self.temperatures, q) for q in QUANTILES]
+
+def summarize(records):
+    """Return a Summary of the runs of each problem, as a list of the
+    problem, a Summary of all its runs and the outcomes with a Summary of
+    each, most frequent first. Problems are in the order first seen."""
+    problems = {}
+    for record in records:
+        problem = (record['initial'], record['modified'], record['target'])
+        problems.setdefault(problem, []).append(record)
+    summaries = []
+    for problem, runs in problems.items():
+        outcomes = {}
+        for record in runs:
+            outcomes.setdefault(outcome(record), []).append(record)
+        ordered = sorted(outcomes.items(),
+                         key=lambda item: (-len(item[1]), item[0]))
+        summaries.append((problem, Summary(runs),
+                          [(name, Summary(records))
+                           for name, records in ordered]))
+    return summaries
+
+def show(value, form):
+    """Return the value formatted, or a dash if there is none."""
+    return '-' if value is None else form % value
+
+def render_text(summaries, output, width=40):
+    """Write each problem's answer histogram and temperature quantiles to
+    output, with the longest bar width characters long."""
+    quantiles = ' '.join('%6s' % ('q%d' % round(100 * q)) for q in QUANTILES)
+    for problem, total, outcomes in summaries:
+        output.write('%s -> %s, %s -> ?  (%d runs)\n' %
+                     (problem + (total.runs,)))
+        most = max(summary.runs for _, summary in outcomes)
+        output.write('  %-16s %6s %6s  %-*s %s %9s %8s\n' % (
+            'answer', 'runs', '%', width, '', quantiles, 'codelets',
+            'seconds'))
+        for name, summary in outcomes + [('all', total)]:
+            bar = '#' * int(round(width * summary.runs / float(most)))
+            if name == 'all':
+                bar = ''
+            output.write('  %-16s %6d %6.1f  %-*s %s %9s %8s\n' % (
+                name, summary.runs, 100.0 * summary.runs / total.runs, width,
+                bar, ' '.join(show(value, '%6.1f')
+                              for value in summary.quantiles()),
+                show(summary.codelets, '%9.0f'),
+                show(summary.seconds, '%8.3f')))
+        output.write('\n')
+
+def render_csv(summaries, output):
+    """Write a row for each outcome of each problem, and for all its runs,
+    to output as CSV."""
+    writer = csv.writer(output, lineterminator='\n')
+    writer.writerow(['initial', 'modified', 'target', 'answer', 'runs',
+                     'fraction'] +
+                    ['temperature_q%d' % round(100 * q) for q in QUANTILES] +
+                    ['mean_codelets', 'mean_seconds'])
+    for problem, total, outcomes in summaries:
+        for name, summary in outcomes + [('all', total)]:
+            writer.writerow(list(problem) + [
+                name, summary.runs, summary.runs / float(total.runs)] +
+                summary.quantiles() + [summary.codelets, summary.seconds])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('files', nargs='+', metavar='RUNS',
+                        help='files of runs written by copycat.batch, '
+                             '- for stdin')
+    parser.add_argument('--csv', action='store_true',
+                        help='write CSV instead of text')
+    args = parser.parse_args()
+
+    records = []
+    for path in args.files:
+        if path == '-':
+            records.extend(read_batch(sys.stdin))
+        else:
+            with open(path) as lines:
+                records.extend(read_batch(lines))
+    summaries = summarize(records)
+    if args.csv:
+        render_csv(summaries, sys.stdout)
+    else:
+        render_text(summaries, sys.stdout)
+
+if __name__ == '__main__':
+    main()
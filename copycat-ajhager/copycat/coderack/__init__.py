@@ -78,7 +78,13 @@ class Coderack(object):
         max_codelets: The maximum size of the coderack.
         temperature: The value indicating how random a codelet choice is.
         time: The number of codelets that have been chosen so far.
-        bins: A list of urgency bins in the coderack."""
+        bins: A list of urgency bins in the coderack.
+        observers: Objects told of every codelet added to or removed from
+            the coderack.
+        recorder: The BinRecorder sampling the bins, or None when they are
+            not being recorded."""
+
+    recorder = None
 
     def __init__(self):
         """Initialize Coderack."""
@@ -98,6 +104,33 @@ class Coderack(object):
                      self.very_high_bin, self.extremely_high_bin]
 
         self.last_chosen = None
+        self.observers = []
+
+    def add_observer(self, observer):
+        """Add an observer of the codelets in the coderack.
+
+        The observer's codelets_changed method is called with the codelet's
+        family, which is its class name, the urgency code of its bin and 1
+        whenever a codelet is posted, or -1 whenever one is chosen, removed
+        to make room or cleared."""
+        self.observers.append(observer)
+
+    def remove_observer(self, observer):
+        """Remove an observer of the codelets in the coderack."""
+        if observer in self.observers:
+            self.observers.remove(observer)
+
+    def record(self, recorder):
+        """Sample the bins with the recorder at every update from now on,
+        or stop sampling if it is None."""
+        self.recorder = recorder
+
+    def notify(self, codelet, pbin, delta):
+        """Tell the observers that a codelet was added to or removed from
+        the given bin."""
+        for observer in self.observers:
+            observer.codelets_changed(codelet.__class__.__name__,
+                                      pbin.urgency_code, delta)
 
     def choose(self):
         """Choose a codelet from the coderack."""
@@ -107,11 +140,19 @@ class Coderack(object):
         pbin = toolbox.weighted_select(urgencies, self.bins)
         self.time += 1
         self.last_chosen = pbin.choose()
+        if self.observers:
+            self.notify(self.last_chosen, pbin, -1)
+        if self.recorder is not None:
+            age = self.time - self.last_chosen.timestamp
+            self.recorder.codelet_chosen(self.last_chosen, age)
         return self.last_chosen
 
     def clear(self):
         """Empty the coderack of all codelets."""
         for pbin in self.bins:
+            if self.observers:
+                for codelet in pbin.codelets:
+                    self.notify(codelet, pbin, -1)
             pbin.clear()
 
     def codelets(self):
@@ -137,6 +178,10 @@ class Coderack(object):
             probabilities = [self.remove_probability(c) for c in codelets]
             removed_codelet = toolbox.weighted_select(probabilities, codelets)
             removed_codelet.bin.remove(removed_codelet)
+            if self.observers:
+                self.notify(removed_codelet, removed_codelet.bin, -1)
+            if self.recorder is not None:
+                self.recorder.codelet_evicted(removed_codelet)
 
         if urgency >= 100:
             pbin = self.extremely_high_bin
@@ -145,6 +190,8 @@ class Coderack(object):
             pbin = self.bins[index]
         pbin.add(codelet)
         codelet.timestamp = self.time
+        if self.observers:
+            self.notify(codelet, pbin, 1)
 
         return removed_codelet
 
@@ -160,9 +207,64 @@ class Coderack(object):
         return codelet_age * (1 + codelet_bin_urgency - highest_bin_urgency)
 
     def update(self, temperature):
-        """Store the current temperature for urgency calculations."""
+        """Store the current temperature for urgency calculations, and
+        sample the bins if they are being recorded."""
         self.temperature = temperature
+        if self.recorder is not None:
+            self.recorder.sample(self)
 
     def urgency_sum(self):
         """Return the sum of urgency of all bins in the coderack."""
         return sum([bin.urgency_sum(self.temperature) for bin in self.bins])
+
+
+class FamilyTally(object):
+    """FamilyTally keeps the number of codelets of each family in a coderack
+    up to date from the coderack's changes, so that a view of the coderack
+    does not have to count its codelets again.
+
+    Attributes:
+        coderack: The coderack being observed.
+        counts: A map of codelet family to the number of codelets.
+        bin_counts: A map of codelet family to a list of the number of
+            codelets of the family in each bin."""
+
+    def __init__(self, coderack):
+        """Initialize FamilyTally with the codelets already in the coderack
+        and observe it from then on."""
+        self.coderack = coderack
+        self.counts = {}
+        self.bin_counts = {}
+        for pbin in coderack.bins:
+            for codelet in pbin.codelets:
+                self.codelets_changed(codelet.__class__.__name__,
+                                      pbin.urgency_code, 1)
+        coderack.add_observer(self)
+
+    def codelets_changed(self, family, urgency_code, delta):
+        """Add delta codelets of the family to the bin with the given
+        urgency code."""
+        self.counts[family] = self.counts.get(family, 0) + delta
+        bin_counts = self.bin_counts.get(family)
+        if bin_counts is None:
+            bin_counts = self.bin_counts[family] = [0] * len(self.coderack.bins)
+        bin_counts[urgency_code] += delta
+
+    def count(self, family):
+        """Return the number of codelets of the family in the coderack."""
+        return self.counts.get(family, 0)
+
+    def urgency_sum(self, family):
+        """Return the sum of the urgencies of the codelets of the family at
+        the coderack's current temperature."""
+        bin_counts = self.bin_counts.get(family)
+        if not bin_counts:
+            return 0
+        temperature = self.coderack.temperature
+        return sum(count * pbin.urgency(temperature)
+                   for count, pbin in zip(bin_counts, self.coderack.bins)
+                   if count)
+
+    def close(self):
+        """Stop observing the coderack."""
+        self.coderack.remove_observer(self)
@@ -42,7 +42,7 @@ class AnswerBuilder(Codelet):
         if workspace.snag_object:
             workspace.snag_count += 1
             workspace.last_snag_time = coderack.time
-            workspace.snag_structures = workspace.structures()
+            workspace.record_snag_structures()
 
             for bond in workspace.proposed_bonds():
                 bond.string.remove_proposed_bond(bond)
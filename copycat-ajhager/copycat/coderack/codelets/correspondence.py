@@ -43,9 +43,9 @@ class CorrespondenceBottomUpScout(Codelet):
                                                   object2.relevant_descriptions())
 
         possible = False
-        for mapping in mappings:
-            probability = mapping.slippability() / 100.0
-            probability = workspace.temperature_adjusted_probability(probability)
+        probabilities = workspace.temperature_adjusted_probabilities(
+            [mapping.slippability() / 100.0 for mapping in mappings])
+        for probability in probabilities:
             if toolbox.flip_coin(probability):
                 possible = True
 
@@ -44,7 +44,7 @@ class DescriptionBottomUpScout(Codelet):
 
         associations = [link.degree_of_association() for link in links]
         activations = [link.to_node.activation for link in links]
-        choices = map(lambda a, b: a * b, associations, activations)
+        choices = [a * b for a, b in zip(associations, activations)]
         prop = toolbox.weighted_select(choices, links).to_node
 
         return workspace.propose_description(obj, prop.category(), prop)
@@ -0,0 +1,125 @@
+# Copyright (c) 2007-2017 Joseph Hager.
+#
+# Copycat is free software; you can redistribute it and/or modify
+# it under the terms of version 2 of the GNU General Public License,
+# as published by the Free Software Foundation.
+#
+# Copycat is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Copycat; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.
+
+"""BinRecorder"""
+
+from array import array
+
+BINS = 7
+
+class BinRecorder(object):
+    """BinRecorder keeps a time series of how full each urgency bin of a
+    coderack is.
+
+    The coderack tells the recorder of every codelet it chooses or removes
+    to make room, and asks it for a sample at every timestep, when its
+    temperature is updated. Each sample stores the coderack time and
+    temperature, the number of codelets in each bin, and the number of
+    codelets chosen and removed and the total age of those chosen since the
+    last sample. The samples go into arrays of a fixed size, allocated up
+    front, so recording costs no allocation while a run goes on. Once they
+    are full, later samples are counted but not kept.
+
+    Attributes:
+        capacity: The most samples kept.
+        max_codelets: The maximum size of the coderack when last sampled.
+        size: The number of samples kept.
+        dropped: The number of samples not kept because the arrays were full.
+        times: The coderack time of each sample.
+        temperatures: The temperature of each sample.
+        occupancy: The number of codelets in each bin at each sample, bin
+            by bin, so sample i is occupancy[i * BINS:(i + 1) * BINS].
+        chosen: The number of codelets chosen since the previous sample.
+        evicted: The number of codelets removed to make room since the
+            previous sample.
+        ages: The total age of the codelets chosen since the previous sample.
+        evictions: The number of codelets removed to make room, keyed by
+            codelet family.
+        bin_chosen: The number of codelets chosen from each bin.
+        bin_ages: The total age of the codelets chosen from each bin.
+        pending_chosen, pending_evicted, pending_ages: The codelets chosen
+            and removed and the age of those chosen since the last sample."""
+
+    def __init__(self, capacity=1000):
+        """Initialize BinRecorder."""
+        self.capacity = capacity
+        self.max_codelets = None
+        self.size = 0
+        self.dropped = 0
+        self.times = array('l', [0]) * capacity
+        self.temperatures = array('l', [0]) * capacity
+        self.occupancy = array('l', [0]) * (capacity * BINS)
+        self.chosen = array('l', [0]) * capacity
+        self.evicted = array('l', [0]) * capacity
+        self.ages = array('l', [0]) * capacity
+        self.evictions = {}
+        self.bin_chosen = [0] * BINS
+        self.bin_ages = [0] * BINS
+        self.pending_chosen = 0
+        self.pending_evicted = 0
+        self.pending_ages = 0
+
+    def codelet_chosen(self, codelet, age):
+        """Record that the codelet was chosen to run at the given age."""
+        self.pending_chosen += 1
+        self.pending_ages += age
+        urgency_code = codelet.bin.urgency_code
+        self.bin_chosen[urgency_code] += 1
+        self.bin_ages[urgency_code] += age
+
+    def codelet_evicted(self, codelet):
+        """Record that the codelet was removed to make room."""
+        self.pending_evicted += 1
+        family = codelet.__class__.__name__
+        self.evictions[family] = self.evictions.get(family, 0) + 1
+
+    def sample(self, coderack):
+        """Record the state of the coderack's bins."""
+        self.max_codelets = coderack.max_codelets
+        if self.size == self.capacity:
+            self.dropped += 1
+            return
+        i = self.size
+        self.times[i] = coderack.time
+        self.temperatures[i] = int(coderack.temperature)
+        start = i * BINS
+        for offset, pbin in enumerate(coderack.bins):
+            self.occupancy[start + offset] = len(pbin.codelets)
+        self.chosen[i] = self.pending_chosen
+        self.evicted[i] = self.pending_evicted
+        self.ages[i] = self.pending_ages
+        self.pending_chosen = self.pending_evicted = self.pending_ages = 0
+        self.size += 1
+
+    def bin_occupancy(self, i):
+        """Return the number of codelets in each bin at sample i."""
+        return list(self.occupancy[i * BINS:(i + 1) * BINS])
+
+    def to_dict(self):
+        """Return the samples kept and the totals as a dict of lists and
+        numbers, ready to be written as JSON."""
+        size = self.size
+        return {'capacity': self.capacity, 'dropped': self.dropped,
+                'max_codelets': self.max_codelets,
+                'times': self.times[:size].tolist(),
+                'temperatures': self.temperatures[:size].tolist(),
+                'occupancy': [self.bin_occupancy(i) for i in range(size)],
+                'chosen': self.chosen[:size].tolist(),
+                'evicted': self.evicted[:size].tolist(),
+                'ages': self.ages[:size].tolist(),
+                'evictions': dict(self.evictions),
+                'bin_chosen': list(self.bin_chosen),
+                'bin_ages': list(self.bin_ages)}
@@ -18,6 +18,7 @@
 
 import argparse
 import sys
+from copycat.profiler import Profiler
 from copycat.run import Run
 sys.path.insert(0, "lib")
 
@@ -31,19 +32,41 @@ def main():
     parser.add_argument("-q", "--quiet",
                         action="store_true", dest="quiet", default=False,
                         help="run in headless mode")
+    parser.add_argument("-p", "--profile",
+                        action="store_true", dest="profile", default=False,
+                        help="show the cost of each codelet family "
+                             "(headless mode only)")
+    parser.add_argument("--trace", dest="trace", default=None,
+                        metavar="PATH",
+                        help="write a Chrome trace of the codelets run "
+                             "(headless mode only)")
+    parser.add_argument("--speed", dest="speed", default=15, type=int,
+                        help="steps per second in the display, 0 for as "
+                             "many as fit")
+    parser.add_argument("--budget", dest="budget", default=.01, type=float,
+                        help="most seconds spent stepping each frame in "
+                             "the display")
     args = parser.parse_args()
 
     if args.quiet:
         run = Run(args.initial, args.modified, args.target, args.seed)
+        if args.profile or args.trace:
+            run.profile(Profiler(trace=bool(args.trace)))
         while not run.workspace.answer_string:
             run.step()
         print(run.workspace.rule.to_string())
         print("Answer: " + run.workspace.answer_string.name)
         print("Temperature: " + str(run.workspace.temperature))
         print("Steps: " + str(run.coderack.time))
+        if args.profile:
+            print("")
+            print(run.profiler.table())
+        if args.trace:
+            run.profiler.write_trace(args.trace)
     else:
         from clients import OpenglClient
-        OpenglClient(args.initial, args.modified, args.target, args.seed)
+        OpenglClient(args.initial, args.modified, args.target, args.seed,
+                     args.speed or None, args.budget)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,126 @@
+# Copyright (c) 2007-2017 Joseph Hager.
+#
+# Copycat is free software; you can redistribute it and/or modify
+# it under the terms of version 2 of the GNU General Public License,
+# as published by the Free Software Foundation.
+#
+# Copycat is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Copycat; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.
+
+"""Profiler records the cost of each family of codelets in a run."""
+
+import json
+import time
+
+class FamilyProfile(object):
+    """FamilyProfile holds what the codelets of one family cost.
+
+    Attributes:
+        count: The number of codelets run.
+        total: The wall time in seconds spent running them.
+        longest: The wall time in seconds of the slowest one.
+        built: The number of structures they built.
+        broken: The number of structures they broke."""
+
+    def __init__(self):
+        """Initialize FamilyProfile."""
+        self.count = 0
+        self.total = 0.0
+        self.longest = 0.0
+        self.built = 0
+        self.broken = 0
+
+    def mean(self):
+        """Return the mean wall time in seconds of a codelet."""
+        return self.total / self.count if self.count else 0.0
+
+class Profiler(object):
+    """Profiler times each codelet a run runs, by codelet class.
+
+    A run has no profiler unless one is given to Run.profile, so runs that
+    are not profiled pay only for checking that there is none. Besides the
+    totals for each family, the profiler can keep an event for every codelet
+    to export as a Chrome trace, to be viewed in chrome://tracing or
+    Perfetto.
+
+    Attributes:
+        families: The FamilyProfile of each codelet class, keyed by name.
+        events: The name, start, duration, structures built and broken and
+            coderack time of every codelet run, when tracing.
+        trace: Whether to keep the events.
+        clock: A function returning the current time in seconds.
+        origin: The time on the clock when profiling started."""
+
+    def __init__(self, trace=False, clock=time.perf_counter):
+        """Initialize Profiler."""
+        self.families = {}
+        self.events = []
+        self.trace = trace
+        self.clock = clock
+        self.origin = clock()
+
+    def run(self, codelet, coderack, slipnet, workspace):
+        """Run the codelet, record its cost and return what it returns."""
+        built = workspace.structures_built
+        broken = workspace.structures_broken
+        start = self.clock()
+        codelets = codelet.run(coderack, slipnet, workspace)
+        elapsed = self.clock() - start
+        name = codelet.__class__.__name__
+        family = self.families.get(name)
+        if family is None:
+            family = self.families[name] = FamilyProfile()
+        family.count += 1
+        family.total += elapsed
+        if elapsed > family.longest:
+            family.longest = elapsed
+        built = workspace.structures_built - built
+        broken = workspace.structures_broken - broken
+        family.built += built
+        family.broken += broken
+        if self.trace:
+            self.events.append((name, start, elapsed, built, broken,
+                                coderack.time))
+        return codelets
+
+    def total(self):
+        """Return the wall time in seconds spent running codelets."""
+        return sum(family.total for family in self.families.values())
+
+    def table(self):
+        """Return the profile of each family as a table, costliest first."""
+        total = self.total()
+        lines = ['%-34s %7s %10s %6s %9s %9s %6s %6s' % (
+            'codelet', 'count', 'total ms', '%', 'mean us', 'max us',
+            'built', 'broken')]
+        for name, family in sorted(self.families.items(),
+                                   key=lambda item: -item[1].total):
+            lines.append('%-34s %7d %10.1f %6.1f %9.1f %9.1f %6d %6d' % (
+                name, family.count, 1e3 * family.total,
+                100 * family.total / total if total else 0,
+                1e6 * family.mean(), 1e6 * family.longest,
+                family.built, family.broken))
+        return '\n'.join(lines)
+
+    def trace_events(self):
+        """Return the events as Chrome trace events, one complete event a
+        codelet, with times in microseconds since profiling started."""
+        return [{'name': name, 'cat': 'codelet', 'ph': 'X', 'pid': 0,
+                 'tid': 0, 'ts': 1e6 * (start - self.origin),
+                 'dur': 1e6 * elapsed,
+                 'args': {'built': built, 'broken': broken, 'time': step}}
+                for name, start, elapsed, built, broken, step in self.events]
+
+    def write_trace(self, path):
+        """Write the events to the file at path in the Chrome trace event
+        format."""
+        with open(path, 'w') as output:
+            json.dump({'traceEvents': self.trace_events(),
+                       'displayTimeUnit': 'ms'}, output)
@@ -16,7 +16,11 @@
 
 """Run enscapulates all the moving parts for a single copycat run."""
 
+import io
+import pickle
 import random
+import types
+import zlib
 
 from copycat.coderack import Coderack
 from copycat.slipnet import Slipnet
@@ -24,14 +28,66 @@ from copycat.workspace import Workspace
 import copycat.coderack.codelets
 from copycat.coderack.codelets import AnswerBuilder
 
+def slipnet_items(slipnet):
+    """Return the slipnet, its nodes and its links, always in the same
+    order for slipnets built the same way."""
+    return [slipnet] + slipnet.slipnodes + slipnet.sliplinks
+
+class SnapshotPickler(pickle.Pickler):
+    """SnapshotPickler
+
+    Pickles a run, referring to the slipnet, its nodes and its links by
+    their position rather than storing them. The slipnet's structure,
+    including the description testers of its nodes, is the same in every
+    run, so a snapshot holds only the values on it and is restored onto a
+    freshly built slipnet.
+
+    Attributes:
+        positions: The position of each slipnet item, keyed by its id."""
+
+    def __init__(self, file, slipnet):
+        """Initialize SnapshotPickler."""
+        super(SnapshotPickler, self).__init__(file, pickle.HIGHEST_PROTOCOL)
+        self.positions = {}
+        for position, item in enumerate(slipnet_items(slipnet)):
+            self.positions[id(item)] = position
+
+    def persistent_id(self, obj):
+        return self.positions.get(id(obj))
+
+class SnapshotUnpickler(pickle.Unpickler):
+    """SnapshotUnpickler
+
+    Unpickles a snapshot made by SnapshotPickler onto the given slipnet.
+
+    Attributes:
+        items: The slipnet items, in the order of slipnet_items."""
+
+    def __init__(self, file, slipnet):
+        """Initialize SnapshotUnpickler."""
+        super(SnapshotUnpickler, self).__init__(file)
+        self.items = slipnet_items(slipnet)
+
+    def persistent_load(self, position):
+        return self.items[position]
+
 class Run(object):
     """Run
 
+    A run can be checkpointed at any step and restored later, in the same
+    process or another one. Restoring a checkpoint and carrying on gives
+    exactly the steps the original run took from that point, because the
+    snapshot includes the state of the random number generator.
+
     Attributes:
         coderack:
         slipnet:
         workspace:
-        timestep: The number of codelets to run before an update."""
+        timestep: The number of codelets to run before an update.
+        profiler: The Profiler recording the cost of each codelet, or None
+            when the run is not being profiled."""
+
+    profiler = None
 
     def __init__(self, initial, modified, target, seed):
         """Initialize Run."""
@@ -61,9 +117,71 @@ class Run(object):
             self.run_codelet(AnswerBuilder())
             self.update()
 
+    def checkpoint(self):
+        """Return a compressed snapshot of the complete state of the run:
+        the coderack and its bins, the workspace and its structures, the
+        activations on the slipnet, the temperature, the codelet counter and
+        the state of the random number generator."""
+        slipnet_state = []
+        for item in slipnet_items(self.slipnet):
+            slipnet_state.append(dict((name, value) for name, value
+                                      in vars(item).items()
+                                      if not isinstance(value,
+                                                        types.FunctionType)))
+        data = io.BytesIO()
+        SnapshotPickler(data, self.slipnet).dump(
+            {'run': self, 'slipnet': slipnet_state,
+             'random': random.getstate()})
+        return zlib.compress(data.getvalue())
+
+    @classmethod
+    def restore(cls, snapshot, seed=None):
+        """Return the run saved in the snapshot, ready to carry on.
+
+        The random number generator is put back as it was when the snapshot
+        was taken, or seeded with seed to explore another continuation."""
+        slipnet = Slipnet()
+        data = io.BytesIO(zlib.decompress(snapshot))
+        state = SnapshotUnpickler(data, slipnet).load()
+        for item, values in zip(slipnet_items(slipnet), state['slipnet']):
+            vars(item).update(values)
+        if seed is None:
+            random.setstate(state['random'])
+        else:
+            random.seed(seed)
+        return state['run']
+
+    def fork(self, seeds):
+        """Yield a continuation of the run from its current state for each
+        seed. Every continuation shares the random module, so finish with
+        one before asking for the next."""
+        snapshot = self.checkpoint()
+        for seed in seeds:
+            yield Run.restore(snapshot, seed)
+
+    def save(self, path):
+        """Write a checkpoint of the run to the file at path."""
+        with open(path, 'wb') as output:
+            output.write(self.checkpoint())
+
+    @classmethod
+    def load(cls, path, seed=None):
+        """Return the run checkpointed in the file at path."""
+        with open(path, 'rb') as snapshot:
+            return cls.restore(snapshot.read(), seed)
+
+    def profile(self, profiler):
+        """Record the cost of every codelet run from now on with the
+        profiler, or stop recording if it is None."""
+        self.profiler = profiler
+
     def run_codelet(self, codelet):
         """Run a single codelet, posting any new codelets they create."""
-        codelets = codelet.run(self.coderack, self.slipnet, self.workspace)
+        if self.profiler is None:
+            codelets = codelet.run(self.coderack, self.slipnet, self.workspace)
+        else:
+            codelets = self.profiler.run(codelet, self.coderack, self.slipnet,
+                                         self.workspace)
         if not codelets:
             return
         for codelet, urgency in codelets:
@@ -102,10 +220,10 @@ class Run(object):
         object causing the snag."""
         self.workspace.snag_count += 1
         self.workspace.last_snag_time = self.coderack.time
-        self.workspace.snag_structures = self.workspace.structures()
-        for bond in self.workspace.get_proposed_bonds():
+        self.workspace.record_snag_structures()
+        for bond in self.workspace.proposed_bonds():
             bond.string.remove_proposed_bond(bond)
-        for group in self.workspace.get_proposed_groups():
+        for group in self.workspace.proposed_groups():
             group.string.remove_proposed_group(group)
         for correspondence in self.workspace.get_proposed_correspondences():
             self.workspace.remove_proposed_correspondence(correspondence)
@@ -16,8 +16,13 @@
 
 """Slipnet"""
 
+import bisect
 import string
 import copycat.toolbox as toolbox
+try:
+    import numpy
+except ImportError:
+    numpy = None
 from copycat.slipnet.slipnode import Slipnode
 from copycat.slipnet.sliplink import Sliplink
 
@@ -30,13 +35,31 @@ class Slipnet(object):
     Attributes:
         slipnodes: The nodes in the slipnet.
         sliplinks: The links between the nodes.
-        clamp_time: The amount of steps to clamp activation in the slipnet."""
+        clamp_time: The amount of steps to clamp activation in the slipnet.
+        vectorized: A boolean whether to update activations with NumPy.
+        decay_factors: The fraction of its activation each node loses in an
+            update, by node.
+        spreads: The (node, amount) pairs each node spreads activation to
+            when it is fully active, by node.
+        link_from: The index of the node each link starts at, as an array.
+        link_to: The index of the node each link ends at, as an array.
+        link_amounts: The activation each link spreads, as an array.
+        decay_array: The decay factors as an array.
+        hot: Whether each node had an activation of at least 50 after the
+            last update, by node.
+        hot_indexes: The sorted indexes of the hot nodes.
+        warmed: The number of times a node has become hot.
+        cooled: The number of times a node has stopped being hot."""
 
     def __init__(self):
         """Initializes Slipnet."""
         self.slipnodes = []
         self.sliplinks = []
         self.clamp_time = 50
+        self.vectorized = False
+        self.hot_indexes = []
+        self.warmed = 0
+        self.cooled = 0
 
         # Letter nodes
         self.slipnet_letters = []
@@ -408,6 +431,37 @@ class Slipnet(object):
         self.add_link('slip', self.plato_single, self.plato_whole, None, 90)
         self.add_link('slip', self.plato_whole, self.plato_single, None, 90)
 
+        self.compile()
+
+    def compile(self):
+        """Flatten the links into the amounts each node spreads when it is
+        fully active.
+
+        Only a node with an activation of 100 spreads activation, and it
+        spreads the intrinsic degree of association of each of its outgoing
+        links, which does not change during a run."""
+        index = dict((id(node), i) for i, node in enumerate(self.slipnodes))
+        self.decay_factors = []
+        self.spreads = []
+        self.hot = [False] * len(self.slipnodes)
+        link_from, link_to, link_amounts = [], [], []
+        for i, node in enumerate(self.slipnodes):
+            self.decay_factors.append((100 - node.conceptual_depth) / 100.0)
+            spreads = []
+            for link in node.outgoing_links():
+                amount = round(100 * (link.intrinsic_degree_of_association() /
+                                      100.0))
+                spreads.append((link.to_node, amount))
+                link_from.append(i)
+                link_to.append(index[id(link.to_node)])
+                link_amounts.append(amount)
+            self.spreads.append(spreads)
+        if numpy is not None:
+            self.decay_array = numpy.array(self.decay_factors)
+            self.link_from = numpy.array(link_from, dtype=numpy.int64)
+            self.link_to = numpy.array(link_to, dtype=numpy.int64)
+            self.link_amounts = numpy.array(link_amounts, dtype=numpy.int64)
+
     def add_node(self, name, depth, codelets=[], intrinsic_link_length=None,
                  initially_clamped=False, directed=False):
         slipnode = Slipnode(name, depth, codelets, intrinsic_link_length,
@@ -486,15 +540,20 @@ class Slipnet(object):
 
     def update(self):
         """Update activations and link lenths."""
-        for node in self.slipnodes:
-            node.decay()
-            if node.is_active():
-                for link in node.outgoing_links():
-                    amount_to_spread = round(node.activation * \
-                            (link.intrinsic_degree_of_association() / 100.0))
-                    link.to_node.activation_buffer += amount_to_spread
-
-        for node in self.slipnodes:
+        if self.vectorized and numpy is not None:
+            self.update_vectorized()
+            return
+        for node, decay_factor, spreads in zip(self.slipnodes,
+                                               self.decay_factors,
+                                               self.spreads):
+            activation = node.activation
+            node.activation_buffer -= round(decay_factor * activation)
+            if activation == 100:
+                for to_node, amount in spreads:
+                    to_node.activation_buffer += amount
+
+        hot = self.hot
+        for index, node in enumerate(self.slipnodes):
             node.activation = min(100, node.activation + node.activation_buffer)
             if node.clamp:
                 node.activation = 100
@@ -504,12 +563,58 @@ class Slipnet(object):
                     if toolbox.flip_coin(full_activation_probability):
                         node.activation = 100
             node.activation_buffer = 0
+            if (node.activation >= 50) != hot[index]:
+                self.cross_threshold(index)
+
+    def update_vectorized(self):
+        """Update activations with NumPy, decaying and spreading for all the
+        nodes at once.
+
+        The coins for jumping to full activation are still flipped one node
+        at a time in node order, so a seeded run takes the same course as
+        with update."""
+        nodes = self.slipnodes
+        activation = numpy.array([node.activation for node in nodes],
+                                 dtype=numpy.int64)
+        buffer = numpy.array([node.activation_buffer for node in nodes],
+                             dtype=numpy.int64)
+        buffer -= numpy.rint(self.decay_array * activation).astype(numpy.int64)
+        spreading = (activation == 100)[self.link_from]
+        numpy.add.at(buffer, self.link_to[spreading],
+                     self.link_amounts[spreading])
+        activation = numpy.minimum(100, activation + buffer)
+        clamped = numpy.array([node.clamp for node in nodes], dtype=bool)
+        activation[clamped] = 100
+        activations = activation.tolist()
+        for i in numpy.flatnonzero(~clamped & (activation >= 50)).tolist():
+            full_activation_probability = (activations[i] / 100.0) ** 3
+            if toolbox.flip_coin(full_activation_probability):
+                activations[i] = 100
+        hot = self.hot
+        for index, (node, value) in enumerate(zip(nodes, activations)):
+            node.activation = value
+            node.activation_buffer = 0
+            if (value >= 50) != hot[index]:
+                self.cross_threshold(index)
+
+    def cross_threshold(self, index):
+        """Move the node at index into or out of the hot nodes."""
+        if self.hot[index]:
+            self.hot[index] = False
+            self.hot_indexes.remove(index)
+            self.cooled += 1
+        else:
+            self.hot[index] = True
+            bisect.insort(self.hot_indexes, index)
+            self.warmed += 1
 
     def clear(self):
         """Zero out the activations of all slipnodes."""
         for node in self.slipnodes:
             node.activation_buffer = 0
             node.activation = 0
+        for index in list(self.hot_indexes):
+            self.cross_threshold(index)
 
     def clamp_initial_nodes(self):
         """Clamp those slipnodes that were marked to be initially clamped."""
@@ -524,10 +629,13 @@ class Slipnet(object):
                 node.clamp = False
 
     def top_down_codelets(self):
-        """Return a list of codelets attached to active nodes."""
+        """Return a list of codelets attached to active nodes.
+
+        A node is active if its activation was at least 50 after the last
+        update, so only the hot nodes are looked at."""
         codelets = []
-        for node in self.slipnodes:
-            if node.activation >= 50:
-                for codelet in node.codelets:
-                    codelets.append((codelet, [node], node.conceptual_depth / 100.))
+        for index in self.hot_indexes:
+            node = self.slipnodes[index]
+            for codelet in node.codelets:
+                codelets.append((codelet, [node], node.conceptual_depth / 100.))
         return codelets
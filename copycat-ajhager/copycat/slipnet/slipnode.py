@@ -89,35 +89,19 @@ class Slipnode(object):
     def local_descriptor_support(self, string, object_category):
         """Return the percentage of objects of the category in the string that
         have this descriptor."""
-        if object_category.name == 'letter':
-            objects = string.letters
-        else:
-            objects = string.get_groups()
-
-        objects = list(filter(lambda x: x != None, objects))
-
+        type_name = 'letter' if object_category.name == 'letter' else 'group'
+        objects = string.get_object_count(type_name)
         if not objects:
             return 0
-
-        descriptor_count = 0
-        for obj in objects:
-            if obj.is_descriptor_present(self):
-                descriptor_count += 1
-
-        return round(100 * (descriptor_count / float(len(objects))))
+        descriptor_count = string.get_descriptor_count(self, type_name)
+        return round(100 * (descriptor_count / float(objects)))
 
     def local_description_type_support(self, string):
         """Return the percentge of objects in the string that have descriptions
         with this descriptor type."""
-        objects = string.get_objects()
-        description_type_count = 0
-        for obj in objects:
-            if obj is None:
-                continue
-            if obj.is_description_type_present(self):
-                description_type_count += 1
-
-        return round(100 * (description_type_count / float(len(objects))))
+        objects = string.get_object_count()
+        description_type_count = string.get_description_type_count(self)
+        return round(100 * (description_type_count / float(objects)))
 
     def total_description_type_support(self, string):
         """Return the total description type support with string.
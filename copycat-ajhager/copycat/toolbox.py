@@ -14,8 +14,16 @@
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
 # 02110-1301, USA.
 
-"""Toolbox of utility functions."""
+"""Toolbox of utility functions.
 
+The functions that draw random numbers take an optional rng, which can be
+the random module or a random.Random instance, and default to the random
+module. Given the same generator state they draw the same numbers and
+return the same choices as they always have, so seeded runs do not change.
+"""
+
+import bisect
+import itertools
 import math
 import random
 
@@ -25,31 +33,66 @@ def weighted_average(weights, values):
     value_sum = sum(map(lambda a, b: a * b, weights, values))
     return int(value_sum / float(weight_sum))
 
-def weighted_index(weights):
+def cumulative_index(cumulative, rng=random):
+    """Return an index chosen with probability proportional to its weight,
+    given the running sums of non-negative integer weights, by bisection.
+
+    Draws exactly as weighted_index does for the same weights, and chooses
+    an index uniformly if the weights sum to zero or less."""
+    total = cumulative[-1] if cumulative else 0
+    if total <= 0:
+        return rng.randint(0, len(cumulative) - 1)
+    return bisect.bisect_right(cumulative, rng.randint(0, total - 1))
+
+def weighted_index(weights, rng=random):
     """Probabilistically chooses one of the weights by value, returning its
-    index."""
+    index.
+
+    The weights are walked rather than summed and bisected: for a single
+    draw the walk, which stops at the chosen weight, is quicker. Use a
+    Sampler to draw many times from the same weights."""
     total = sum(weights)
     if total <= 0:
-        return random.randint(0, len(weights) - 1)
-    value = random.randint(0, total - 1)
+        return rng.randint(0, len(weights) - 1)
+    value = rng.randint(0, total - 1)
     new_total = 0
-    index = 0
-    for weight in weights:
+    for index, weight in enumerate(weights):
         new_total += weight
-        index += 1
         if new_total > value:
-            return index - 1
+            return index
 
-def weighted_select(weights, items):
+def weighted_select(weights, items, rng=random):
     """Return one of the items probabilistically by weight."""
     if items:
-        return items[weighted_index(weights)]
+        return items[weighted_index(weights, rng)]
+
+class Sampler(object):
+    """Sampler chooses by weight from weights that are summed only once, for
+    weights that are drawn from many times.
+
+    Attributes:
+        cumulative: The running sums of the non-negative integer weights.
+        items: The items to choose from, if any."""
+
+    def __init__(self, weights, items=None):
+        """Initialize Sampler."""
+        self.cumulative = list(itertools.accumulate(weights))
+        self.items = items
 
-def select_assoc(assoc_list):
+    def index(self, rng=random):
+        """Return an index, drawn as weighted_index would draw it."""
+        return cumulative_index(self.cumulative, rng)
+
+    def select(self, rng=random):
+        """Return one of the items, drawn as weighted_select would draw it."""
+        if self.items:
+            return self.items[cumulative_index(self.cumulative, rng)]
+
+def select_assoc(assoc_list, rng=random):
     """Returns one of the items, chosen probabilistically.
 
     assoc_list is of the form: [(item, probability), (item, probability) ...]"""
-    if assoc_list == []:
+    if not assoc_list:
         return
 
     probability_sum = 0
@@ -58,7 +101,7 @@ def select_assoc(assoc_list):
     if probability_sum <= 0:
         return
 
-    value = random.uniform(0, probability_sum)
+    value = rng.uniform(0, probability_sum)
     new_probability_sum = 0
     for item, probability in assoc_list:
         new_probability_sum += probability
@@ -67,23 +110,46 @@ def select_assoc(assoc_list):
 
 def flatten(sequence):
     """Flattens a sequence so that it has no nested structure."""
-    if isinstance(sequence, list):
-        return sum(map(flatten, sequence), [])
-    else:
-        return [sequence]
+    flat = []
+    stack = [iter([sequence])]
+    while stack:
+        for item in stack[-1]:
+            if isinstance(item, list):
+                stack.append(iter(item))
+                break
+            flat.append(item)
+        else:
+            stack.pop()
+    return flat
 
-def flip_coin(prob_of_true=.5):
+def unique(sequence):
+    """Return the distinct items of a sequence in the order they first
+    appear. Unlike a set, the order does not depend on where the items
+    happen to live in memory."""
+    return list(dict.fromkeys(sequence))
+
+def flip_coin(prob_of_true=.5, rng=random):
     """Returns either True or False based on the probabity of true sent as an
-    argument."""
+    argument.
+
+    Both outcomes are weighted in thousandths, as select_assoc would weigh
+    them, without building the list."""
     if prob_of_true >= 1:
         return True
-    return select_assoc([[True, int(prob_of_true * 1000)],
-                         [False, int((1 - prob_of_true) * 1000)]])
+    true_weight = int(prob_of_true * 1000)
+    total = true_weight + int((1 - prob_of_true) * 1000)
+    if total <= 0:
+        return
+    value = rng.uniform(0, total)
+    if true_weight > value:
+        return True
+    elif total > value:
+        return False
 
 def average(*args):
     """Returns the arithmetic mean of its arguments."""
     return sum(args) / float(len(args))
 
-def blur(number):
+def blur(number, rng=random):
     """A normal distribution around number within square_root(number)."""
-    return random.normalvariate(number, math.sqrt(number))
+    return rng.normalvariate(number, math.sqrt(number))
@@ -32,32 +32,23 @@ from copycat.workspace.replacement import Replacement
 from copycat.workspace.rule import Rule
 from copycat.workspace.string import String
 from copycat.workspace.distribution import Distribution
+from copycat.workspace.distribution import FixedDistribution
 from copycat.coderack.codelets import *
 
-VERY_LOW_DISTRIBUTION = Distribution("very_low")
-for i, v in {10:5, 20:150, 30:5, 40:2, 50:1,
-             60:1, 70:1, 80:1, 90:1, 100:1}.items():
-    VERY_LOW_DISTRIBUTION.set(i, v)
+VERY_LOW_DISTRIBUTION = FixedDistribution("very_low", {
+    10:5, 20:150, 30:5, 40:2, 50:1, 60:1, 70:1, 80:1, 90:1, 100:1})
 
-LOW_DISTRIBUTION = Distribution("low")
-for i, v in {10:2, 20:5, 30:150, 40:5, 50:2,
-             60:1, 70:1, 80:1, 90:1, 100:1}.items():
-    LOW_DISTRIBUTION.set(i, v)
+LOW_DISTRIBUTION = FixedDistribution("low", {
+    10:2, 20:5, 30:150, 40:5, 50:2, 60:1, 70:1, 80:1, 90:1, 100:1})
 
-MEDIUM_DISTRIBUTION = Distribution("medium")
-for i, v in {10:1, 20:2, 30:5, 40:150, 50:5,
-             60:2, 70:1, 80:1, 90:1, 100:1}.items():
-    MEDIUM_DISTRIBUTION.set(i, v)
+MEDIUM_DISTRIBUTION = FixedDistribution("medium", {
+    10:1, 20:2, 30:5, 40:150, 50:5, 60:2, 70:1, 80:1, 90:1, 100:1})
 
-HIGH_DISTRIBUTION = Distribution("high")
-for i, v in {10:1, 20:1, 30:2, 40:5, 50:150,
-             60:5, 70:2, 80:1, 90:1, 100:1}.items():
-    HIGH_DISTRIBUTION.set(i, v)
+HIGH_DISTRIBUTION = FixedDistribution("high", {
+    10:1, 20:1, 30:2, 40:5, 50:150, 60:5, 70:2, 80:1, 90:1, 100:1})
 
-VERY_HIGH_DISTRIBUTION = Distribution("very_high")
-for i, v in {10:5, 20:150, 30:5, 40:2, 50:1,
-             60:1, 70:1, 80:1, 90:1, 100:1}.items():
-    VERY_HIGH_DISTRIBUTION.set(i, v)
+VERY_HIGH_DISTRIBUTION = FixedDistribution("very_high", {
+    10:5, 20:150, 30:5, 40:2, 50:1, 60:1, 70:1, 80:1, 90:1, 100:1})
 
 class Workspace(object):
     """Workspace
@@ -72,7 +63,18 @@ class Workspace(object):
         initial_string:
         modified_string:
         target_string:
-        answer_string:"""
+        answer_string:
+        incremental_update: When True, update skips recomputing the
+            correspondence strengths while nothing they read has changed.
+        settled_correspondence_inputs: What the correspondence strengths
+            read when they were last recomputed without changing, or None.
+        snag_structures_by_type: The snag structures, keyed by their type.
+        built_since_snag: The groups, correspondences and rules built while
+            the snag condition holds, in the order they were built.
+        structures_built: The number of structures of any kind built.
+        structures_broken: The number of structures of any kind broken."""
+
+    incremental_update = True
 
     def __init__(self, initial, modified, target, slipnet):
         """Initializes Workspace."""
@@ -88,9 +90,17 @@ class Workspace(object):
         self.clamp_temperature = False
         self.built = 3
 
+        self.factors_temperature = None
+        self.probability_adjustment = None
+        self.value_exponent = None
+
         self.replacements = []
         self._correspondences = {}
         self.proposed_correspondences = {}
+        self.correspondences_by_object1 = {}
+        self.correspondences_by_object2 = {}
+        self.correspondences_by_descriptor1 = {}
+        self.correspondences_by_descriptor2 = {}
 
         self.rule = None
         self.translated_rule = None
@@ -100,11 +110,21 @@ class Workspace(object):
         self.snag_count = 0
         self.last_snag_time = 0
         self.snag_structures = []
+        self.snag_structures_by_type = {}
+        self.built_since_snag = []
+        self.structures_built = 0
+        self.structures_broken = 0
 
         self.changed_length_group = None
         self.amount_length_changed = None
         self.modified_letters = None
 
+        self.weighted_intra_unhappiness = 0
+        self.weighted_inter_unhappiness = 0
+        self.weighted_total_unhappiness = 0
+
+        self.settled_correspondence_inputs = None
+
         if self.initial_string.length == 1 or self.target_string.length == 1:
             self.slipnet.plato_object_category.activation_buffer += self.activation
 
@@ -179,10 +199,10 @@ class Workspace(object):
         """Update various values of the structures, objects, and strings in the
         workspace. Check to see if the snag conditions have been met so that
         everything can go back to normal.  Finally, update the temperature."""
-        for structure in self.structures():
-            structure.update_strengths()
-        for obj in self.objects():
-            obj.update_object_values()
+        if self.incremental_update:
+            self.update_changed_values()
+        else:
+            self.update_all_values()
 
         self.initial_string.update_relative_importances()
         self.target_string.update_relative_importances()
@@ -193,17 +213,91 @@ class Workspace(object):
 
         self.update_temperature()
 
+    def update_all_values(self):
+        """Recompute the strength of every structure and the values of every
+        object on the workspace."""
+        for structure in self.structures():
+            structure.update_strengths()
+        for obj in self.objects():
+            self.update_object_values(obj)
+
+    def update_changed_values(self):
+        """Recompute the strength of every structure and the values of every
+        object on the workspace, except the correspondence strengths once
+        they have settled.
+
+        Each correspondence sums the strengths of those that support it, and
+        checking support compares descriptions across the whole string, so
+        recomputing them is the costliest part of an update on long strings.
+        When nothing they read has changed since a recompute that changed no
+        strength, another one would change nothing either."""
+        inputs = self.correspondence_inputs()
+        settled = inputs == self.settled_correspondence_inputs
+        changed = False
+        for structure in self.structures():
+            if isinstance(structure, Correspondence):
+                if settled:
+                    continue
+                strength = structure.total_strength
+                structure.update_strengths()
+                changed = changed or structure.total_strength != strength
+            else:
+                structure.update_strengths()
+        if not settled:
+            self.settled_correspondence_inputs = None if changed else inputs
+        for obj in self.objects():
+            self.update_object_values(obj)
+
+    def correspondence_inputs(self):
+        """Return what the correspondence strengths read.
+
+        That is the built correspondences, their concept mappings and
+        whether the description types and label of each mapping are fully
+        active, then the groups and the descriptions in the strings.
+        Descriptions are only ever added, and groups are counted by the
+        versions of the strings, so the number of descriptions on the
+        objects stands for the descriptions themselves."""
+        inputs = []
+        for correspondence in self.correspondences():
+            inputs.append(correspondence)
+            for mapping in correspondence.concept_mappings:
+                inputs.append((mapping.description_type1.is_active(),
+                               mapping.description_type2.is_active(),
+                               mapping.label is not None and
+                               mapping.label.is_active()))
+        inputs.append(self.initial_string.versions['groups'])
+        inputs.append(self.target_string.versions['groups'])
+        inputs.append(sum(len(obj.descriptions) for obj in self.objects()))
+        return inputs
+
+    def update_object_values(self, obj):
+        """Update the values of an object on the workspace, keeping the
+        weighted unhappiness sums current."""
+        self.add_weighted_unhappiness(obj, -1)
+        obj.update_object_values()
+        self.add_weighted_unhappiness(obj, 1)
+
+    def add_weighted_unhappiness(self, obj, sign):
+        """Add (sign 1) or remove (sign -1) the object's unhappiness, weighted
+        by its relative importance, to the workspace totals."""
+        importance = sign * obj.relative_importance
+        if importance:
+            self.weighted_intra_unhappiness += importance * obj.intra_string_unhappiness
+            self.weighted_inter_unhappiness += importance * obj.inter_string_unhappiness
+            self.weighted_total_unhappiness += importance * obj.total_unhappiness
+
     def test_snag_condition(self):
         """If the program is dealing with a snag, then see if any new
         structures have been made. If so, see if the snag condition should
         be ended. This will also need work as we learn more about handling
         snags."""
         if self.snag_object and self.snag_condition:
-            new_structures = []
-            for structure in self.structures():
-                if not isinstance(structure, Bond) and \
-                        not self.is_structure_in_snag_structures(structure):
-                    new_structures.append(structure)
+            self.built_since_snag = [structure for structure
+                                     in self.built_since_snag
+                                     if self.is_structure_built(structure)]
+            new_structures = [structure for structure in self.built_since_snag
+                              if not self.is_structure_in_snag_structures(
+                                  structure)]
 
             unclamp_probability = 0
             if new_structures:
@@ -212,6 +306,7 @@ class Workspace(object):
 
             if toolbox.flip_coin(unclamp_probability):
                 self.snag_condition = None
+                self.built_since_snag = []
                 self.clamp_temperature = False
                 for description in self.snag_object.descriptions:
                     description.descriptor.clamp = False
@@ -404,25 +499,50 @@ class Workspace(object):
         """Return the weighted average of the intra string unhappiness of
         objects on the workspace, weighted by each object's relative imoprtance
         in the string."""
-        unhappiness = sum([obj.relative_importance * obj.intra_string_unhappiness
-                           for obj in self.objects()])
-        return min(100, unhappiness / 200.0)
+        return min(100, self.weighted_intra_unhappiness / 200.0)
 
     def inter_string_unhappiness(self):
         """Return a weighted average of the inter string unhappiness of ojbects
         on the workspace, weighted by each object's relative importnace in the
         string."""
-        unhappiness = sum([obj.relative_importance * obj.inter_string_unhappiness
-                           for obj in self.objects()])
-        return min(100, unhappiness / 200.0)
+        return min(100, self.weighted_inter_unhappiness / 200.0)
 
     def total_unhappiness(self):
         """Return a weighted average of the total unhappiness of ojbects on
         the workspace, weighted by each object's relative importnace in the
         string."""
-        unhappiness = sum([obj.relative_importance * obj.total_unhappiness
-                           for obj in self.objects()])
-        return min(100, unhappiness / 200.0)
+        return min(100, self.weighted_total_unhappiness / 200.0)
+
+    def record_snag_structures(self):
+        """Record the structures in the workspace when a snag is hit, and
+        start collecting the structures built while the snag condition holds.
+
+        Only groups, correspondences and rules built since the snag can be
+        new structures, because every structure that was already there is
+        one of the snag structures."""
+        self.snag_structures = self.structures()
+        self.snag_structures_by_type = {}
+        for structure in self.snag_structures:
+            self.snag_structures_by_type.setdefault(type(structure),
+                                                    []).append(structure)
+        self.built_since_snag = []
+
+    def add_built_structure(self, structure):
+        """Note a group, correspondence or rule that has just been built, if
+        the snag condition holds."""
+        if self.snag_condition:
+            self.built_since_snag.append(structure)
+
+    def is_structure_built(self, structure):
+        """Return True if the group, correspondence or rule is still built."""
+        if isinstance(structure, Group):
+            return structure.string in [self.initial_string,
+                                        self.target_string] and \
+                    structure.string.has_object(structure)
+        elif isinstance(structure, Correspondence):
+            index = structure.object1.string_number
+            return self._correspondences.get(index) is structure
+        return structure is self.rule
 
     def is_structure_in_snag_structures(self, structure):
         """This method is used after a snag has been hit and the temperature has
@@ -431,34 +551,31 @@ class Workspace(object):
         structures that were presnt when the last snag was hit. If the given
         structure was built since the snag was hit then there is some change
         that the temperature clamp with be released."""
+        snag_structures = self.snag_structures_by_type.get(type(structure), [])
         if isinstance(structure, Bond):
-            for struct in self.snag_structures:
-                if isinstance(struct, Bond):
-                    if struct.from_object == structure.from_object and \
-                       struct.to_object == structure.to_object and \
-                       struct.bond_category == structure.bond_category and \
-                       struct.direction_category == structure.direction_category:
-                        return True
+            for struct in snag_structures:
+                if struct.from_object == structure.from_object and \
+                   struct.to_object == structure.to_object and \
+                   struct.bond_category == structure.bond_category and \
+                   struct.direction_category == structure.direction_category:
+                    return True
         elif isinstance(structure, Group):
-            for struct in self.snag_structures:
-                if isinstance(struct, Group):
-                    if struct.left_object == structure.left_object and \
-                       struct.right_object == structure.right_object and \
-                       struct.group_category == structure.group_category and \
-                       struct.direction_category == structure.direction_category:
-                        return True
+            for struct in snag_structures:
+                if struct.left_object == structure.left_object and \
+                   struct.right_object == structure.right_object and \
+                   struct.group_category == structure.group_category and \
+                   struct.direction_category == structure.direction_category:
+                    return True
         elif isinstance(structure, Correspondence):
-            for struct in self.snag_structures:
-                if isinstance(struct, Correspondence):
-                    if struct.object1 == structure.object1 and \
-                       struct.object2 == structure.object2 and \
-                       len(struct.relevant_distinguishing_concept_mappings()) >= \
-                       len(structure.relevant_distinguishing_concept_mappings()):
-                        return True
+            for struct in snag_structures:
+                if struct.object1 == structure.object1 and \
+                   struct.object2 == structure.object2 and \
+                   len(struct.relevant_distinguishing_concept_mappings()) >= \
+                   len(structure.relevant_distinguishing_concept_mappings()):
+                    return True
         elif isinstance(structure, Rule):
-            for struct in self.snag_structures:
-                if isinstance(struct, Rule):
-                    return struct == structure
+            for struct in snag_structures:
+                return struct == structure
         return False
 
     def get_concept_mappings(self, object1, object2,
@@ -562,7 +679,7 @@ class Workspace(object):
 
     def get_proposed_correspondences(self):
         """Return a list of proposed correspondences in the workspace."""
-        return toolbox.flatten(self.proposed_correspondences.values())
+        return toolbox.flatten(list(self.proposed_correspondences.values()))
 
     def get_proposed_correspondence(self, first, second):
         """Return a proposed correspondence at first, second."""
@@ -579,13 +696,105 @@ class Workspace(object):
     def add_correspondence(self, correspondence):
         """Add a correspondence to the workspace."""
         index = correspondence.object1.string_number
+        existing = self._correspondences.get(index)
+        if existing:
+            self.unindex_correspondence(existing)
         self._correspondences[index] = correspondence
+        self.index_correspondence(correspondence)
 
     def delete_correspondence(self, correspondence):
         """Delete a correspondence from the workpace."""
         index = correspondence.object1.string_number
+        self.unindex_correspondence(self._correspondences[index])
         del(self._correspondences[index])
 
+    def index_correspondence(self, correspondence):
+        """Enter a built correspondence into the incompatibility index."""
+        self.correspondences_by_object1.setdefault(
+            correspondence.object1, {})[correspondence] = True
+        self.correspondences_by_object2.setdefault(
+            correspondence.object2, {})[correspondence] = True
+        self.index_concept_mappings(correspondence,
+                                    correspondence.concept_mappings)
+
+    def index_concept_mappings(self, correspondence, mappings):
+        """Enter the given concept mappings of a built correspondence into
+        the incompatibility index.
+
+        Mappings without a label can never be incompatible, so only
+        labeled mappings are indexed, by each of their descriptors and then
+        by their label."""
+        number = correspondence.object1.string_number
+        if self._correspondences.get(number) is not correspondence:
+            return
+        for mapping in mappings:
+            if mapping.label is None:
+                continue
+            for index, descriptor in \
+                    [(self.correspondences_by_descriptor1, mapping.descriptor1),
+                     (self.correspondences_by_descriptor2, mapping.descriptor2)]:
+                labels = index.setdefault(descriptor, {})
+                labels.setdefault(mapping.label, {})[correspondence] = True
+
+    def unindex_correspondence(self, correspondence):
+        """Remove a correspondence from the incompatibility index."""
+        self.discard_indexed(self.correspondences_by_object1,
+                             correspondence.object1, correspondence)
+        self.discard_indexed(self.correspondences_by_object2,
+                             correspondence.object2, correspondence)
+        for mapping in correspondence.concept_mappings:
+            if mapping.label is None:
+                continue
+            for index, descriptor in \
+                    [(self.correspondences_by_descriptor1, mapping.descriptor1),
+                     (self.correspondences_by_descriptor2, mapping.descriptor2)]:
+                labels = index.get(descriptor)
+                if labels is None:
+                    continue
+                self.discard_indexed(labels, mapping.label, correspondence)
+                if not labels:
+                    del(index[descriptor])
+
+    def discard_indexed(self, index, key, correspondence):
+        """Discard a correspondence from those under key in the index,
+        dropping the key once none are left."""
+        correspondences = index.get(key)
+        if correspondences is None:
+            return
+        correspondences.pop(correspondence, None)
+        if not correspondences:
+            del(index[key])
+
+    def get_incompatible_correspondences(self, correspondence):
+        """Return the built correspondences that are incompatible with the
+        given correspondence.
+
+        Candidates share an object with the correspondence or have a concept
+        mapping whose descriptor is related to one of its own but whose label
+        differs; only those are checked, rather than every built
+        correspondence. They are returned in the order of correspondences(),
+        since fight_it_out stops at the first fight lost."""
+        candidates = {}
+        candidates.update(
+            self.correspondences_by_object1.get(correspondence.object1, {}))
+        candidates.update(
+            self.correspondences_by_object2.get(correspondence.object2, {}))
+        for mapping in correspondence.concept_mappings:
+            if mapping.label is None:
+                continue
+            for index, descriptor in \
+                    [(self.correspondences_by_descriptor1, mapping.descriptor1),
+                     (self.correspondences_by_descriptor2, mapping.descriptor2)]:
+                related = [descriptor] + [link.to_node for link in
+                                          descriptor.outgoing_links()]
+                for node in related:
+                    for label, correspondences in index.get(node, {}).items():
+                        if label != mapping.label:
+                            candidates.update(correspondences)
+        return [other for other in self._correspondences.values()
+                if other in candidates and
+                correspondence.is_incompatible_correspondence(other)]
+
     def is_correspondence_present(self, correspondence):
         """Return True if the given correspondence exists on the workspace."""
         if correspondence.object1.correspondence:
@@ -689,6 +898,8 @@ class Workspace(object):
         string = group.string
         group.proposal_level = self.built
         string.add_group(group)
+        self.add_built_structure(group)
+        self.structures_built += 1
         for obj in group.objects:
             obj.group = group
         for bond in group.bonds:
@@ -702,6 +913,7 @@ class Workspace(object):
         if group.group:
             self.break_group(group.group)
         string.remove_group(group)
+        self.structures_broken += 1
 
         proposed_bonds = []
         for i in range(string.highest_string_number):
@@ -740,12 +952,14 @@ class Workspace(object):
         for bond in group.bonds:
             bond.group = None
 
+
     def build_description(self, description):
         """Build the new description."""
         if description.is_bond_description():
             description.object.add_bond_description(description)
         else:
             description.object.add_description(description)
+        self.structures_built += 1
         description.description_type.activation_buffer += self.activation
         description.descriptor.activation_buffer += self.activation
 
@@ -762,6 +976,7 @@ class Workspace(object):
         """Build a new bond."""
         bond.proposal_level = self.built
         bond.string.add_bond(bond)
+        self.structures_built += 1
         bond.from_object.add_outgoing_bond(bond)
         bond.to_object.add_incoming_bond(bond)
 
@@ -779,6 +994,7 @@ class Workspace(object):
     def break_bond(self, bond):
         """Break a currently built bond."""
         bond.string.remove_bond(bond)
+        self.structures_broken += 1
         bond.from_object.remove_outgoing_bond(bond)
         bond.to_object.remove_incoming_bond(bond)
 
@@ -802,7 +1018,8 @@ class Workspace(object):
             if description_type.category() == self.slipnet.plato_bond_facet:
                 obj2_bond_facets.append(description_type)
 
-        items = list(set(obj1_bond_facets).intersection(set(obj2_bond_facets)))
+        items = [facet for facet in toolbox.unique(obj1_bond_facets)
+                 if facet in obj2_bond_facets]
         support = [f.total_description_type_support(obj1.string) for f in items]
         return toolbox.weighted_select(support, items)
 
@@ -830,6 +1047,8 @@ class Workspace(object):
         object1.correspondence = correspondence
         object2.correspondence = correspondence
         self.add_correspondence(correspondence)
+        self.add_built_structure(correspondence)
+        self.structures_built += 1
 
         mappings = correspondence.relevant_distinguishing_concept_mappings() + \
                    correspondence.accessory_concept_mappings
@@ -855,6 +1074,7 @@ class Workspace(object):
         correspondence.object1.correspondence = None
         correspondence.object2.correspondence = None
         self.delete_correspondence(correspondence)
+        self.structures_broken += 1
 
     def possible_group_bonds(self, bond_category, direction_category,
                              bond_facet, bonds):
@@ -907,30 +1127,50 @@ class Workspace(object):
         else:
             return VERY_HIGH_DISTRIBUTION
 
+    def temperature_factors(self):
+        """Return the parts of the temperature adjustments that depend only on
+        the temperature, recomputing them when the temperature has changed."""
+        if self.factors_temperature != self.temperature:
+            self.factors_temperature = self.temperature
+            self.probability_adjustment = \
+                (10 - math.sqrt(100 - self.temperature)) / 100.0
+            self.value_exponent = ((100 - self.temperature) / 30.0) + .5
+        return self.probability_adjustment, self.value_exponent
+
     def temperature_adjusted_probability(self, probability):
         """Takes a probability and returns a new probability from 0 to 1 based
         on that value and the temperature."""
         if probability == 0:
             return 0
-        elif probability <= .5:
-            prob_factor = max(1, int(abs(math.log(probability, 10))))
-            value1 = (10 - math.sqrt(100 - self.temperature)) / 100.0
-            value2 = 10 ** -(prob_factor - 1) - probability
-            return min(.5, probability + value1 * value2)
-        elif probability == .5:
-            return .5
-        elif probability > .5:
-            value1 = 1 - probability
-            value2 = (10 - math.sqrt(100 - self.temperature)) / 100.0
-            value3 = 1 - (1 - probability)
-            return max(.5, 1 - value1 + (value2 * value3))
+        if self.factors_temperature != self.temperature:
+            self.temperature_factors()
+        adjustment = self.probability_adjustment
+        if probability <= .5:
+            # Above .0101 the log is well short of -2, so the probability
+            # factor is always 1 and the log can be skipped.
+            if probability > .0101:
+                value2 = 1 - probability
+            else:
+                prob_factor = max(1, int(abs(math.log(probability, 10))))
+                value2 = 10 ** -(prob_factor - 1) - probability
+            return min(.5, probability + adjustment * value2)
+        value1 = 1 - probability
+        value3 = 1 - (1 - probability)
+        return max(.5, 1 - value1 + (adjustment * value3))
+
+    def temperature_adjusted_probabilities(self, probabilities):
+        """Return the temperature adjusted version of each probability."""
+        adjust = self.temperature_adjusted_probability
+        return [adjust(probability) for probability in probabilities]
 
     def temperature_adjusted_values(self, values):
         """Return a list with values that are exponential functins of the
         original values, with the exponent being a funtion of the temperature.
         The higher the temperature, the bigger the difference between unequal
         values."""
-        exponent = ((100 - self.temperature) / 30.0) + .5
+        if self.factors_temperature != self.temperature:
+            self.temperature_factors()
+        exponent = self.value_exponent
         return [round(val ** exponent) for val in values]
 
     def post_codelet_probability(self, category):
@@ -1124,16 +1364,21 @@ class Workspace(object):
     def build_rule(self, rule):
         """Build the new rule."""
         self.rule = rule
+        self.add_built_structure(rule)
+        self.structures_built += 1
         self.activate_from_workspace_rule_descriptions(rule)
 
     def build_translated_rule(self, translated_rule):
         """Build the translated rule."""
         self.translated_rule = translated_rule
+        self.structures_built += 1
 
     def break_rule(self, _):
         """Break the rule. The only reason this function has an argument is so
         that it matchs the form of the other "break" functions and thus the
         break codelets that call it."""
+        if self.rule:
+            self.structures_broken += 1
         self.rule = None
 
     def propose_rule(self, i_object, i_description, m_object, m_description):
@@ -161,8 +161,8 @@ class Bond(Structure):
 
     def incompatible_bonds(self):
         """Return the bonds that are incompatible with the bond."""
-        return list(set([self.left_object.right_bond,
-                         self.right_object.left_bond]) - set([None]))
+        bonds = [self.left_object.right_bond, self.right_object.left_bond]
+        return [bond for bond in toolbox.unique(bonds) if bond is not None]
 
     def incompatible_correspondences(self):
         """Return the correspondences that are incompatible with this bond. This
@@ -261,31 +261,26 @@ class Bond(Structure):
     def local_density(self):
         """Return a rough measure of the density in the string of bonds of the
         same bond category and direction category as the given bond. This method
-        is used in calculating the external strength of a bond."""
-        def calc(direction):
-            """Inner calculation."""
-            slot_sum = 0
-            support_sum = 0
-            method_name = 'choose_%s_neighbor' % direction
-            last_object = {'left': self.left_object,
-                           'right': self.right_object}[direction]
-            next_object = getattr(last_object, method_name)()
-            while next_object:
-                slot_sum += 1
-                first = next_object.string_number
-                last = last_object.string_number
-                bond = self.string.left_right_bonds.get((first, last))
-                if bond:
-                    if bond.bond_category == self.bond_category and \
-                       bond.direction_category == self.direction_category:
-                        support_sum += 1
-                last_object = next_object
-                next_object = getattr(next_object, method_name)()
-            return slot_sum, support_sum
-
-        slot_sum, support_sum = map(sum, zip(calc('left'), calc('right')))
+        is used in calculating the external strength of a bond.
+
+        The slots are the gaps between adjacent letters from the bond to each
+        end of the string, and the supporting bonds are counted from the
+        string's bond edges. Bonds between groups are not counted. To the
+        right, only bonds stored under (right, left) numbers, that is
+        sameness bonds, count as support."""
+        string = self.string
+        left = self.left_object.left_string_position
+        right = self.right_object.right_string_position
+        last_edge = string.length - 1
+        slot_sum = left + last_edge - right
         if slot_sum == 0:
             return 100
+        category = self.bond_category
+        direction = self.direction_category
+        support_sum = string.count_bond_edges((True, category, direction),
+                                              0, left) + \
+                      string.count_bond_edges((False, category, direction),
+                                              right, last_edge)
         return round(100 * (support_sum / float(slot_sum)))
 
     def local_support(self):
@@ -305,9 +300,6 @@ class Bond(Structure):
         account; all qualifying bonds in the string are counted the same."""
         number_of_supporting_bonds = 0
         letter_distance = self.workspace.letter_distance
-        bonds = self.string.get_bonds()
-        if self in bonds:
-            bonds.remove(self)
         for bond in self.string.get_bonds():
             if all([letter_distance(self.left_object, bond.left_object) != 0,
                     letter_distance(self.right_object, bond.right_object) != 0,
@@ -161,6 +161,7 @@ class Correspondence(Structure):
     def add_concept_mappings(self, new_mappings):
         """Add a list of concept mapping to the correspondence."""
         self.concept_mappings.extend(new_mappings)
+        self.workspace.index_concept_mappings(self, new_mappings)
         for mapping in new_mappings:
             if mapping.label:
                 mapping.label.activation_buffer += self.workspace.activation
@@ -186,10 +187,7 @@ class Correspondence(Structure):
     def incompatible_correspondences(self):
         """Return a list of all the already existing correspondences that are
         incompatible with the correspondence"""
-        incomp = []
-        for correspondence in self.workspace.correspondences():
-            if correspondence and self.is_incompatible_correspondence(correspondence):
-                incomp.append(correspondence)
+        incomp = self.workspace.get_incompatible_correspondences(self)
 
         if isinstance(self.object1, Group):
             for obj in self.object1.objects:
@@ -230,7 +228,7 @@ class Correspondence(Structure):
            direction_category_cm:
             incomp.extend(self.workspace.get_leftmost_and_rightmost_incompatible_correspondences(self.object1, self.object2, direction_category_cm))
 
-        return list(set(incomp))
+        return toolbox.unique(incomp)
 
     def incompatible_bond(self):
         """Return the bond that is incompatible with this correspondence."""
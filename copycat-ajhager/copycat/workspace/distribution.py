@@ -16,6 +16,9 @@
 
 """Distribution"""
 
+import bisect
+import itertools
+
 import copycat.toolbox as toolbox
 
 class Distribution(object):
@@ -26,15 +29,30 @@ class Distribution(object):
 
     Attributes:
         name: The string name give to the distribution.
-        probabilities: A map of temperature to probabilities."""
+        probabilities: A map of temperature to probabilities.
+        positions: The temperatures with probabilities, in order.
+        cumulative: The running sums of the probabilities in that order,
+            kept up to date by set."""
 
     def __init__(self, name):
         """Initialize Distribution."""
         self.name = name
         self.probabilities = {}
+        self.positions = []
+        self.cumulative = []
 
     def set(self, position, value):
         """Set a probability at a certain temperature."""
+        index = bisect.bisect_left(self.positions, position)
+        if position in self.probabilities:
+            change = value - self.probabilities[position]
+        else:
+            change = value
+            self.positions.insert(index, position)
+            self.cumulative.insert(index, self.cumulative[index - 1]
+                                   if index else 0)
+        for i in range(index, len(self.cumulative)):
+            self.cumulative[i] += change
         self.probabilities[position] = value
 
     def get(self, position):
@@ -43,9 +61,31 @@ class Distribution(object):
 
     def sum(self):
         """Return the sum of probabilities in the distribution."""
-        return sum(self.probabilities.values())
+        return self.cumulative[-1] if self.cumulative else 0
 
     def choose(self):
-        """Return a number 0-100 based on the probabilities."""
-        values = [self.probabilities[i] for i in sorted(self.probabilities)]
-        return toolbox.weighted_select(values, sorted(self.probabilities))
+        """Return a number 0-100 based on the probabilities.
+
+        Draws exactly as toolbox.weighted_select does for the same weights, so
+        that either can be used without changing a seeded run."""
+        if not self.positions:
+            return None
+        return self.positions[toolbox.cumulative_index(self.cumulative)]
+
+class FixedDistribution(Distribution):
+    """FixedDistribution is a Distribution whose probabilities never change,
+    such as the answer temperature thresholds. Its running sums are worked
+    out once, when it is made, and set is not allowed."""
+
+    def __init__(self, name, probabilities):
+        """Initialize FixedDistribution from a map of temperature to
+        probability."""
+        super(FixedDistribution, self).__init__(name)
+        self.probabilities = dict(probabilities)
+        self.positions = tuple(sorted(probabilities))
+        self.cumulative = tuple(itertools.accumulate(
+            probabilities[position] for position in self.positions))
+
+    def set(self, position, value):
+        """Refuse to change a probability."""
+        raise TypeError("the %s distribution is fixed" % self.name)
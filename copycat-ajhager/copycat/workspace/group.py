@@ -172,7 +172,7 @@ class Group(Object, Structure):
         into acount; all qualifying groups in the string are counted the
         same."""
         number_of_supporting_groups = 0
-        groups = self.string.get_groups()
+        groups = list(self.string.get_groups())
         if self in groups:
             groups.remove(self)
         for other_group in groups:
@@ -254,9 +254,9 @@ class Group(Object, Structure):
 
     def get_incompatible_groups(self):
         """Return a list of the groups that are incompatible with the group."""
-        groups = set([obj.group for obj in self.objects])
-        groups.difference_update([self, None])
-        return list(groups)
+        groups = toolbox.unique([obj.group for obj in self.objects])
+        return [group for group in groups
+                if group is not None and group != self]
 
     def get_incompatible_correspondences(self):
         """Return a list of the correspondences that are incompatible."""
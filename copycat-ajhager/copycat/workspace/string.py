@@ -16,16 +16,31 @@
 
 """String"""
 
+import bisect
 import random
 
 import copycat.toolbox as toolbox
 
+VIEWS = ['letters', 'groups', 'proposed_groups', 'bonds', 'proposed_bonds']
+
 class String(object):
     """String is a letter string in the workspace.
 
     This could be the initial string, modified string or target string.
     Each object in a string has a unique string number that identifies
-    it from other objects in the string."""
+    it from other objects in the string.
+
+    Attributes:
+        versions: The number of times each of the views has been changed.
+        views: Lists of the letters, groups, proposed groups, bonds and
+            proposed bonds, each stored with the version it was built at.
+        view_hits: The number of times each view was returned from views.
+        view_misses: The number of times each view had to be rebuilt.
+        descriptor_counts: The number of letters or groups in the string
+            with a description using each descriptor, keyed by the object's
+            type name and the descriptor.
+        description_type_counts: The number of objects in the string with a
+            description of each description type."""
 
     def __init__(self, workspace, string):
         self.workspace = workspace
@@ -38,10 +53,95 @@ class String(object):
         self.proposed_groups = {}
         self.object_positions = {}
         self.left_right_bonds = {}
+        self.bond_edges = {}
         self.from_to_bonds = {}
         self.proposed_bonds = {}
         self.intra_string_unhappiness = 0
         self.bonds_to_scan_distribution = range(self.length)
+        self.versions = dict.fromkeys(VIEWS, 0)
+        self.views = {}
+        self.view_hits = dict.fromkeys(VIEWS, 0)
+        self.view_misses = dict.fromkeys(VIEWS, 0)
+        self.descriptor_counts = {}
+        self.description_type_counts = {}
+
+    def changed(self, name):
+        """Mark the view with the given name as out of date."""
+        self.versions[name] += 1
+
+    def get_view(self, name, build):
+        """Return the view with the given name, calling build to make it
+        again if the string has changed since it was last built.
+
+        The same list is returned until the view changes, so callers must
+        copy it before modifying it."""
+        version = self.versions[name]
+        view = self.views.get(name)
+        if view is not None and view[0] == version:
+            self.view_hits[name] += 1
+            return view[1]
+        self.view_misses[name] += 1
+        items = build()
+        self.views[name] = (version, items)
+        return items
+
+    def view_statistics(self):
+        """Return a map of view name to (hits, misses)."""
+        return dict((name, (self.view_hits[name], self.view_misses[name]))
+                    for name in VIEWS)
+
+    def has_object(self, obj):
+        """Return True if the object is one of the letters or built groups in
+        the string."""
+        if obj.type_name == 'letter':
+            return self.letters.get(obj.left_string_position) is obj
+        return self.groups.get(obj.left_object.string_number) is obj
+
+    def count_descriptions(self, obj, delta):
+        """Add delta to the counts for each descriptor and description type
+        the object has a description with."""
+        descriptors = toolbox.unique(d.descriptor for d in obj.descriptions)
+        for descriptor in descriptors:
+            key = (obj.type_name, descriptor)
+            self.descriptor_counts[key] = \
+                    self.descriptor_counts.get(key, 0) + delta
+        description_types = toolbox.unique(d.description_type
+                                           for d in obj.descriptions)
+        for description_type in description_types:
+            self.description_type_counts[description_type] = \
+                    self.description_type_counts.get(description_type, 0) + \
+                    delta
+
+    def count_description(self, obj, description):
+        """Count a description about to be added to an object in the string,
+        if the object has no description with its descriptor or description
+        type yet."""
+        if not obj.is_descriptor_present(description.descriptor):
+            key = (obj.type_name, description.descriptor)
+            self.descriptor_counts[key] = self.descriptor_counts.get(key, 0) + 1
+        if not obj.is_description_type_present(description.description_type):
+            description_type = description.description_type
+            self.description_type_counts[description_type] = \
+                    self.description_type_counts.get(description_type, 0) + 1
+
+    def get_descriptor_count(self, descriptor, type_name):
+        """Return the number of objects with the type name in the string that
+        have a description with the descriptor."""
+        return self.descriptor_counts.get((type_name, descriptor), 0)
+
+    def get_description_type_count(self, description_type):
+        """Return the number of objects in the string that have a description
+        with the description type."""
+        return self.description_type_counts.get(description_type, 0)
+
+    def get_object_count(self, type_name=None):
+        """Return the number of letters or groups in the string, or both if
+        no type name is given."""
+        if type_name == 'letter':
+            return len(self.letters)
+        elif type_name == 'group':
+            return len(self.groups)
+        return len(self.letters) + len(self.groups)
 
     def add_to_object_positions(self, obj, position):
         """Add an object to the object positions."""
@@ -61,11 +161,14 @@ class String(object):
         letter.string_number = self.highest_string_number
         position = letter.left_string_position
         self.letters[position] = letter
+        self.count_descriptions(letter, 1)
         self.add_to_object_positions(letter, position)
+        self.changed('letters')
 
     def get_letters(self):
         """Return a list of letters in the string."""
-        return [self.letters[index] for index in sorted(self.letters.keys())]
+        return self.get_view('letters', lambda: [
+            self.letters[index] for index in sorted(self.letters.keys())])
 
     def get_letter(self, position):
         """Return the letter at the given position in the string."""
@@ -87,20 +190,30 @@ class String(object):
         """Add a group to the string."""
         self.highest_string_number += 1
         group.string_number = self.highest_string_number
+        replaced = self.groups.get(group.left_object.string_number)
+        if replaced is not None:
+            self.workspace.add_weighted_unhappiness(replaced, -1)
+            self.count_descriptions(replaced, -1)
         self.groups[group.left_object.string_number] = group
+        self.count_descriptions(group, 1)
+        self.workspace.add_weighted_unhappiness(group, 1)
         self.add_to_object_positions(group, group.left_string_position)
         self.add_to_object_positions(group, group.right_string_position)
+        self.changed('groups')
 
     def remove_group(self, group):
         """Remove a group from the string."""
-        if group.left_object.string_number in self.groups:
-            del self.groups[group.left_object.string_number]
+        removed = self.groups.pop(group.left_object.string_number, None)
+        if removed is not None:
+            self.workspace.add_weighted_unhappiness(removed, -1)
+            self.count_descriptions(removed, -1)
         self.remove_from_object_positions(group, group.left_string_position)
         self.remove_from_object_positions(group, group.right_string_position)
+        self.changed('groups')
 
     def get_groups(self):
         """Return a list of groups in the string."""
-        return list(self.groups.values())
+        return self.get_view('groups', lambda: list(self.groups.values()))
 
     def get_group(self, position):
         """Return the group at the given position in letters.
@@ -127,6 +240,7 @@ class String(object):
             self.proposed_groups[position].append(group)
         else:
             self.proposed_groups[position] = [group]
+        self.changed('proposed_groups')
 
     def remove_proposed_group(self, group):
         """Remove a proposed group from the string."""
@@ -135,10 +249,13 @@ class String(object):
         items = self.proposed_groups.get(position, [])
         if group in items:
             self.proposed_groups[position].remove(group)
+            self.changed('proposed_groups')
 
     def get_proposed_groups(self):
         """Return a list of the proposed groups in the string."""
-        return list(set(toolbox.flatten(self.proposed_groups.values())))
+        return self.get_view('proposed_groups', lambda: toolbox.unique(
+            group for groups in self.proposed_groups.values()
+            for group in groups))
 
     def get_proposed_group(self, first, second):
         """Return the proposed group at first, second position."""
@@ -148,22 +265,22 @@ class String(object):
         """Add a bond to the string, sameness bonds in both directions."""
         left_number = bond.left_object.string_number
         right_number = bond.right_object.string_number
-        self.left_right_bonds[(left_number, right_number)] = bond
+        self.set_left_right_bond((left_number, right_number), bond)
 
         from_number = bond.from_object.string_number
         to_number = bond.to_object.string_number
         self.from_to_bonds[(from_number, to_number)] = bond
 
         if bond.bond_category == self.slipnet.plato_sameness:
-            self.left_right_bonds[(right_number, left_number)] = bond
+            self.set_left_right_bond((right_number, left_number), bond)
             self.from_to_bonds[(to_number, from_number)] = bond
+        self.changed('bonds')
 
     def remove_bond(self, bond):
         """Remove a built bond from the string."""
         left_number = bond.left_object.string_number
         right_number = bond.right_object.string_number
-        if (left_number, right_number) in self.left_right_bonds:
-            del self.left_right_bonds[(left_number, right_number)]
+        self.delete_left_right_bond((left_number, right_number))
 
         from_number = bond.from_object.string_number
         to_number = bond.to_object.string_number
@@ -171,14 +288,62 @@ class String(object):
             del self.from_to_bonds[(from_number, to_number)]
 
         if bond.bond_category == self.slipnet.plato_sameness:
-            if (right_number, left_number) in self.left_right_bonds:
-                del self.left_right_bonds[(right_number, left_number)]
+            self.delete_left_right_bond((right_number, left_number))
             if (to_number, from_number) in self.from_to_bonds:
                 del self.from_to_bonds[(to_number, from_number)]
+        self.changed('bonds')
+
+    def set_left_right_bond(self, numbers, bond):
+        """Store a bond under a pair of string numbers, keeping the bond
+        edges current."""
+        self.delete_left_right_bond(numbers)
+        self.left_right_bonds[numbers] = bond
+        self.index_bond_edge(numbers, bond, True)
+
+    def delete_left_right_bond(self, numbers):
+        """Remove the bond stored under a pair of string numbers, if any."""
+        bond = self.left_right_bonds.pop(numbers, None)
+        if bond is not None:
+            self.index_bond_edge(numbers, bond, False)
+
+    def index_bond_edge(self, numbers, bond, add):
+        """Add or remove the bond's edge in bond_edges.
+
+        An edge is the gap between two adjacent letters, numbered by the
+        position of the left letter. Letters are numbered by position before
+        any group is made, so only numbers below the string length are
+        letters. bond_edges maps (forward, bond category, direction category)
+        to the sorted edges whose bond is stored under (left, right) numbers
+        when forward is True or (right, left) numbers when it is False."""
+        first, second = numbers
+        if first >= self.length or second >= self.length:
+            return
+        if second == first + 1:
+            key = (True, bond.bond_category, bond.direction_category)
+            edge = first
+        elif first == second + 1:
+            key = (False, bond.bond_category, bond.direction_category)
+            edge = second
+        else:
+            return
+        edges = self.bond_edges.setdefault(key, [])
+        if add:
+            bisect.insort(edges, edge)
+        else:
+            edges.remove(edge)
+
+    def count_bond_edges(self, key, start, end):
+        """Return the number of edges from start up to but not including end
+        that have a bond stored under the given bond_edges key."""
+        edges = self.bond_edges.get(key)
+        if not edges or start >= end:
+            return 0
+        return bisect.bisect_left(edges, end) - bisect.bisect_left(edges, start)
 
     def get_bonds(self):
         """Return a list of the built bonds in the string."""
-        return list(set(self.from_to_bonds.values()))
+        return self.get_view('bonds', lambda: toolbox.unique(
+            self.from_to_bonds.values()))
 
     def get_bond(self, from_object, to_object):
         """Return the bond between the two objects, if any."""
@@ -202,6 +367,7 @@ class String(object):
             self.proposed_bonds[position].append(bond)
         else:
             self.proposed_bonds[position] = [bond]
+        self.changed('proposed_bonds')
 
     def remove_proposed_bond(self, bond):
         """Add the proposed bond to the string."""
@@ -211,10 +377,12 @@ class String(object):
             items = self.proposed_bonds[position]
             if bond in items:
                 self.proposed_bonds[position].remove(bond)
+                self.changed('proposed_bonds')
 
     def get_proposed_bonds(self):
         """Return a list of proposed bonds in the string."""
-        return list(set(toolbox.flatten(self.proposed_bonds.values())))
+        return self.get_view('proposed_bonds', lambda: toolbox.unique(
+            bond for bonds in self.proposed_bonds.values() for bond in bonds))
 
     def get_proposed_bond(self, first, second):
         """Return a proposed bonds at first, second in the string."""
@@ -264,7 +432,10 @@ class String(object):
             else:
                 quot = obj.raw_importance / float(raw_importance)
                 importance = round(100 * quot)
-            obj.relative_importance = importance
+            if importance != obj.relative_importance:
+                self.workspace.add_weighted_unhappiness(obj, -1)
+                obj.relative_importance = importance
+                self.workspace.add_weighted_unhappiness(obj, 1)
 
     def update_intra_string_unhappiness(self):
         """Calculate the average of the intra-string unhappiness of all the
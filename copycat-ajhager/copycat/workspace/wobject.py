@@ -318,6 +318,8 @@ class Object(object):
 
     def add_description(self, description):
         """Add the given description to the object's description list."""
+        if self.string.has_object(self):
+            self.string.count_description(self, description)
         description.descriptor_number = len(self.descriptions)
         self.descriptions.append(description)
 
@@ -357,11 +359,11 @@ class Object(object):
            descriptor in self.slipnet.slipnet_numbers:
             return False
         if self.type_name == 'letter':
-            other_objects = self.string.get_letters()
+            other_objects = list(self.string.get_letters())
             if self in other_objects:
                 other_objects.remove(self)
         else:
-            other_objects = self.string.get_groups()
+            other_objects = list(self.string.get_groups())
             if self in other_objects:
                 other_objects.remove(self)
             for obj in self.objects:
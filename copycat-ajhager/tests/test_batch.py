@@ -0,0 +1,86 @@
+"""Tests for headless batch runs and their reports."""
+
+import io
+import unittest
+
+from copycat.batch import read_batch, run_batch, run_seed, write_batch
+from copycat.batch import report
+
+class TestBatch(unittest.TestCase):
+    """A seed must give the same run in any worker and in any order."""
+
+    problem = ('abc', 'abd', 'ijk')
+
+    def test_workers_match_sequential_runs(self):
+        seeds = range(1, 7)
+        sequential = list(run_batch(self.problem, seeds, processes=1))
+        pooled = sorted(run_batch(self.problem, seeds, processes=2),
+                        key=lambda record: record['seed'])
+        for before, after in zip(sequential, pooled):
+            del before['seconds'], after['seconds']
+        self.assertEqual(sequential, pooled)
+        self.assertEqual([record['seed'] for record in sequential],
+                         list(seeds))
+        self.assertTrue(all(record['answer'] for record in sequential))
+
+    def test_reused_process_matches_fresh_run(self):
+        first = run_seed(self.problem, 3)
+        run_seed(('abc', 'abd', 'xyz'), 4)
+        again = run_seed(self.problem, 3)
+        del first['seconds'], again['seconds']
+        self.assertEqual(first, again)
+
+    def test_gives_up_after_max_codelets(self):
+        record = run_seed(('abc', 'abd', 'xyz'), 1, max_codelets=50)
+        self.assertIsNone(record['answer'])
+        self.assertEqual(record['codelets'], 50)
+        self.assertIsNone(record['error'])
+
+    def test_lines_round_trip(self):
+        records = list(run_batch(self.problem, [1, 2], processes=1))
+        output = io.StringIO()
+        self.assertEqual(write_batch(records, output), 2)
+        lines = io.StringIO(output.getvalue() + '\n')
+        self.assertEqual(list(read_batch(lines)), records)
+
+class TestReport(unittest.TestCase):
+    """Reports must count the outcomes and find the temperature quantiles."""
+
+    def record(self, answer, temperature, error=None):
+        return {'initial': 'abc', 'modified': 'abd', 'target': 'xyz',
+                'seed': 1, 'answer': answer, 'temperature': temperature,
+                'codelets': 100, 'seconds': .5, 'error': error}
+
+    def test_quantile(self):
+        self.assertEqual(report.quantile([10], .9), 10)
+        self.assertEqual(report.quantile([10, 20, 30, 40], .5), 25)
+        self.assertEqual(report.quantile([10, 20, 30], 1), 30)
+        self.assertIsNone(report.quantile([], .5))
+
+    def test_summarize(self):
+        records = [self.record('xyd', 20), self.record('xyd', 40),
+                   self.record('wyz', 60), self.record(None, 100),
+                   self.record(None, 90, 'SystemExit: 0')]
+        [(problem, total, outcomes)] = report.summarize(records)
+        self.assertEqual(problem, ('abc', 'abd', 'xyz'))
+        self.assertEqual(total.runs, 5)
+        self.assertEqual([(name, summary.runs) for name, summary in outcomes],
+                         [('xyd', 2), ('error: SystemExit', 1),
+                          ('no answer', 1), ('wyz', 1)])
+        self.assertEqual(outcomes[0][1].quantiles()[2], 30)
+
+    def test_render(self):
+        summaries = report.summarize([self.record('xyd', 20),
+                                      self.record('wyz', 60)])
+        text = io.StringIO()
+        report.render_text(summaries, text)
+        self.assertIn('xyd', text.getvalue())
+        rows = io.StringIO()
+        report.render_csv(summaries, rows)
+        lines = rows.getvalue().splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(lines[0].startswith('initial,modified,target,answer'))
+        self.assertTrue(lines[-1].startswith('abc,abd,xyz,all,2,1.0,'))
+
+if __name__ == '__main__':
+    unittest.main()
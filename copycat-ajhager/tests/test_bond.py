@@ -0,0 +1,99 @@
+"""Tests for bonds."""
+
+import random
+import unittest
+
+from copycat.run import Run
+from copycat.workspace import Bond
+
+def random_bond(workspace, string):
+    """Return a bond between two random adjacent letters of the string."""
+    slipnet = workspace.slipnet
+    position = random.randrange(string.length - 1)
+    letters = [string.get_letter(position), string.get_letter(position + 1)]
+    random.shuffle(letters)
+    from_object, to_object = letters
+    category = slipnet.plato_letter_category
+    from_descriptor = from_object.get_descriptor(category)
+    to_descriptor = to_object.get_descriptor(category)
+    bond_category = slipnet.get_bond_category(from_descriptor, to_descriptor)
+    return Bond(workspace, from_object, to_object, bond_category, category,
+                from_descriptor, to_descriptor)
+
+def walked_local_density(bond):
+    """Return the local density by walking from the bond to each end of the
+    string, as Bond.local_density used to."""
+    def calc(direction):
+        """Inner calculation."""
+        slot_sum = 0
+        support_sum = 0
+        method_name = 'choose_%s_neighbor' % direction
+        last_object = {'left': bond.left_object,
+                       'right': bond.right_object}[direction]
+        next_object = getattr(last_object, method_name)()
+        while next_object:
+            slot_sum += 1
+            first = next_object.string_number
+            last = last_object.string_number
+            other = bond.string.left_right_bonds.get((first, last))
+            if other:
+                if other.bond_category == bond.bond_category and \
+                   other.direction_category == bond.direction_category:
+                    support_sum += 1
+            last_object = next_object
+            next_object = getattr(next_object, method_name)()
+        return slot_sum, support_sum
+
+    slot_sum, support_sum = map(sum, zip(calc('left'), calc('right')))
+    if slot_sum == 0:
+        return 100
+    return round(100 * (support_sum / float(slot_sum)))
+
+def has_overlapping_objects(string):
+    """Return True if some position in the string holds more than one
+    object, so that the walk chooses among neighbors at random."""
+    return any(len(objects) > 1 for objects in string.object_positions.values())
+
+class TestLocalDensity(unittest.TestCase):
+    """Counting bond edges must agree with walking a string of letters."""
+
+    def assert_densities_match(self, workspace):
+        for string in [workspace.initial_string, workspace.target_string]:
+            if has_overlapping_objects(string):
+                continue
+            state = random.getstate()
+            for bond in string.get_bonds():
+                self.assertEqual(bond.local_density(),
+                                 walked_local_density(bond))
+            random.setstate(state)
+
+    def test_random_bonds(self):
+        random.seed(1)
+        letters = 'aabbbcdcbaazyxxxyz'
+        for _ in range(20):
+            target = ''.join(random.choice(letters) for _ in range(40))
+            run = Run('abc', 'abd', target, random.randrange(1000))
+            workspace = run.workspace
+            string = workspace.target_string
+            for _ in range(200):
+                bond = random_bond(workspace, string)
+                if bond.bond_category is None:
+                    continue
+                for existing in [bond.left_object.right_bond,
+                                 bond.right_object.left_bond]:
+                    if existing is not None and existing in string.get_bonds():
+                        workspace.break_bond(existing)
+                if random.random() < .8:
+                    workspace.build_bond(bond)
+                self.assert_densities_match(workspace)
+
+    def test_runs(self):
+        for target, seed in [('ijkkllmmnnoo', 1), ('abcdefghijklmnop', 2),
+                             ('mrrjjjkkkk', 3)]:
+            run = Run('abc', 'abd', target, seed)
+            while not run.workspace.answer_string and run.coderack.time < 3000:
+                run.step()
+                self.assert_densities_match(run.workspace)
+
+if __name__ == '__main__':
+    unittest.main()
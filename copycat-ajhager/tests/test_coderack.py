@@ -0,0 +1,54 @@
+"""Tests for observing the coderack."""
+
+import collections
+import unittest
+
+from copycat.coderack import FamilyTally
+from copycat.run import Run
+
+def recounted(coderack):
+    """Return the count and urgency sum of each family, counted again."""
+    counts = collections.Counter()
+    urgencies = collections.Counter()
+    for pbin in coderack.bins:
+        for codelet in pbin.codelets:
+            family = codelet.__class__.__name__
+            counts[family] += 1
+            urgencies[family] += pbin.urgency(coderack.temperature)
+    return counts, urgencies
+
+class TestFamilyTally(unittest.TestCase):
+    """The tally must match the codelets in the coderack after every step."""
+
+    problems = [('abc', 'abd', 'mrrjjj', 1),
+                ('abc', 'abd', 'iijjkk', 2),
+                ('abc', 'abd', 'kji', 3)]
+
+    def assert_tally(self, tally, coderack):
+        counts, urgencies = recounted(coderack)
+        families = set(counts) | set(tally.counts)
+        for family in families:
+            self.assertEqual(tally.count(family), counts[family])
+            self.assertEqual(tally.urgency_sum(family), urgencies[family])
+
+    def test_tally_follows_run(self):
+        for initial, modified, target, seed in self.problems:
+            run = Run(initial, modified, target, seed)
+            tally = FamilyTally(run.coderack)
+            while run.coderack.time < 500 and not run.workspace.answer_string:
+                run.step()
+                self.assert_tally(tally, run.coderack)
+
+    def test_tally_started_late_and_cleared(self):
+        run = Run('abc', 'abd', 'ijk', 4)
+        for _ in range(30):
+            run.step()
+        tally = FamilyTally(run.coderack)
+        self.assert_tally(tally, run.coderack)
+        run.coderack.clear()
+        self.assertEqual(sum(tally.counts.values()), 0)
+        tally.close()
+        self.assertEqual(run.coderack.observers, [])
+
+if __name__ == '__main__':
+    unittest.main()
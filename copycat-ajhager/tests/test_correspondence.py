@@ -0,0 +1,76 @@
+"""Tests for correspondences."""
+
+import random
+import unittest
+
+from copycat.run import Run
+from copycat.workspace import Correspondence
+
+def scanned_incompatible_correspondences(correspondence):
+    """Return the incompatible built correspondences by checking each one."""
+    workspace = correspondence.workspace
+    return [other for other in workspace.correspondences()
+            if correspondence.is_incompatible_correspondence(other)]
+
+def random_correspondence(workspace):
+    """Return a correspondence between two random objects of the initial and
+    target strings, or None if they have no concept mappings."""
+    object1 = random.choice(workspace.initial_string.get_objects())
+    object2 = random.choice(workspace.target_string.get_objects())
+    mappings = workspace.get_concept_mappings(object1, object2,
+                                              object1.descriptions,
+                                              object2.descriptions)
+    if not mappings:
+        return None
+    return Correspondence(workspace, object1, object2, mappings)
+
+class TestIncompatibleCorrespondences(unittest.TestCase):
+    """Looking up incompatible correspondences must agree with the scan,
+    order included."""
+
+    def assert_lookup_matches(self, correspondence):
+        workspace = correspondence.workspace
+        self.assertEqual(
+            workspace.get_incompatible_correspondences(correspondence),
+            scanned_incompatible_correspondences(correspondence))
+
+    def test_random_correspondences(self):
+        random.seed(2)
+        for target in ['ijk', 'iijjkk', 'cba', 'aabc', 'ccbbaa', 'abcdefgh']:
+            run = Run('abc', 'abd', target, random.randrange(1000))
+            workspace = run.workspace
+            # Let the run build groups and descriptions whose mappings can
+            # conflict, not just the initial letter mappings.
+            while not workspace.answer_string and run.coderack.time < 300:
+                run.step()
+            for _ in range(300):
+                correspondence = random_correspondence(workspace)
+                if correspondence is None:
+                    continue
+                self.assert_lookup_matches(correspondence)
+                if random.random() < .5:
+                    existing = correspondence.object1.correspondence
+                    if existing:
+                        workspace.break_correspondence(existing)
+                    existing = correspondence.object2.correspondence
+                    if existing:
+                        workspace.break_correspondence(existing)
+                    workspace.build_correspondence(correspondence)
+                elif workspace.correspondences() and random.random() < .3:
+                    existing = random.choice(workspace.correspondences())
+                    workspace.break_correspondence(existing)
+
+    def test_runs(self):
+        for target, seed in [('mrrjjj', 1), ('kji', 2), ('iijjkk', 3)]:
+            run = Run('abc', 'abd', target, seed)
+            workspace = run.workspace
+            while not workspace.answer_string and run.coderack.time < 2000:
+                run.step()
+                for proposed in workspace.proposed_correspondences.values():
+                    for correspondence in proposed:
+                        self.assert_lookup_matches(correspondence)
+                for correspondence in workspace.correspondences():
+                    self.assert_lookup_matches(correspondence)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+"""Tests for distributions."""
+
+import random
+import unittest
+
+import copycat.toolbox as toolbox
+from copycat.workspace import Distribution, FixedDistribution
+from copycat.workspace import VERY_LOW_DISTRIBUTION, MEDIUM_DISTRIBUTION
+
+def sorted_choice(probabilities):
+    """Choose from a map of temperature to probability by sorting it."""
+    values = [probabilities[i] for i in sorted(probabilities)]
+    return toolbox.weighted_select(values, sorted(probabilities))
+
+def random_probabilities():
+    """Return a random map of temperature to probability."""
+    size = random.choice([1, 2, 3, 10, 40])
+    weights = random.choice([[0], [0, 1], [1, 5, 150], list(range(20))])
+    return dict((random.randrange(101), random.choice(weights))
+                for _ in range(size))
+
+class TestDistribution(unittest.TestCase):
+    """Running sums must choose exactly as sorting on every draw did."""
+
+    def assert_chooses_alike(self, distribution, probabilities):
+        state = random.getstate()
+        expected = [sorted_choice(probabilities) for _ in range(20)]
+        after = random.getstate()
+        random.setstate(state)
+        self.assertEqual([distribution.choose() for _ in range(20)],
+                         expected)
+        self.assertEqual(random.getstate(), after)
+        self.assertEqual(distribution.sum(), sum(probabilities.values()))
+        for position in range(101):
+            self.assertEqual(distribution.get(position),
+                             probabilities.get(position, 0))
+
+    def test_fixed(self):
+        random.seed(1)
+        for _ in range(200):
+            probabilities = random_probabilities()
+            distribution = FixedDistribution('test', probabilities)
+            self.assert_chooses_alike(distribution, probabilities)
+
+    def test_set(self):
+        random.seed(2)
+        for _ in range(50):
+            distribution = Distribution('test')
+            probabilities = {}
+            for _ in range(40):
+                position = random.randrange(0, 101, 5)
+                value = random.randrange(random.choice([1, 3, 200]))
+                distribution.set(position, value)
+                probabilities[position] = value
+                self.assert_chooses_alike(distribution, probabilities)
+
+    def test_empty(self):
+        self.assertIsNone(Distribution('empty').choose())
+        self.assertIsNone(FixedDistribution('empty', {}).choose())
+
+    def test_fixed_is_fixed(self):
+        distribution = FixedDistribution('test', {10: 5, 90: 1})
+        self.assertTrue(isinstance(distribution, Distribution))
+        self.assertRaises(TypeError, distribution.set, 10, 6)
+        self.assertEqual(distribution.get(10), 5)
+
+    def test_thresholds(self):
+        random.seed(3)
+        self.assert_chooses_alike(VERY_LOW_DISTRIBUTION, {
+            10:5, 20:150, 30:5, 40:2, 50:1, 60:1, 70:1, 80:1, 90:1, 100:1})
+        self.assert_chooses_alike(MEDIUM_DISTRIBUTION, {
+            10:1, 20:2, 30:5, 40:150, 50:5, 60:2, 70:1, 80:1, 90:1, 100:1})
+
+if __name__ == '__main__':
+    unittest.main()
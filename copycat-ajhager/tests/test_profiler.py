@@ -0,0 +1,67 @@
+"""Tests for the codelet profiler."""
+
+import json
+import os
+import tempfile
+import unittest
+
+from copycat.profiler import Profiler
+from copycat.run import Run
+
+def finished(run, limit=3000):
+    """Step the run until it has an answer or has run limit codelets."""
+    while not run.workspace.answer_string and run.coderack.time < limit:
+        run.step()
+    return run
+
+class TestProfiler(unittest.TestCase):
+    """Profiling must not change a run and must account for every codelet."""
+
+    problems = [('abc', 'abd', 'iijjkk', 3), ('abc', 'abd', 'xyz', 4)]
+
+    def test_profiled_run_is_unchanged(self):
+        for initial, modified, target, seed in self.problems:
+            plain = finished(Run(initial, modified, target, seed))
+            run = Run(initial, modified, target, seed)
+            run.profile(Profiler())
+            finished(run)
+            self.assertEqual(run.coderack.time, plain.coderack.time)
+            self.assertEqual(run.workspace.answer_string.name,
+                             plain.workspace.answer_string.name)
+
+    def test_families_add_up(self):
+        for initial, modified, target, seed in self.problems:
+            run = Run(initial, modified, target, seed)
+            profiler = Profiler(trace=True)
+            run.profile(profiler)
+            finished(run)
+            families = profiler.families.values()
+            self.assertEqual(sum(family.count for family in families),
+                             len(profiler.events))
+            self.assertEqual(sum(family.built for family in families),
+                             run.workspace.structures_built)
+            self.assertEqual(sum(family.broken for family in families),
+                             run.workspace.structures_broken)
+            self.assertGreater(profiler.families['BondBuilder'].built, 0)
+            for family in families:
+                self.assertLessEqual(family.longest, family.total)
+
+    def test_exports(self):
+        run = Run('abc', 'abd', 'ijk', 1)
+        profiler = Profiler(trace=True)
+        run.profile(profiler)
+        for _ in range(100):
+            run.step()
+        lines = profiler.table().splitlines()
+        self.assertEqual(len(lines), len(profiler.families) + 1)
+        path = os.path.join(tempfile.mkdtemp(), 'trace.json')
+        profiler.write_trace(path)
+        with open(path) as trace:
+            events = json.load(trace)['traceEvents']
+        self.assertEqual(len(events), 100)
+        self.assertEqual(events[0]['ph'], 'X')
+        self.assertTrue(all(event['dur'] >= 0 for event in events))
+        os.remove(path)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+"""Tests for recording the coderack's bins and summarizing the pressure."""
+
+import io
+import unittest
+
+from copycat.batch import pressure, run_seed
+from copycat.coderack.recorder import BINS, BinRecorder
+from copycat.run import Run
+
+class TestBinRecorder(unittest.TestCase):
+    """Recordings must account for every codelet chosen and removed."""
+
+    problems = [('abc', 'abd', 'mrrjjj', 1), ('abc', 'abd', 'xyz', 4)]
+
+    def test_recorded_run_is_unchanged(self):
+        for initial, modified, target, seed in self.problems:
+            plain = Run(initial, modified, target, seed)
+            for _ in range(250):
+                plain.step()
+            run = Run(initial, modified, target, seed)
+            run.coderack.record(BinRecorder())
+            for _ in range(250):
+                run.step()
+            self.assertEqual(run.coderack.time, plain.coderack.time)
+            self.assertEqual([len(pbin.codelets) for pbin in run.coderack.bins],
+                             [len(pbin.codelets)
+                              for pbin in plain.coderack.bins])
+
+    def test_samples_add_up(self):
+        for initial, modified, target, seed in self.problems:
+            run = Run(initial, modified, target, seed)
+            recorder = BinRecorder()
+            run.coderack.record(recorder)
+            evicted = []
+            post = run.coderack.post
+            def counted_post(codelet, urgency):
+                removed = post(codelet, urgency)
+                if removed:
+                    evicted.append(removed.__class__.__name__)
+                return removed
+            run.coderack.post = counted_post
+            update = run.coderack.update
+            def checked_update(temperature):
+                update(temperature)
+                self.assertEqual(
+                    recorder.bin_occupancy(recorder.size - 1),
+                    [len(pbin.codelets) for pbin in run.coderack.bins])
+            run.coderack.update = checked_update
+            while run.coderack.time < 600 and not run.workspace.answer_string:
+                run.step()
+            chosen = sum(recorder.chosen) + recorder.pending_chosen
+            self.assertEqual(chosen, run.coderack.time)
+            self.assertEqual(sum(recorder.bin_chosen), run.coderack.time)
+            self.assertEqual(sum(recorder.evicted) + recorder.pending_evicted,
+                             len(evicted))
+            self.assertEqual(sum(recorder.evictions.values()), len(evicted))
+            self.assertEqual(list(recorder.times[:3]),
+                             [0, run.timestep, 2 * run.timestep])
+
+    def test_capacity(self):
+        run = Run('abc', 'abd', 'ijk', 2)
+        recorder = BinRecorder(capacity=5)
+        run.coderack.record(recorder)
+        for _ in range(10 * run.timestep):
+            run.step()
+        self.assertEqual(recorder.size, 5)
+        self.assertEqual(recorder.dropped, 5)
+        self.assertEqual(len(recorder.occupancy), 5 * BINS)
+        self.assertEqual(len(recorder.to_dict()['occupancy']), 5)
+
+class TestPressure(unittest.TestCase):
+    """Pressure must total the recordings of every run."""
+
+    def test_summarize(self):
+        records = [run_seed(('abc', 'abd', 'mrrjjj'), seed, 600, True)
+                   for seed in [1, 2]]
+        [summary] = pressure.summarize(records, 5)
+        self.assertEqual(summary.recorded, 2)
+        samples = sum(len(record['bins']['times']) for record in records)
+        self.assertEqual(sum(window.samples for window in summary.windows),
+                         samples)
+        self.assertEqual(summary.windows[0].runs, set([0, 1]))
+        self.assertEqual(sum(summary.evictions.values()),
+                         sum(sum(record['bins']['evictions'].values())
+                             for record in records))
+        text = io.StringIO()
+        pressure.render_text([summary], text)
+        self.assertIn('mean codelets in bins', text.getvalue())
+        rows = io.StringIO()
+        pressure.render_csv([summary], rows)
+        self.assertEqual(len(rows.getvalue().splitlines()),
+                         len(summary.windows) + 1)
+
+    def test_skips_runs_not_recorded(self):
+        records = [run_seed(('abc', 'abd', 'ijk'), 1, 100)]
+        self.assertEqual(pressure.summarize(records, 10), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+"""Tests for checkpointing and restoring runs."""
+
+import os
+import random
+import tempfile
+import unittest
+
+from copycat.run import Run
+
+def state(run):
+    """Return a summary of everything a step of the run can change."""
+    workspace = run.workspace
+    structures = [(type(structure).__name__, structure.total_strength)
+                  for structure in workspace.structures()]
+    codelets = [(type(codelet).__name__, codelet.bin.urgency_code,
+                 codelet.timestamp) for codelet in run.coderack.codelets()]
+    activations = [(node.activation, node.activation_buffer)
+                   for node in run.slipnet.slipnodes]
+    answer = workspace.answer_string
+    return (run.coderack.time, workspace.temperature,
+            answer.name if answer else None,
+            structures, codelets, activations, random.getstate())
+
+def trace(run, steps):
+    """Step the run and return its state after each step."""
+    states = []
+    for _ in range(steps):
+        if run.workspace.answer_string:
+            break
+        run.step()
+        states.append(state(run))
+    return states
+
+class TestCheckpoint(unittest.TestCase):
+    """A restored run must carry on exactly as the original would have."""
+
+    problems = [('abc', 'abd', 'mrrjjj', 1, 150),
+                ('abc', 'abd', 'iijjkk', 2, 60),
+                ('abc', 'abd', 'kji', 3, 100),
+                ('aabc', 'aabd', 'ijkk', 4, 15)]
+
+    def test_restored_run_continues_identically(self):
+        for initial, modified, target, seed, steps in self.problems:
+            run = Run(initial, modified, target, seed)
+            trace(run, steps)
+            snapshot = run.checkpoint()
+            original = trace(run, 400)
+            restored = trace(Run.restore(snapshot), 400)
+            self.assertEqual(original, restored)
+
+    def test_checkpointing_does_not_disturb_the_run(self):
+        run = Run('abc', 'abd', 'ijjkkk', 5)
+        uninterrupted = trace(run, 300)
+        run = Run('abc', 'abd', 'ijjkkk', 5)
+        interrupted = []
+        for _ in range(30):
+            run.checkpoint()
+            interrupted.extend(trace(run, 10))
+        self.assertEqual(uninterrupted, interrupted)
+
+    def test_save_and_load(self):
+        run = Run('abc', 'abd', 'mrrjjj', 6)
+        trace(run, 100)
+        path = os.path.join(tempfile.mkdtemp(), 'run.snapshot')
+        run.save(path)
+        original = trace(run, 300)
+        restored = trace(Run.load(path), 300)
+        os.remove(path)
+        self.assertEqual(original, restored)
+
+    def test_forks_follow_their_seeds(self):
+        run = Run('abc', 'abd', 'iijjkk', 7)
+        trace(run, 50)
+        first = [trace(fork, 300) for fork in run.fork([1, 2, 3])]
+        second = [trace(fork, 300) for fork in run.fork([1, 2, 3])]
+        self.assertEqual(first, second)
+        self.assertNotEqual(first[0], first[1])
+
+if __name__ == '__main__':
+    unittest.main()
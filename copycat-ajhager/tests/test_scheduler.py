@@ -0,0 +1,74 @@
+"""Tests for the client scheduler."""
+
+import sys
+import unittest
+
+import clients
+from clients.scheduler import Scheduler
+from copycat.run import Run
+
+class FakeClock(object):
+    """A clock that only moves when a step of the run moves it."""
+
+    def __init__(self, run, step_time):
+        self.now = 0.0
+        self.step = run.step
+        self.step_time = step_time
+        run.step = self.timed_step
+
+    def timed_step(self):
+        self.step()
+        self.now += self.step_time
+
+    def __call__(self):
+        return self.now
+
+class TestScheduler(unittest.TestCase):
+    """The scheduler must run the due steps without overrunning a frame."""
+
+    def scheduler(self, step_time, **arguments):
+        run = Run('abc', 'abd', 'mrrjjj', 1)
+        clock = FakeClock(run, step_time)
+        return Scheduler(run, clock=clock, **arguments), run
+
+    def test_speed_below_frame_rate(self):
+        scheduler, run = self.scheduler(.001, speed=15)
+        steps = [scheduler.update(1 / 60.0) for _ in range(60)]
+        self.assertEqual(sum(steps), 15)
+        self.assertEqual(max(steps), 1)
+        self.assertEqual(run.coderack.time, 15)
+
+    def test_speed_above_frame_rate(self):
+        scheduler, run = self.scheduler(.0001, speed=600, budget=.01)
+        steps = [scheduler.update(1 / 60.0) for _ in range(6)]
+        self.assertEqual(sum(steps), 60)
+        self.assertAlmostEqual(scheduler.steps_per_second, 600)
+
+    def test_budget_limits_steps(self):
+        scheduler, run = self.scheduler(.004, speed=600, budget=.01)
+        self.assertEqual(scheduler.update(1 / 60.0), 3)
+        self.assertAlmostEqual(scheduler.last_frame_time, .012)
+        scheduler, run = self.scheduler(.004, speed=None, budget=.01)
+        self.assertEqual(scheduler.update(1 / 60.0), 3)
+
+    def test_slow_step_still_runs(self):
+        scheduler, run = self.scheduler(.5, speed=15, budget=.01)
+        self.assertEqual(scheduler.update(.1), 1)
+        self.assertEqual(scheduler.update(.1), 1)
+        self.assertAlmostEqual(scheduler.frame_time, .5)
+
+    def test_stops_at_answer(self):
+        scheduler, run = self.scheduler(0, speed=None, budget=1)
+        while not run.workspace.answer_string:
+            self.assertGreater(scheduler.update(1 / 60.0), 0)
+        self.assertEqual(scheduler.update(1 / 60.0), 0)
+
+class TestClients(unittest.TestCase):
+    """The clients package must not load the OpenGL client until asked."""
+
+    def test_opengl_client_is_lazy(self):
+        self.assertNotIn('clients.opengl', sys.modules)
+        self.assertRaises(AttributeError, getattr, clients, 'NoSuchClient')
+
+if __name__ == '__main__':
+    unittest.main()
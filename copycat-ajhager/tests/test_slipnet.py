@@ -0,0 +1,118 @@
+"""Tests for updating the slipnet."""
+
+import random
+import types
+import unittest
+
+import copycat.toolbox as toolbox
+from copycat.run import Run
+from copycat.slipnet import numpy
+
+def looped_update(slipnet):
+    """Update the slipnet by walking every node and link, as it used to."""
+    for node in slipnet.slipnodes:
+        node.decay()
+        if node.is_active():
+            for link in node.outgoing_links():
+                amount_to_spread = round(node.activation * \
+                        (link.intrinsic_degree_of_association() / 100.0))
+                link.to_node.activation_buffer += amount_to_spread
+
+    for node in slipnet.slipnodes:
+        node.activation = min(100, node.activation + node.activation_buffer)
+        if node.clamp:
+            node.activation = 100
+        else:
+            if node.activation >= 50:
+                full_activation_probability = (node.activation / 100.0) ** 3
+                if toolbox.flip_coin(full_activation_probability):
+                    node.activation = 100
+        node.activation_buffer = 0
+
+def scanned_top_down_codelets(slipnet):
+    """Return the codelets attached to active nodes by scanning them all."""
+    codelets = []
+    for node in slipnet.slipnodes:
+        if node.activation >= 50:
+            for codelet in node.codelets:
+                codelets.append((codelet, [node], node.conceptual_depth / 100.))
+    return codelets
+
+def trace(run, steps):
+    """Step the run and return the activations and random state after
+    each step."""
+    states = []
+    for _ in range(steps):
+        if run.workspace.answer_string:
+            break
+        run.step()
+        states.append(([node.activation for node in run.slipnet.slipnodes],
+                       run.coderack.time, random.getstate()))
+    return states
+
+class TestSlipnetUpdate(unittest.TestCase):
+    """The compiled update must match the looped update, seed for seed."""
+
+    problems = [('abc', 'abd', 'mrrjjj', 1),
+                ('abc', 'abd', 'iijjkk', 2),
+                ('abc', 'abd', 'kji', 3),
+                ('aabc', 'aabd', 'ijkk', 4)]
+
+    def assert_parity(self, vectorized):
+        for initial, modified, target, seed in self.problems:
+            looped = Run(initial, modified, target, seed)
+            looped.slipnet.update = types.MethodType(looped_update,
+                                                     looped.slipnet)
+            looped.slipnet.top_down_codelets = types.MethodType(
+                scanned_top_down_codelets, looped.slipnet)
+            expected = trace(looped, 600)
+            compiled = Run(initial, modified, target, seed)
+            compiled.slipnet.vectorized = vectorized
+            self.assertEqual(trace(compiled, 600), expected)
+
+    def test_compiled_update(self):
+        self.assert_parity(False)
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_vectorized_update(self):
+        self.assert_parity(True)
+
+    def test_random_activations(self):
+        random.seed(5)
+        looped = Run('abc', 'abd', 'ijk', 5).slipnet
+        compiled = Run('abc', 'abd', 'ijk', 5).slipnet
+        for _ in range(200):
+            for first, second in zip(looped.slipnodes, compiled.slipnodes):
+                first.activation = second.activation = \
+                        random.choice([0, 30, 50, 75, 99, 100])
+                first.activation_buffer = second.activation_buffer = \
+                        random.choice([0, 0, 100, 200])
+                first.clamp = second.clamp = random.random() < .1
+            state = random.getstate()
+            looped_update(looped)
+            after = random.getstate()
+            random.setstate(state)
+            compiled.update()
+            self.assertEqual(random.getstate(), after)
+            self.assertEqual([node.activation for node in compiled.slipnodes],
+                             [node.activation for node in looped.slipnodes])
+
+class TestHotNodes(unittest.TestCase):
+    """The hot nodes must be the nodes with an activation of at least 50."""
+
+    def test_hot_nodes_follow_updates(self):
+        run = Run('abc', 'abd', 'mrrjjj', 6)
+        slipnet = run.slipnet
+        while run.coderack.time < 600 and not run.workspace.answer_string:
+            run.step()
+            self.assertEqual(slipnet.top_down_codelets(),
+                             scanned_top_down_codelets(slipnet))
+        hot = len(slipnet.hot_indexes)
+        self.assertGreater(slipnet.warmed, 0)
+        self.assertEqual(slipnet.warmed - slipnet.cooled, hot)
+        slipnet.clear()
+        self.assertEqual(slipnet.hot_indexes, [])
+        self.assertEqual(slipnet.top_down_codelets(), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+"""Tests for the cached views and description counts of strings."""
+
+import unittest
+
+import copycat.toolbox as toolbox
+from copycat.run import Run
+
+def rebuilt_views(string):
+    """Return the views of the string, built from scratch."""
+    return {
+        'letters': [string.letters[i] for i in sorted(string.letters)],
+        'groups': list(string.groups.values()),
+        'proposed_groups': toolbox.unique(
+            group for groups in string.proposed_groups.values()
+            for group in groups),
+        'bonds': toolbox.unique(string.from_to_bonds.values()),
+        'proposed_bonds': toolbox.unique(
+            bond for bonds in string.proposed_bonds.values()
+            for bond in bonds)}
+
+def cached_views(string):
+    """Return the views of the string through its getters."""
+    return {
+        'letters': string.get_letters(),
+        'groups': string.get_groups(),
+        'proposed_groups': string.get_proposed_groups(),
+        'bonds': string.get_bonds(),
+        'proposed_bonds': string.get_proposed_bonds()}
+
+def scanned_descriptor_support(node, objects):
+    """Return the descriptor support of the node by checking each object."""
+    if not objects:
+        return 0
+    count = len([obj for obj in objects if obj.is_descriptor_present(node)])
+    return round(100 * (count / float(len(objects))))
+
+def scanned_description_type_support(node, objects):
+    """Return the description type support of the node by checking each
+    object."""
+    count = len([obj for obj in objects
+                 if obj.is_description_type_present(node)])
+    return round(100 * (count / float(len(objects))))
+
+class TestStringViews(unittest.TestCase):
+    """Cached views must always match the dictionaries they are built from."""
+
+    problems = [('abc', 'abd', 'mrrjjj', 1),
+                ('abc', 'abd', 'iijjkk', 2),
+                ('abc', 'abd', 'kji', 3)]
+
+    def test_views_match_rebuilt_views(self):
+        for initial, modified, target, seed in self.problems:
+            run = Run(initial, modified, target, seed)
+            strings = [run.workspace.initial_string,
+                       run.workspace.target_string]
+            while run.coderack.time < 600 and not run.workspace.answer_string:
+                run.step()
+                for string in strings:
+                    self.assertEqual(cached_views(string),
+                                     rebuilt_views(string))
+
+    def test_views_are_reused_until_changed(self):
+        run = Run('abc', 'abd', 'ijk', 1)
+        string = run.workspace.target_string
+        letters = string.get_letters()
+        hits, misses = string.view_statistics()['letters']
+        self.assertIs(string.get_letters(), letters)
+        self.assertEqual(string.view_statistics()['letters'],
+                         (hits + 1, misses))
+        groups = string.get_groups()
+        string.changed('groups')
+        self.assertIsNot(string.get_groups(), groups)
+        self.assertIs(string.get_letters(), letters)
+
+class TestDescriptionCounts(unittest.TestCase):
+    """Supports from the counts must match checking every object."""
+
+    problems = [('abc', 'abd', 'mrrjjj', 1),
+                ('abc', 'abd', 'iijjkk', 2),
+                ('abc', 'abd', 'kji', 3),
+                ('aabc', 'aabd', 'ijkk', 4)]
+
+    def assert_supports(self, run):
+        slipnet = run.slipnet
+        for string in [run.workspace.initial_string,
+                       run.workspace.modified_string,
+                       run.workspace.target_string]:
+            letters = list(string.letters.values())
+            groups = string.get_groups()
+            for node in slipnet.slipnodes:
+                self.assertEqual(
+                    node.local_descriptor_support(string, slipnet.plato_letter),
+                    scanned_descriptor_support(node, letters))
+                self.assertEqual(
+                    node.local_descriptor_support(string, slipnet.plato_group),
+                    scanned_descriptor_support(node, groups))
+                self.assertEqual(
+                    node.local_description_type_support(string),
+                    scanned_description_type_support(node, letters + groups))
+
+    def test_supports_follow_run(self):
+        for initial, modified, target, seed in self.problems:
+            run = Run(initial, modified, target, seed)
+            self.assert_supports(run)
+            while run.coderack.time < 600 and not run.workspace.answer_string:
+                run.step()
+                if run.coderack.time % 5 == 0:
+                    self.assert_supports(run)
+            self.assert_supports(run)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+"""Tests for the sampling functions in the toolbox."""
+
+import random
+import unittest
+
+import copycat.toolbox as toolbox
+
+def walked_weighted_index(weights):
+    """Choose an index by weight, walking the weights as the toolbox used
+    to."""
+    total = sum(weights)
+    if total <= 0:
+        return random.randint(0, len(weights) - 1)
+    value = random.randint(0, total - 1)
+    new_total = 0
+    index = 0
+    for weight in weights:
+        new_total += weight
+        index += 1
+        if new_total > value:
+            return index - 1
+
+def walked_select_assoc(assoc_list):
+    """Choose an item by probability, walking the list as the toolbox used
+    to."""
+    if assoc_list == []:
+        return
+    probability_sum = 0
+    for item, probability in assoc_list:
+        probability_sum += probability
+    if probability_sum <= 0:
+        return
+    value = random.uniform(0, probability_sum)
+    new_probability_sum = 0
+    for item, probability in assoc_list:
+        new_probability_sum += probability
+        if new_probability_sum > value:
+            return item
+
+def listed_flip_coin(prob_of_true=.5):
+    """Flip a coin through select_assoc, as the toolbox used to."""
+    if prob_of_true >= 1:
+        return True
+    return walked_select_assoc([[True, int(prob_of_true * 1000)],
+                                [False, int((1 - prob_of_true) * 1000)]])
+
+def summed_flatten(sequence):
+    """Flatten a sequence by summing lists, as the toolbox used to."""
+    if isinstance(sequence, list):
+        return sum(map(summed_flatten, sequence), [])
+    else:
+        return [sequence]
+
+def random_weights():
+    """Return a random list of weights, sometimes with negative ones."""
+    size = random.choice([1, 2, 3, 10, 50])
+    low = random.choice([0, 0, 0, -3])
+    return [random.randint(low, random.choice([1, 5, 200]))
+            for _ in range(size)]
+
+class TestSampling(unittest.TestCase):
+    """Every primitive must draw and choose exactly as it used to."""
+
+    def assert_same_draws(self, expected, actual, *arguments):
+        state = random.getstate()
+        first = [expected(*arguments) for _ in range(10)]
+        after = random.getstate()
+        random.setstate(state)
+        self.assertEqual([actual(*arguments) for _ in range(10)], first)
+        self.assertEqual(random.getstate(), after)
+
+    def test_weighted_index(self):
+        random.seed(1)
+        for _ in range(500):
+            weights = random_weights()
+            self.assert_same_draws(walked_weighted_index,
+                                   toolbox.weighted_index, weights)
+            if min(weights) >= 0:
+                sampler = toolbox.Sampler(weights)
+                self.assert_same_draws(walked_weighted_index,
+                                       lambda w: sampler.index(), weights)
+
+    def test_select_assoc(self):
+        random.seed(2)
+        for _ in range(500):
+            weights = [w * random.choice([1, .37]) for w in random_weights()]
+            assoc_list = [[i, w] for i, w in enumerate(weights)]
+            self.assert_same_draws(walked_select_assoc, toolbox.select_assoc,
+                                   assoc_list)
+        self.assertIsNone(toolbox.select_assoc([]))
+
+    def test_flip_coin(self):
+        random.seed(3)
+        for probability in [-.5, 0, .001, .1, .125, .3333, .5, .999, 1, 2]:
+            self.assert_same_draws(listed_flip_coin, toolbox.flip_coin,
+                                   probability)
+
+    def test_injected_rng(self):
+        random.seed(4)
+        weights = [3, 0, 7, 1, 12]
+        expected = [toolbox.weighted_index(weights) for _ in range(20)]
+        expected.append(toolbox.flip_coin(.4))
+        expected.append(toolbox.select_assoc([['a', .2], ['b', .8]]))
+        rng = random.Random(4)
+        state = random.getstate()
+        actual = [toolbox.weighted_index(weights, rng) for _ in range(20)]
+        actual.append(toolbox.flip_coin(.4, rng))
+        actual.append(toolbox.select_assoc([['a', .2], ['b', .8]], rng))
+        self.assertEqual(actual, expected)
+        self.assertEqual(random.getstate(), state)
+
+    def test_flatten(self):
+        for sequence in [1, [], [1, 2], [[1], [2, [3, [4, []]]], 5],
+                         [[[[]]]], ['ab', ('c',), [{'d': 1}]],
+                         [[i, [i]] for i in range(100)]]:
+            self.assertEqual(toolbox.flatten(sequence),
+                             summed_flatten(sequence))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,216 @@
+"""Tests for the workspace."""
+
+import math
+import random
+import unittest
+
+from copycat.run import Run
+from copycat.workspace import Bond
+
+STRUCTURE_VALUES = ['internal_strength', 'external_strength', 'total_strength']
+
+OBJECT_VALUES = ['raw_importance', 'intra_string_happiness',
+                 'intra_string_unhappiness', 'inter_string_happiness',
+                 'inter_string_unhappiness', 'total_happiness',
+                 'total_unhappiness', 'intra_string_salience',
+                 'inter_string_salience', 'total_salience']
+
+WORKSPACE_VALUES = ['weighted_intra_unhappiness', 'weighted_inter_unhappiness',
+                    'weighted_total_unhappiness']
+
+def snapshot(workspace):
+    """Return the strengths, object values and unhappiness sums on the
+    workspace."""
+    values = [(workspace, WORKSPACE_VALUES,
+               [getattr(workspace, name) for name in WORKSPACE_VALUES])]
+    for structure in workspace.structures():
+        values.append((structure, STRUCTURE_VALUES,
+                       [getattr(structure, name) for name in STRUCTURE_VALUES]))
+    for obj in workspace.objects():
+        values.append((obj, OBJECT_VALUES,
+                       [getattr(obj, name) for name in OBJECT_VALUES]))
+    return values
+
+def restore(values):
+    """Put back the values recorded by snapshot."""
+    for item, names, recorded in values:
+        for name, value in zip(names, recorded):
+            setattr(item, name, value)
+
+def deviation(expected, actual):
+    """Return the largest difference between two snapshots for each value.
+    Raw importance is a sum over descriptions, so its difference is divided
+    by the number of descriptions."""
+    largest = dict.fromkeys(WORKSPACE_VALUES + STRUCTURE_VALUES +
+                            OBJECT_VALUES, 0)
+    for (item1, names, values1), (item2, _, values2) in zip(expected, actual):
+        assert item1 is item2
+        for name, value1, value2 in zip(names, values1, values2):
+            difference = abs(value1 - value2)
+            if name == 'raw_importance':
+                difference /= max(1, len(item1.descriptions))
+            largest[name] = max(largest[name], difference)
+    return largest
+
+def recomputed_probability(temperature, probability):
+    """Return the temperature adjusted probability, computed from scratch."""
+    if probability == 0:
+        return 0
+    elif probability <= .5:
+        prob_factor = max(1, int(abs(math.log(probability, 10))))
+        value1 = (10 - math.sqrt(100 - temperature)) / 100.0
+        value2 = 10 ** -(prob_factor - 1) - probability
+        return min(.5, probability + value1 * value2)
+    value1 = 1 - probability
+    value2 = (10 - math.sqrt(100 - temperature)) / 100.0
+    value3 = 1 - (1 - probability)
+    return max(.5, 1 - value1 + (value2 * value3))
+
+def recomputed_values(temperature, values):
+    """Return the temperature adjusted values, computed from scratch."""
+    exponent = ((100 - temperature) / 30.0) + .5
+    return [round(val ** exponent) for val in values]
+
+def parity_run(initial, modified, target, seed, steps):
+    """Run a problem, checking every incremental update against a full
+    recompute from the same state. Return the deviation at each update and
+    whether both left the random number generator in the same state."""
+    run = Run(initial, modified, target, seed)
+    workspace = run.workspace
+    incremental = workspace.update_changed_values
+    deviations = []
+    same_draws = []
+
+    def checked_update():
+        before = snapshot(workspace)
+        state = random.getstate()
+        workspace.update_all_values()
+        full = snapshot(workspace)
+        full_state = random.getstate()
+
+        restore(before)
+        random.setstate(state)
+        incremental()
+        deviations.append(deviation(full, snapshot(workspace)))
+        same_draws.append(random.getstate() == full_state)
+
+    workspace.update_changed_values = checked_update
+    while not workspace.answer_string and run.coderack.time < steps:
+        run.step()
+    return deviations, same_draws
+
+class TestUpdateParity(unittest.TestCase):
+    """The incremental update must agree with a full recompute."""
+
+    def test_matches_full_recompute(self):
+        for initial, modified, target, seed in [
+                ('abc', 'abd', 'ijk', 1), ('abc', 'abd', 'ijkkllmmnnoo', 2),
+                ('abc', 'abd', 'mrrjjjkkkk', 3),
+                ('abc', 'abd', 'abcdefghijklmnop', 4),
+                ('abcdefghijklmnopqrst', 'abcdefghijklmnopqrsu',
+                 'ijklmnopqrstuvwxyabc', 1)]:
+            deviations, same_draws = parity_run(initial, modified, target,
+                                                seed, 3000)
+            self.assertTrue(len(deviations) > 5)
+            for largest in deviations:
+                self.assertEqual(max(largest.values()), 0)
+            self.assertTrue(all(same_draws))
+
+class TestUnhappinessSums(unittest.TestCase):
+    """The running unhappiness sums must match a sum over all objects."""
+
+    def test_sums_match_objects(self):
+        for target, seed in [('ijk', 5), ('ijkkllmmnnoo', 6), ('mrrjjjkkkk', 7)]:
+            run = Run('abc', 'abd', target, seed)
+            workspace = run.workspace
+            while not workspace.answer_string and run.coderack.time < 3000:
+                run.step()
+                objects = workspace.objects()
+                for name in ['intra_string_unhappiness',
+                             'inter_string_unhappiness', 'total_unhappiness']:
+                    expected = sum([obj.relative_importance * getattr(obj, name)
+                                    for obj in objects])
+                    self.assertEqual(getattr(workspace, name)(),
+                                     min(100, expected / 200.0))
+
+class TestTemperatureAdjustment(unittest.TestCase):
+    """Cached temperature factors must give exactly the recomputed values."""
+
+    def test_matches_recomputation(self):
+        workspace = Run('abc', 'abd', 'ijk', 1).workspace
+        probabilities = [0, 1e-6, .001, .0099, .01, .0100999, .0101,
+                         .0101001, .0999, .1, .25, .5, .5001, .75, .99, 1]
+        probabilities += [i / 200.0 for i in range(201)]
+        probabilities += [10 ** -(i / 20.0) for i in range(100)]
+        values = list(range(101)) + [.5, 12.25, 99.9]
+        temperatures = [t / 4.0 for t in range(401)] + [100, 0, 37, 37]
+        random.seed(1)
+        temperatures += [random.uniform(0, 100) for _ in range(100)]
+        for temperature in temperatures:
+            workspace.temperature = temperature
+            self.assertEqual(
+                workspace.temperature_adjusted_probabilities(probabilities),
+                [recomputed_probability(temperature, probability)
+                 for probability in probabilities])
+            self.assertEqual(workspace.temperature_adjusted_values(values),
+                             recomputed_values(temperature, values))
+
+def scanned_new_structures(workspace):
+    """Return the structures that are not snag structures, checking every
+    structure on the workspace."""
+    return [structure for structure in workspace.structures()
+            if not isinstance(structure, Bond) and
+            not workspace.is_structure_in_snag_structures(structure)]
+
+class TestSnag(unittest.TestCase):
+    """xyz snags, because z has no successor, and must recover from it."""
+
+    def test_snags_are_answered(self):
+        snags = 0
+        for seed in [3, 4, 12, 15, 16]:
+            run = Run('abc', 'abd', 'xyz', seed)
+            workspace = run.workspace
+            while not workspace.answer_string and run.coderack.time < 3000:
+                run.step()
+                if workspace.snag_condition:
+                    new_structures = [
+                        structure for structure
+                        in workspace.built_since_snag
+                        if workspace.is_structure_built(structure) and
+                        not workspace.is_structure_in_snag_structures(
+                            structure)]
+                    self.assertEqual(
+                        sorted(map(id, new_structures)),
+                        sorted(map(id, scanned_new_structures(workspace))))
+            self.assertIsNotNone(workspace.answer_string)
+            snags += workspace.snag_count
+        self.assertGreater(snags, 0)
+
+    def test_collects_only_during_snag(self):
+        run = Run('abc', 'abd', 'xyz', 4)
+        workspace = run.workspace
+        while not workspace.snag_count:
+            run.step()
+            if not workspace.snag_condition:
+                self.assertEqual(workspace.built_since_snag, [])
+
+    def test_restored_during_snag(self):
+        run = Run('abc', 'abd', 'xyz', 10)
+        workspace = run.workspace
+        while not (workspace.snag_condition and workspace.built_since_snag):
+            run.step()
+        snapshot = run.checkpoint()
+        while not workspace.answer_string and run.coderack.time < 3000:
+            run.step()
+        restored = Run.restore(snapshot)
+        while not restored.workspace.answer_string and \
+                restored.coderack.time < 3000:
+            restored.step()
+        self.assertEqual(restored.coderack.time, run.coderack.time)
+        self.assertEqual(restored.workspace.snag_count, workspace.snag_count)
+        self.assertEqual(restored.workspace.temperature, workspace.temperature)
+        self.assertEqual(bool(restored.workspace.answer_string),
+                         bool(workspace.answer_string))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+"""Benchmark of adjacency queries on a pyseqsee arena.
+
+Builds an arena with thousands of elements, merges pairwise groups and groups of pairs into it,
+and times GetObjectToRight and GetObjectToLeft.
+
+Run from the seqsee-amahabal directory::
+
+  python benchmarks/arena_adjacency.py --num_elements 4000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from farg.apps.pyseqsee.arena import PSArena
+from farg.apps.pyseqsee.utils import PSObjectFromStructure
+
+
+def BuildArena(num_elements):
+  """Returns an arena with num_elements elements, groups of two and groups of two pairs."""
+  arena = PSArena(magnitudes=range(num_elements))
+  for start in range(0, num_elements - 1, 2):
+    gp = PSObjectFromStructure((start, start + 1))
+    gp.SetSpanStart(start)
+    arena.MergeObject(gp)
+  for start in range(0, num_elements - 3, 4):
+    gp = PSObjectFromStructure(((start, start + 1), (start + 2, start + 3)))
+    gp.SetSpanStart(start)
+    arena.MergeObject(gp)
+  return arena
+
+
+def Timed(label, fn, repeat):
+  start = time.perf_counter()
+  for _ in range(repeat):
+    fn()
+  elapsed = time.perf_counter() - start
+  print('%-20s %10.1f us/call' % (label, 1e6 * elapsed / repeat))
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+  parser.add_argument('--num_elements', type=int, default=2000)
+  parser.add_argument('--repeat', type=int, default=2000)
+  args = parser.parse_args()
+
+  start = time.perf_counter()
+  arena = BuildArena(args.num_elements)
+  print('Built arena with %d spans over %d elements in %.3f s' % (
+      len(arena._objects_with_span), args.num_elements, time.perf_counter() - start))
+
+  mid = arena.element[args.num_elements // 2 - 1]
+  Timed('GetObjectToRight', lambda: arena.GetObjectToRight(mid), args.repeat)
+  Timed('GetObjectToLeft', lambda: arena.GetObjectToLeft(mid), args.repeat)
+
+
+if __name__ == '__main__':
+  main()
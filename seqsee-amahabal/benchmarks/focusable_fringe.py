@@ -0,0 +1,98 @@
+"""Measures the cost of PSStream.FocusOn with and without the fringe cache of PSFocusable.
+
+Fills an arena with groups of ascending groups, describes each object with several
+attribute-rich categories, then focuses repeatedly on randomly chosen objects, once with
+PSFocusable.use_fringe_cache on and once with it off. Each configuration is timed a few times and
+the best time is reported.
+
+Run from the seqsee-amahabal directory::
+
+  python benchmarks/focusable_fringe.py --steps 5000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from farg.apps.pyseqsee.categorization.categories import (BasicSuccessorCategory,
+                                                          CategoryAnyObject, MultiPartCategory)
+from farg.apps.pyseqsee.controller import PSController
+from farg.apps.pyseqsee.focusable import PSFocusable
+from farg.apps.pyseqsee.utils import PSObjectFromStructure
+
+
+def BuildFoci(controller, num_groups, group_length):
+  """Adds num_groups groups, each made of group_length ascending groups, to the workspace.
+
+  Returns the outer groups and their parts.
+  """
+  arena = controller.workspace.arena
+  multipart = MultiPartCategory(parts_count=group_length,
+                                part_categories=(CategoryAnyObject(),) * group_length)
+  foci = []
+  start = 0
+  for _ in range(num_groups):
+    structure = []
+    for _ in range(group_length):
+      structure.append(tuple(range(start, start + group_length)))
+      start += group_length
+    gp = PSObjectFromStructure(tuple(structure))
+    gp.SetSpanStart(0 if not foci else foci[-1].Span()[1] + 1)
+    gp = arena.MergeObject(gp)
+    gp.DescribeAs(multipart)
+    gp.DescribeAs(CategoryAnyObject())
+    foci.append(gp)
+    for part in gp.items:
+      part.DescribeAs(BasicSuccessorCategory())
+      part.DescribeAs(CategoryAnyObject())
+      foci.append(part)
+  return foci
+
+
+def TimeFocusing(controller, foci, steps, seed):
+  rng = random.Random(seed)
+  stream = controller.stream
+  start = time.perf_counter()
+  for step in range(steps):
+    controller.steps_taken = step
+    stream.FocusOn(rng.choice(foci), controller=controller)
+  return time.perf_counter() - start
+
+
+def TimeGetFringe(foci, rounds):
+  start = time.perf_counter()
+  for _ in range(rounds):
+    for focusable in foci:
+      focusable.GetFringe()
+  return (time.perf_counter() - start) / (rounds * len(foci))
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+  parser.add_argument('--steps', type=int, default=5000)
+  parser.add_argument('--num_groups', type=int, default=40)
+  parser.add_argument('--group_length', type=int, default=5)
+  parser.add_argument('--repeat', type=int, default=3)
+  parser.add_argument('--seed', type=int, default=0)
+  args = parser.parse_args()
+
+  for use_cache in (False, True):
+    PSFocusable.use_fringe_cache = use_cache
+    best = best_fringe = None
+    for _ in range(args.repeat):
+      controller = PSController(get_input_from_flags=False)
+      foci = BuildFoci(controller, args.num_groups, args.group_length)
+      elapsed = TimeFocusing(controller, foci, args.steps, args.seed)
+      best = elapsed if best is None else min(best, elapsed)
+      per_fringe = TimeGetFringe(foci, rounds=20)
+      best_fringe = per_fringe if best_fringe is None else min(best_fringe, per_fringe)
+    print('use_fringe_cache=%-5s %d steps in %.2f s (%.1f us/FocusOn, %.1f us/GetFringe)' % (
+        use_cache, args.steps, best, 1e6 * best / args.steps, 1e6 * best_fringe))
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,67 @@
+"""Benchmark of PSStream.FocusOn over a long run.
+
+Focuses, once per step, on a focusable drawn from a pool whose fringes overlap heavily: nearby
+positions share fringe elements, and a category-like element is shared by half the pool. This is
+the case the fringe index has to handle well.
+
+Run from the seqsee-amahabal directory::
+
+  python benchmarks/stream_focus.py --steps 20000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from farg.apps.pyseqsee.controller import PSController
+from farg.apps.pyseqsee.focusable import PSFocusable
+from farg.apps.pyseqsee.objects import PlatonicObject
+
+
+class PositionFocusable(PSFocusable):
+
+  def __init__(self, x):
+    self.x = x
+    PSFocusable.__init__(self)
+
+  def BriefLabel(self):
+    return 'Position %d' % self.x
+
+  def GetLTMStorableContent(self):
+    return PlatonicObject(rep=str(self.x))
+
+  def CalculateFringe(self):
+    return {self.x: 1.0, (self.x + 1): 0.5, (self.x - 1): 0.5, ('parity', self.x % 2): 0.3}
+
+  def CalculateActions(self, controller):
+    return []
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+  parser.add_argument('--steps', type=int, default=20000)
+  parser.add_argument('--pool_size', type=int, default=500)
+  parser.add_argument('--seed', type=int, default=0)
+  args = parser.parse_args()
+
+  rng = random.Random(args.seed)
+  controller = PSController(get_input_from_flags=False)
+  stream = controller.stream
+  pool = [PositionFocusable(x) for x in range(args.pool_size)]
+
+  start = time.perf_counter()
+  for step in range(args.steps):
+    controller.steps_taken = step
+    stream.FocusOn(rng.choice(pool), controller=controller)
+    if step % 20 == 0:
+      stream.GetRecentFoci()
+  elapsed = time.perf_counter() - start
+  print('%d steps in %.2f s (%.1f us/step)' % (args.steps, elapsed, 1e6 * elapsed / args.steps))
+
+
+if __name__ == '__main__':
+  main()
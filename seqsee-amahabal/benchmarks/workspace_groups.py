@@ -0,0 +1,67 @@
+"""Benchmark of span-based group queries in the Seqsee workspace.
+
+Builds a long sequence covered by a hierarchy of groups (pairs, then pairs of pairs) and times
+the queries that codelets issue most: group insertion (which checks for conflicts), GetItemAt,
+GetSuperGroups and GetConflictingGroups.
+
+Run from the seqsee-amahabal directory::
+
+  python benchmarks/workspace_groups.py --num_elements 1024
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from farg.apps.seqsee.anchored import SAnchored
+from farg.apps.seqsee.workspace import Workspace
+
+
+def BuildWorkspace(num_elements, depth):
+  """Returns a workspace with num_elements elements and `depth` levels of pairwise groups."""
+  ws = Workspace()
+  ws.InsertElements(range(num_elements))
+  level = list(ws.elements)
+  for _ in range(depth):
+    next_level = []
+    for idx in range(0, len(level) - 1, 2):
+      next_level.append(ws.InsertGroup(SAnchored.Create((level[idx], level[idx + 1]))))
+    level = next_level
+  return ws
+
+
+def Timed(label, fn, repeat):
+  start = time.perf_counter()
+  for _ in range(repeat):
+    fn()
+  elapsed = time.perf_counter() - start
+  print('%-28s %10.1f us/call' % (label, 1e6 * elapsed / repeat))
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+  parser.add_argument('--num_elements', type=int, default=512)
+  parser.add_argument('--depth', type=int, default=4)
+  parser.add_argument('--repeat', type=int, default=200)
+  args = parser.parse_args()
+
+  start = time.perf_counter()
+  ws = BuildWorkspace(args.num_elements, args.depth)
+  print('Built %d groups over %d elements in %.3f s' % (
+      len(ws.groups), args.num_elements, time.perf_counter() - start))
+
+  mid = args.num_elements // 2
+  conflicting = SAnchored.Create(ws.elements[mid + 1:mid + 4])
+  Timed('GetItemAt', lambda: ws.GetItemAt(mid, mid + 1), args.repeat)
+  Timed('GetSuperGroups', lambda: tuple(ws.GetSuperGroups(ws.elements[mid])), args.repeat)
+  Timed('SomeMaximalSuperGroup', lambda: ws.SomeMaximalSuperGroup(ws.elements[mid]),
+        args.repeat)
+  Timed('GetConflictingGroups', lambda: tuple(ws.GetConflictingGroups(conflicting)),
+        args.repeat)
+
+
+if __name__ == '__main__':
+  main()
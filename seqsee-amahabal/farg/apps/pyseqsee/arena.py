@@ -58,6 +58,11 @@ class PSArena(object):
     #: group. Given a span and a structure, however, the object is unique, and this is how things
     #: are stored, keyed by the structure.
     self._objects_with_span = defaultdict(dict)
+    #: Adjacency indexes: maps a start (resp. end) position to the spans with objects starting
+    #: (resp. ending) there. Values are dicts from span to the same structure->object dict held in
+    #: _objects_with_span, used as insertion-ordered sets.
+    self._spans_starting_at = defaultdict(dict)
+    self._spans_ending_at = defaultdict(dict)
     self.Append(magnitudes=magnitudes)
 
   def Size(self):
@@ -69,7 +74,7 @@ class PSArena(object):
     to_add = [PSElement(magnitude=x, log_msg=log_msg) for x in magnitudes]
     for idx, el in enumerate(to_add, self._next_index):
       el._span = (idx, idx)
-      self._objects_with_span[(idx, idx)][el.Structure()] = el
+      self._AddObjectAtSpan((idx, idx), el.Structure(), el)
     self.element.extend(to_add)
     self._next_index += len(magnitudes)
     History.Note("Arena: elements added", times=len(magnitudes))
@@ -94,6 +99,13 @@ class PSArena(object):
     """Given a span, returns a dict mapping structure to objects."""
     return self._objects_with_span[span]
 
+  def _AddObjectAtSpan(self, span, structure, obj):
+    """Stores obj at span, keeping the adjacency indexes up to date."""
+    objects_at_span = self._objects_with_span[span]
+    objects_at_span[structure] = obj
+    self._spans_starting_at[span[0]][span] = objects_at_span
+    self._spans_ending_at[span[1]][span] = objects_at_span
+
   def _MergeObjectDetails(self, other_obj, obj_in_arena):
     obj_in_arena.MergeCategoriesFrom(other_obj)
 
@@ -125,7 +137,7 @@ class PSArena(object):
     else:
       obj_in_arena = PSGroup(
           items=parts, log_msg="Created when merging", parents=[obj])
-      self._objects_with_span[span][obj_structure] = obj_in_arena
+      self._AddObjectAtSpan(span, obj_structure, obj_in_arena)
       obj_in_arena.InferSpans()
     self._MergeObjectDetails(obj, obj_in_arena)
     merge_map[obj] = obj_in_arena
@@ -156,13 +168,30 @@ class PSArena(object):
   def SelectRandomElement(self):
     return UnweightedChoice(self.element)
 
+  def GetObjectsToRight(self, item):
+    """Returns all objects starting just past where item ends."""
+    spans = self._spans_starting_at.get(item.Span()[1] + 1)
+    if not spans:
+      return []
+    return [obj for objects_by_structure in spans.values()
+            for obj in objects_by_structure.values()]
+
+  def GetObjectsToLeft(self, item):
+    """Returns all objects ending just before where item starts."""
+    spans = self._spans_ending_at.get(item.Span()[0] - 1)
+    if not spans:
+      return []
+    return [obj for objects_by_structure in spans.values()
+            for obj in objects_by_structure.values()]
+
   def GetObjectToRight(self, item):
-    left_end_of_sought_object = item.Span()[1] + 1
-    matching_objects = []
-    for span, objects_by_structure in self._objects_with_span.items():
-      if span[0] != left_end_of_sought_object:
-        continue
-      matching_objects.extend(objects_by_structure.values())
+    matching_objects = self.GetObjectsToRight(item)
+    if not matching_objects:
+      return None
+    return UnweightedChoice(matching_objects)
+
+  def GetObjectToLeft(self, item):
+    matching_objects = self.GetObjectsToLeft(item)
     if not matching_objects:
       return None
     return UnweightedChoice(matching_objects)
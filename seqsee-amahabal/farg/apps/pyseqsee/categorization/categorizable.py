@@ -3,6 +3,15 @@ class Categorizable(object):
   def __init__(self):
     #: Map from categories to the logic describing how this is an instance.
     self.categories = dict()
+    #: Bumped whenever a category is added or a logic merged into. Together with the versions of
+    #: the logics themselves (which may be shared with other items), lets dependents such as the
+    #: fringe know when to recompute.
+    self._categories_version = 0
+
+  def CategorizationStamp(self):
+    """Returns a value that changes whenever categories or their attributes are added."""
+    return (self._categories_version,
+            sum(logic._version for logic in self.categories.values()))
 
   def IsKnownAsInstanceOf(self, category):
     """True if known to be an instance of category."""
@@ -23,6 +32,7 @@ class Categorizable(object):
     logic = category.IsInstance(self)
     if logic:
       self.categories[category] = logic
+      self._categories_version += 1
       return logic
     return None
 
@@ -32,6 +42,7 @@ class Categorizable(object):
         self.categories[cat].MergeLogic(logic)
       else:
         self.categories[cat] = logic
+    self._categories_version += 1
 
   def CategoriesSharedWith(self, other):
     return set(self.categories.keys()).intersection(other.categories.keys())
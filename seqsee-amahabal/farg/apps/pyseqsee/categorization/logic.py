@@ -253,6 +253,10 @@ class PSCategory(LTMNodeContent):
   def TurnOffAttribute(self, attribute):
     self._TurnedOffAttributes.add(attribute)
 
+  def SuggestActions(self, *, instance, logic, controller):
+    """Actions suggested when an instance of this category is focused on. None by default."""
+    return []
+
   def IsInstance(self, item):
     eval_dict = dict()
     # Set values of all variables to None.
@@ -316,6 +320,8 @@ class InstanceLogic(object):
 
   def __init__(self, *, attributes=dict()):
     self._attributes = attributes
+    #: Bumped when attributes are added by MergeLogic.
+    self._version = 0
 
   def Attributes(self):
     return self._attributes
@@ -350,3 +356,4 @@ class InstanceLogic(object):
         self._attributes[k].MergeCategoriesFrom(v)
       else:
         self._attributes[k] = v
+        self._version += 1
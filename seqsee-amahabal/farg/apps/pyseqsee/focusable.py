@@ -3,18 +3,37 @@ from farg.core.history import History
 
 
 class PSFocusable(Categorizable):
+  #: If true, the part of the fringe coming from categories is cached, and recalculated only when
+  #: categories or attributes are added (as tracked by CategorizationStamp).
+  use_fringe_cache = True
 
   def __init__(self):
     self.stored_fringe = None
+    #: Fringe elements contributed by categories, and the categorization stamp they are valid for.
+    self._category_fringe = None
+    self._category_fringe_stamp = None
     History.Note("Focusable created")
     Categorizable.__init__(self)
 
-  def GetFringe(self):
-    fringe = self.CalculateFringe()
+  def _CalculateCategoryFringe(self):
+    fringe = dict()
     for cat, instance_logic in self.categories.items():
       fringe[cat] = 1
       for att, val in instance_logic._attributes.items():
         fringe[(cat, att, val.Structure())] = 0.5
+    return fringe
+
+  def GetFringe(self):
+    fringe = self.CalculateFringe()
+    if self.use_fringe_cache:
+      stamp = self.CategorizationStamp()
+      if stamp != self._category_fringe_stamp:
+        self._category_fringe = self._CalculateCategoryFringe()
+        self._category_fringe_stamp = stamp
+        History.Note("GetFringe: category fringe recalculated")
+      fringe.update(self._category_fringe)
+    else:
+      fringe.update(self._CalculateCategoryFringe())
     self.stored_fringe = fringe
     History.Note("GetFringe called")
     return fringe
@@ -1,4 +1,5 @@
 from _collections import defaultdict
+import math
 
 from farg.apps.pyseqsee.categorization.categorizable import Categorizable
 from farg.apps.pyseqsee.workspace import PSWorkspace
@@ -12,23 +13,45 @@ class PSStream(object):
 
   def __init__(self, controller):
     self.controller = controller
+    #: Posting lists: maps a fringe element to a dict from focusable to weight. Each dict is kept
+    #: in order of last focus time (oldest first), so that recent items can be read off its end.
     self.fringe_element_to_item_to_wt = defaultdict(lambda: defaultdict(float))
+    #: Maps focusable to the time it was last focused on, also kept ordered by that time.
     self.last_focus_time = dict()
+    #: Maps a focusable to all fringe elements whose posting lists contain it.
+    self._fringe_elements_of_item = defaultdict(set)
+    #: Largest absolute weight stored in any posting list; bounds possible overlap scores.
+    self._max_fringe_weight = 0
 
   def GetRecentFoci(self):
-    sorted_by_time = sorted(
-        self.last_focus_time.items(), reverse=True, key=(lambda x: x[1]))
-    return sorted_by_time[:10]
+    """Returns the (up to) 10 most recent foci, with focus times, most recent first."""
+    recent = []
+    for item_and_time in reversed(self.last_focus_time.items()):
+      recent.append(item_and_time)
+      if len(recent) == 10:
+        break
+    return recent
 
-  def FocusOn(self, focusable, controller):
-    fringe = focusable.GetFringe()
+  def _StoreFringe(self, focusable, fringe, timestamp):
+    """Stores fringe in the posting lists and moves focusable to their recent end."""
     # TODO(amahabal) This way, anything that was ever a fringe element of an item stays that way.
     # But this way is much cheaper than updating everything, and not super wrong...
     # When we choose an object based on fringe overlap, we can recalculate, if we wish...
-    for fe, wt in fringe.items():
-      self.fringe_element_to_item_to_wt[fe][focusable] = wt
-    timestamp = controller.steps_taken
+    fringe_elements = self._fringe_elements_of_item[focusable]
+    fringe_elements.update(fringe)
+    for fe in fringe_elements:
+      item_to_wt = self.fringe_element_to_item_to_wt[fe]
+      old_wt = item_to_wt.pop(focusable, 0)
+      wt = fringe[fe] if fe in fringe else old_wt
+      item_to_wt[focusable] = wt
+      self._max_fringe_weight = max(self._max_fringe_weight, abs(wt))
+    self.last_focus_time.pop(focusable, None)
     self.last_focus_time[focusable] = timestamp
+
+  def FocusOn(self, focusable, controller):
+    fringe = focusable.GetFringe()
+    timestamp = controller.steps_taken
+    self._StoreFringe(focusable, fringe, timestamp)
     controller.ltm.GetNode(content=focusable).IncreaseActivation(
         5, current_time=controller.steps_taken)
     actions = focusable.GetActions(controller)
@@ -55,11 +78,37 @@ class PSStream(object):
                                  timestamp,
                                  threshold=0.2,
                                  decay_factor=0.97):
-    """Gets prior items with overlapping fringe."""
+    """Gets prior items with overlapping fringe.
+
+    No item can score more than the bound computed below, so items old enough that even the
+    bound decays below threshold are skipped. Posting lists are ordered by focus time, and each
+    is read from its recent end only until such an item is met.
+    """
+    fringe = current_focus.stored_fringe
+    bound = self._max_fringe_weight * sum(abs(wt) for wt in fringe.values())
+    # Leave room for rounding: the bound must never fall below an actual score.
+    bound *= 1 + 1e-9
+    if bound < threshold:
+      return []
+    if threshold <= 0 or bound <= 0:
+      # Even the oldest item can reach a threshold that is not positive.
+      max_age = math.inf
+    elif decay_factor == 0:
+      max_age = 0
+    elif abs(decay_factor) >= 1:
+      max_age = math.inf
+    else:
+      max_age = math.floor(
+          math.log(threshold / bound) / math.log(abs(decay_factor))) + 1
+
     scores = defaultdict(float)
-    for fe, wt in current_focus.stored_fringe.items():
-      for other_focusable, other_wt in self.fringe_element_to_item_to_wt[
-          fe].items():
+    for fe, wt in fringe.items():
+      item_to_wt = self.fringe_element_to_item_to_wt.get(fe)
+      if not item_to_wt:
+        continue
+      for other_focusable, other_wt in reversed(item_to_wt.items()):
+        if timestamp - self.last_focus_time[other_focusable] > max_age:
+          break
         if other_focusable is not current_focus:
           scores[other_focusable] += other_wt * wt
     out = []
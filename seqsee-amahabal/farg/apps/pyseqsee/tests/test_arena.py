@@ -109,3 +109,33 @@ class TestPSArena(unittest.TestCase):
     self.assertTrue(logic.Attributes()['half'].IsKnownAsInstanceOf(CategoryEvenInteger()))
 
     self.assertTrue(merged.DescribeAs(BasicSuccessorCategory()).Attributes()['end'].IsKnownAsInstanceOf(CategoryEvenInteger()))
+
+  def test_adjacent_objects(self):
+    arena = PSArena(magnitudes=range(10))
+    self.assertEqual([arena.element[4]], arena.GetObjectsToRight(arena.element[3]))
+    self.assertEqual([arena.element[2]], arena.GetObjectsToLeft(arena.element[3]))
+    self.assertEqual([], arena.GetObjectsToRight(arena.element[9]))
+    self.assertEqual([], arena.GetObjectsToLeft(arena.element[0]))
+    self.assertIsNone(arena.GetObjectToRight(arena.element[9]))
+
+    gp_45 = PSObjectFromStructure((4, 5))
+    gp_45.SetSpanStart(4)
+    gp_45 = arena.MergeObject(gp_45)
+    gp_4_56 = PSObjectFromStructure((4, (5, 6)))
+    gp_4_56.SetSpanStart(4)
+    gp_4_56 = arena.MergeObject(gp_4_56)
+    self.assertEqual([arena.element[4], gp_45, gp_4_56],
+                     arena.GetObjectsToRight(arena.element[3]))
+    self.assertEqual([arena.element[6]], arena.GetObjectsToRight(gp_45))
+    self.assertEqual([arena.element[7]], arena.GetObjectsToRight(gp_4_56))
+    self.assertEqual(set([arena.element[6], gp_4_56, gp_4_56.items[1]]),
+                     set(arena.GetObjectsToLeft(arena.element[7])))
+    self.assertIn(arena.GetObjectToLeft(arena.element[6]),
+                  (arena.element[5], gp_45))
+
+    # Elements appended while merging are indexed too.
+    gp_9_10 = PSObjectFromStructure((9, 10))
+    gp_9_10.SetSpanStart(9)
+    gp_9_10 = arena.MergeObject(gp_9_10)
+    self.assertEqual([arena.element[10]], arena.GetObjectsToRight(arena.element[9]))
+    self.assertEqual([arena.element[8]], arena.GetObjectsToLeft(gp_9_10))
@@ -1,12 +1,15 @@
+import random
 import unittest
 
 from farg.apps.pyseqsee.categorization.categorizable import Categorizable
-from farg.apps.pyseqsee.categorization.logic import PSCategory
+from farg.apps.pyseqsee.categorization.categories import BasicSuccessorCategory
+from farg.apps.pyseqsee.categorization.logic import InstanceLogic, PSCategory
 from farg.apps.pyseqsee.controller import PSController
 from farg.apps.pyseqsee.focusable import PSFocusable
 from farg.apps.pyseqsee.objects import PSElement, PlatonicObject
 from farg.apps.pyseqsee.stream import PSStream
 from farg.apps.pyseqsee.tests.utils import FringeTest
+from farg.apps.pyseqsee.utils import PSObjectFromStructure
 from farg.apps.pyseqsee.ui import PySeqseeBatchUI
 from farg.core.codelet import CodeletFamily, Codelet
 
@@ -49,6 +52,33 @@ class TestFocusable(unittest.TestCase):
                                 1), (FakeAttributeRichCategory(), 'att_2', 2), (
                                     FakeAttributeRichCategory(), 'att_3', 3)))
 
+  def test_fringe_cache(self):
+
+    def UncachedFringe(item):
+      fringe = item.CalculateFringe()
+      fringe.update(item._CalculateCategoryFringe())
+      return fringe
+
+    gp = PSObjectFromStructure((7, 8))
+    self.assertEqual(UncachedFringe(gp), gp.GetFringe())
+    self.assertNotIn(BasicSuccessorCategory(), gp.GetFringe())
+
+    # Adding a category invalidates the cache.
+    gp.DescribeAs(BasicSuccessorCategory())
+    self.assertIn(BasicSuccessorCategory(), gp.GetFringe())
+    self.assertEqual(UncachedFringe(gp), gp.GetFringe())
+
+    # Merging in categories from another object shares its logic. Attributes later added to that
+    # logic show up in both fringes.
+    other = PSObjectFromStructure((7, 8))
+    other.MergeCategoriesFrom(gp)
+    self.assertEqual(UncachedFringe(other), other.GetFringe())
+    extra_logic = InstanceLogic(attributes=dict(extra=PSObjectFromStructure(3)))
+    gp.categories[BasicSuccessorCategory()].MergeLogic(extra_logic)
+    self.assertIn((BasicSuccessorCategory(), 'extra', 3), gp.GetFringe())
+    self.assertIn((BasicSuccessorCategory(), 'extra', 3), other.GetFringe())
+    self.assertEqual(UncachedFringe(other), other.GetFringe())
+
 
 class TestStream(unittest.TestCase):
 
@@ -103,3 +133,89 @@ class TestStream(unittest.TestCase):
     self.assertEqual(2, coderack.CodeletCount())
     stream.FocusOn(F1(4), controller=controller)
     self.assertEqual(4, coderack.CodeletCount())
+
+  def test_prior_foci_match_full_scan(self):
+    """Pruned posting lists give the same answers as scoring every prior focus."""
+
+    class Focus(object):
+
+      def __init__(self, name):
+        self.name = name
+        self.stored_fringe = None
+
+    def ScannedPriorFoci(stream, all_fringes, current_focus, timestamp, threshold,
+                         decay_factor):
+      out = []
+      for other, other_fringe in all_fringes.items():
+        if other is current_focus:
+          continue
+        if not any(fe in other_fringe for fe in current_focus.stored_fringe):
+          continue
+        score = sum(
+            wt * other_fringe[fe]
+            for fe, wt in current_focus.stored_fringe.items()
+            if fe in other_fringe)
+        score *= decay_factor**(timestamp - stream.last_focus_time[other])
+        if score >= threshold:
+          out.append((other, score))
+      return sorted(out, reverse=True, key=lambda x: x[1])
+
+    rng = random.Random(42)
+    stream = PSStream(controller=None)
+    foci = [Focus(x) for x in range(40)]
+    all_fringes = dict()
+    for timestamp in range(600):
+      focus = rng.choice(foci)
+      fringe = dict(
+          (rng.randrange(30), rng.choice((0.3, 0.5, 1.0))) for _ in range(4))
+      focus.stored_fringe = fringe
+      # Stale fringe elements stay with the item, at their old weight.
+      all_fringes.setdefault(focus, dict()).update(fringe)
+      stream._StoreFringe(focus, fringe, timestamp)
+      for threshold, decay_factor in ((0.2, 0.97), (0.5, 0.9), (0.1, 1.0),
+                                      (0.0, 0.97), (-0.1, 0.9), (0.2, 0.0),
+                                      (0.2, -0.9)):
+        expected = ScannedPriorFoci(stream, all_fringes, focus, timestamp,
+                                    threshold, decay_factor)
+        got = stream.PriorFociWithSimilarFringe(
+            current_focus=focus,
+            timestamp=timestamp,
+            threshold=threshold,
+            decay_factor=decay_factor)
+        self.assertEqual(
+            sorted((x.name, round(y, 9)) for x, y in expected),
+            sorted((x.name, round(y, 9)) for x, y in got))
+
+    recent = stream.GetRecentFoci()
+    self.assertEqual(10, len(recent))
+    self.assertEqual(
+        sorted(stream.last_focus_time.items(), reverse=True,
+               key=lambda x: x[1])[:10], recent)
+
+  def test_prior_foci_without_positive_bound(self):
+    """An empty or zero-weight fringe, or a threshold that is not positive, still works."""
+
+    class Focus(object):
+
+      def __init__(self, name, fringe):
+        self.name = name
+        self.stored_fringe = fringe
+
+    stream = PSStream(controller=None)
+    old = Focus('old', {5: 1.0})
+    stream._StoreFringe(old, old.stored_fringe, 0)
+    empty = Focus('empty', dict())
+    zero = Focus('zero', {5: 0.0})
+    for threshold in (0.0, -0.5):
+      self.assertEqual([],
+                       stream.PriorFociWithSimilarFringe(
+                           current_focus=empty, timestamp=50, threshold=threshold))
+      self.assertEqual([(old, 0.0)],
+                       stream.PriorFociWithSimilarFringe(
+                           current_focus=zero, timestamp=50, threshold=threshold))
+    self.assertEqual([],
+                     stream.PriorFociWithSimilarFringe(
+                         current_focus=zero, timestamp=50, threshold=0.2))
+    got = stream.PriorFociWithSimilarFringe(
+        current_focus=Focus('new', {5: 1.0}), timestamp=200, threshold=0.0)
+    self.assertEqual([old], [focus for focus, _ in got])
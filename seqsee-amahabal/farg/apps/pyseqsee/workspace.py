@@ -20,3 +20,6 @@ class PSWorkspace(object):
 
   def GetObjectToRight(self, item):
     return self.arena.GetObjectToRight(item)
+
+  def GetObjectToLeft(self, item):
+    return self.arena.GetObjectToLeft(item)
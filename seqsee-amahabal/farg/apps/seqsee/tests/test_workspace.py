@@ -1,3 +1,4 @@
+import random
 import unittest
 
 from farg.apps.seqsee import mapping
@@ -8,6 +9,7 @@ from farg.apps.seqsee.mapping import NumericMapping, StructuralMapping
 from farg.apps.seqsee.sobject import SObject, SElement
 from farg.apps.seqsee.util import LessThan, LessThanEq, GreaterThan, GreaterThanEq, Exactly
 from farg.apps.seqsee.workspace import Workspace
+from farg.core.exceptions import FargError
 def helper_create_and_insert_group(ws, specification):
   """Utility for quickly creating groups.
 
@@ -195,3 +197,82 @@ class TestWorkspace(unittest.TestCase):
     # The original group still exists
     self.assertTrue(existing_group in ws.groups)
 
+  def test_span_index(self):
+    ws = Workspace()
+    ws.InsertElements(range(0, 10))
+    helper_create_and_insert_groups(ws, ((1, 2, 3), (4, 5, 6)), (7, 8))
+    self.assertEqual((1, 3), ws.GetItemAt(1, 3).Span())
+    self.assertEqual((1, 6), ws.GetItemAt(1, 6).Span())
+    self.assertEqual(ws.elements[4], ws.GetItemAt(4, 4))
+    self.assertRaises(FargError, ws.GetItemAt, 2, 3)
+    self.assertRaises(FargError, ws.GetItemAt, 10, 10)
+
+    # Exact lookups agree with the predicate-based scan.
+    def Scanned(left_fn, right_fn):
+      return set(x for x in ws.groups.union(ws.elements)
+                 if left_fn(x.start_pos) and right_fn(x.end_pos))
+    for left in range(-1, 11):
+      for right in range(-1, 11):
+        self.assertEqual(Scanned(Exactly(left), Exactly(right)),
+                         set(ws.GetGroupsWithSpan(Exactly(left), Exactly(right))))
+      self.assertEqual(Scanned(Exactly(left), GreaterThan(left)),
+                       set(ws.GetGroupsWithSpan(Exactly(left), GreaterThan(left))))
+      self.assertEqual(Scanned(LessThanEq(left), GreaterThanEq(left)),
+                       set(ws.GetGroupsWithSpan(LessThanEq(left), GreaterThanEq(left))))
+
+    # Deleting the top group removes it from the index and from the supergroup map.
+    top = ws.GetItemAt(1, 6)
+    ws.DeleteGroup(top)
+    self.assertRaises(FargError, ws.GetItemAt, 1, 6)
+    self.assertEqual(0, len(tuple(ws.GetSuperGroups(ws.GetItemAt(1, 3)))))
+    self.assertEqual(1, len(tuple(ws.GetSuperGroups(ws.elements[1]))))
+
+  def test_supergroup_map_randomized(self):
+    def RandomGroupAt(ws, rng, pos):
+      items = []
+      for _ in range(rng.choice((2, 3))):
+        if pos >= ws.num_elements:
+          return None
+        choices = list(ws.GetGroupsWithSpan(Exactly(pos), GreaterThanEq(pos)))
+        choices.sort(key=lambda x: x.end_pos)
+        items.append(rng.choice(choices))
+        pos = items[-1].end_pos + 1
+      return SAnchored.Create(items)
+
+    def RecomputedSupergroupMap(ws):
+      supergroup_map = {}
+      for group in ws.groups:
+        for part in group.items:
+          supergroup_map.setdefault(part, set()).add(group)
+      return supergroup_map
+
+    for seed in range(20):
+      rng = random.Random(seed)
+      ws = Workspace()
+      ws.check_invariants = True
+      ws.InsertElements(range(0, 30))
+      for _ in range(60):
+        top_groups = sorted((x for x in ws.groups if not tuple(ws.GetSuperGroups(x))),
+                            key=lambda x: x.Span())
+        action = rng.choice(('insert', 'insert', 'replace', 'delete'))
+        try:
+          if action == 'insert' or not top_groups:
+            new_group = RandomGroupAt(ws, rng, rng.randrange(ws.num_elements))
+            if new_group:
+              ws.InsertGroup(new_group)
+          elif action == 'replace':
+            original = rng.choice(top_groups)
+            extension = RandomGroupAt(ws, rng, original.end_pos + 1)
+            if extension:
+              ws.Replace(original, SAnchored.Create(list(original.items) + [extension.items[0]]))
+          else:
+            ws.DeleteGroup(rng.choice(top_groups))
+        except (ConflictingGroupException, CannotReplaceSubgroupException):
+          pass
+        self.assertEqual(RecomputedSupergroupMap(ws), dict(ws.CalculateSupergroupMap()))
+        for group in ws.groups:
+          maximal = ws.SomeMaximalSuperGroup(group)
+          self.assertIn(maximal, ws.groups)
+          self.assertFalse(tuple(ws.GetSuperGroups(maximal)))
+          self.assertLessEqual(maximal.start_pos, group.start_pos)
+          self.assertGreaterEqual(maximal.end_pos, group.end_pos)
@@ -16,7 +16,9 @@
 These include:
 
 * Comparator functions *LessThan*, *LessThanEq*, *GreaterThan*, *GreaterThanEq*, *Exactly*, each of
-  which takes a single argument and returns a one-argument function.
+  which takes a single argument and returns a one-argument function. The function returned by
+  *Exactly* also carries the value in its *exact_value* attribute, so that callers holding an
+  index (such as the workspace) can do a direct lookup instead of testing every candidate.
 """
 
 def LessThan(x):
@@ -37,4 +39,5 @@ def GreaterThanEq(x):
 
 def Exactly(x):
   def fn(y): return y == x
+  fn.exact_value = x
   return fn
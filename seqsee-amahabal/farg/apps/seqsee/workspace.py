@@ -33,9 +33,13 @@
    the consistency guarantee implies that adding the group may involve adding all its
    subgroups, and one of these may conflict with an existing group.
 
-   .. warning:
-
-      This is likely to be quite inefficient. Keep an eye open for how slow this actually is.
+   To keep span-based queries cheap on long sequences, the workspace maintains two indexes
+   alongside *groups*: an interval index from (start_pos, end_pos) to the group at that span,
+   and a map from each anchored object to the groups that contain it as a direct part. Both are
+   updated whenever a group is added or removed, so any code changing *groups* must go through
+   :meth:`Workspace._AddGroup` and :meth:`Workspace._RemoveGroup`. Setting
+   *Workspace.check_invariants* (as tests and debugging sessions may) verifies both indexes
+   against *groups* after each such change.
 """
 
 from collections import defaultdict
@@ -51,6 +55,10 @@ from farg.core.history import History, ObjectType, NoteCallsInHistory
 logger = logging.getLogger(__name__)
 
 class Workspace(object):
+  #: If true, the span index and supergroup map are checked against groups after every change.
+  #: This is slow, and meant for debugging.
+  check_invariants = False
+
   def __init__(self):
     #: All elements. Each is a :class:`~farg.apps.seqsee.sobject.SAnchored` object.
     self.elements = []
@@ -59,6 +67,57 @@ class Workspace(object):
     #: Groups (excluding single element groups).
     #: Each is a :class:`~farg.apps.seqsee.sobject.SAnchored` object.
     self.groups = set()
+    #: Interval index: maps start_pos to a dict from end_pos to the group with that span. There
+    #: can be at most one group at a span.
+    self._groups_by_span = defaultdict(dict)
+    #: Maps an anchored object to the set of groups that have it as a direct part.
+    self._supergroups = defaultdict(set)
+
+  def _AddGroup(self, gp):
+    """Adds gp to groups, keeping the indexes up to date."""
+    self.groups.add(gp)
+    self._groups_by_span[gp.start_pos][gp.end_pos] = gp
+    for part in gp.items:
+      self._supergroups[part].add(gp)
+    if self.check_invariants:
+      self.CheckInvariants()
+
+  def _RemoveGroup(self, gp):
+    """Removes gp from groups (if present), keeping the indexes up to date."""
+    if gp not in self.groups:
+      return
+    self.groups.discard(gp)
+    groups_starting_here = self._groups_by_span[gp.start_pos]
+    del groups_starting_here[gp.end_pos]
+    if not groups_starting_here:
+      del self._groups_by_span[gp.start_pos]
+    for part in gp.items:
+      supergroups = self._supergroups[part]
+      supergroups.discard(gp)
+      if not supergroups:
+        del self._supergroups[part]
+    if self.check_invariants:
+      self.CheckInvariants()
+
+  def CheckInvariants(self):
+    """Checks that the span index and the supergroup map agree with groups, recomputing both
+       from scratch. Raises FargError if they do not.
+    """
+    groups_by_span = {}
+    supergroups = defaultdict(set)
+    for group in self.groups:
+      if group.Span() in groups_by_span:
+        raise FargError("Two groups with span %s" % (group.Span(),))
+      groups_by_span[group.Span()] = group
+      for part in group.items:
+        supergroups[part].add(group)
+    indexed_spans = dict(((start_pos, end_pos), group)
+                         for start_pos, groups_starting_here in self._groups_by_span.items()
+                         for end_pos, group in groups_starting_here.items())
+    if indexed_spans != groups_by_span:
+      raise FargError("Span index out of sync with groups")
+    if dict(self._supergroups) != dict(supergroups):
+      raise FargError("Supergroup map out of sync with groups")
 
   @NoteCallsInHistory
   def InsertElement(self, element):
@@ -120,7 +179,7 @@ class Workspace(object):
       raise Exception("Delete group called on %s when supergroup (%s) present" %
                       (gp, supergroup))
 
-    self.groups.discard(gp)
+    self._RemoveGroup(gp)
     for other_gp in self.groups:
       relations_to_discard = set()
       for rel in other_gp.relations:
@@ -157,7 +216,7 @@ class Workspace(object):
                                   underlying_mapping_set=set(
                                       group.object.underlying_mapping_set))
     new_object.object.AddCategoriesFrom(group.object)
-    self.groups.add(new_object)
+    self._AddGroup(new_object)
     History.AddArtefact(new_object,
                         ObjectType.WS_GROUP, "Initial creation: [%d, %d]" % (new_object.start_pos,
                                                                              new_object.end_pos),
@@ -170,12 +229,31 @@ class Workspace(object):
        end.
     """
     # TODO(#33 --- Dec 28, 2011): Rename to GetObjectsWithSpan.
-    for gp in self.groups:
-      if left_fn(gp.start_pos) and right_fn(gp.end_pos):
-        yield gp
-    for gp in self.elements:
-      if left_fn(gp.start_pos) and right_fn(gp.end_pos):
-        yield gp
+    start_pos = getattr(left_fn, 'exact_value', None)
+    if start_pos is None:
+      for groups_starting_here in tuple(self._groups_by_span.values()):
+        for gp in tuple(groups_starting_here.values()):
+          if left_fn(gp.start_pos) and right_fn(gp.end_pos):
+            yield gp
+      for gp in self.elements:
+        if left_fn(gp.start_pos) and right_fn(gp.end_pos):
+          yield gp
+      return
+
+    # Only objects starting at start_pos can match: look them up instead.
+    groups_starting_here = self._groups_by_span.get(start_pos)
+    if groups_starting_here:
+      end_pos = getattr(right_fn, 'exact_value', None)
+      if end_pos is None:
+        for gp in tuple(groups_starting_here.values()):
+          if right_fn(gp.end_pos):
+            yield gp
+      elif end_pos in groups_starting_here:
+        yield groups_starting_here[end_pos]
+    if 0 <= start_pos < self.num_elements:
+      element = self.elements[start_pos]
+      if right_fn(element.end_pos):
+        yield element
 
   @NoteCallsInHistory
   def GetGroupDistance(self, left, right):
@@ -203,7 +281,6 @@ class Workspace(object):
        Only maximal groups are returned, where the relative order is based on being a
        subgroup (i.e., if A is a part of B, and both conflict, B is returned; note that if A
        conflicts with the group under consideration, so does B).
-       .. Note:: This can be sped up if I am keeping track of supergroups.
     """
     if gp.is_sequence_element: return  # Elements can never conflict.
     if gp in self.groups: return       # Group already present, no conflict possible.
@@ -240,23 +317,28 @@ class Workspace(object):
         # There can be at most one
         existsing_group_items.add(existing_group)
 
-    for other_group in self.groups:
-      other_gp_items = set(other_group.items)
-      overlap = existsing_group_items.intersection(other_gp_items)
-      if len(overlap) >= 2:
+    # Only groups containing at least one of these items can overlap in two or more of them.
+    overlap_counts = defaultdict(int)
+    for item in existsing_group_items:
+      for other_group in self._supergroups.get(item, ()):
+        overlap_counts[other_group] += 1
+    for other_group, overlap in overlap_counts.items():
+      if overlap >= 2:
         yield self.SomeMaximalSuperGroup(other_group)
 
   def GetSuperGroups(self, anchored):
     """Returns those group that contain the given anchored as a direct element."""
-    for gp in self.groups:
-      if anchored in gp.items:
-        yield gp
+    yield from tuple(self._supergroups.get(anchored, ()))
 
   def SomeMaximalSuperGroup(self, gp):
-    """Returns some super* group, if any, or returns self."""
-    for supergp in self.GetSuperGroups(gp):
-      return self.SomeMaximalSuperGroup(supergp)
-    # We reach here if no supergroup exists.
+    """Returns some super* group, if any, or returns self.
+
+       Walks up the supergroup map, so this takes time proportional to the depth of nesting.
+    """
+    supergroups = self._supergroups.get(gp)
+    while supergroups:
+      gp = next(iter(supergroups))
+      supergroups = self._supergroups.get(gp)
     return gp
 
   @NoteCallsInHistory
@@ -278,36 +360,34 @@ class Workspace(object):
     # new_group fits in. If it does, we may need to do more work such as fixing relations.
     # TODO(# --- Jan 27, 2012): Complete this.
     for original_gp in original_gps:
-      self.groups.discard(original_gp)
+      self._RemoveGroup(original_gp)
     try:
       self.InsertGroup(new_group)
     except ConflictingGroupException as e:
       for original_gp in original_gps:
-        self.groups.add(original_gp)
+        self._AddGroup(original_gp)
       raise e
 
   @NoteCallsInHistory
   def GetItemAt(self, start_pos, end_pos):
     """Returns the sole object with this span. Throws FargError if not found."""
-    for group in self.groups:
-      if group.start_pos == start_pos and group.end_pos == end_pos:
-        return group
-    if start_pos == end_pos:
-      for element in self.elements:
-        if element.start_pos == start_pos:
-          return element
+    group = self._groups_by_span.get(start_pos, {}).get(end_pos)
+    if group is not None:
+      return group
+    if start_pos == end_pos and 0 <= start_pos < self.num_elements:
+      return self.elements[start_pos]
     raise FargError("GetItemAt has no item to return.")
 
   @NoteCallsInHistory
   def CalculateSupergroupMap(self):
-    """Calculates a map from anchored elements to their supergroups.
+    """Returns a map from anchored elements to their supergroups.
 
-       Generated for immediate use and not kept updated. Regenrate for each use.
+       This is a copy of the map the workspace maintains, so it is not kept updated and callers
+       may modify it freely. Regenerate for each use.
     """
     supergroup_map = defaultdict(set)
-    for group in self.groups:
-      for part in group.items:
-        supergroup_map[part].add(group)
+    for part, supergroups in self._supergroups.items():
+      supergroup_map[part] = set(supergroups)
     return supergroup_map
 
   @NoteCallsInHistory